@@ -1,4 +1,6 @@
 # __init__.py cho package agents
 from agents.random_agent import RandomAgent
 from agents.minimax_agent import MinimaxAgent
-from agents.alphabeta_agent import AlphaBetaAgent
\ No newline at end of file
+from agents.alphabeta_agent import AlphaBetaAgent
+from agents.solver_agent import SolverAgent
+from agents.mcts_agent import MCTSAgent
\ No newline at end of file
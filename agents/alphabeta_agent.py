@@ -1,18 +1,143 @@
 import time
 import random
 from game.player import Player
+from game.vector_eval import HAS_NUMPY, VectorEvaluator
+from agents.transposition import TranspositionTable, SharedTranspositionTable, EXACT, LOWER, UPPER, bound_flag
+from agents.move_ordering import MoveOrdering
+from agents.move_generator import staged_moves, quiescence_moves, STAGE_QUIET
+from agents.vcf import VCFSolver, five_cells
+from agents.vct import VCTSolver
+from agents.dfpn import DFPNSolver, WIN, DRAW
+from agents.parallel_search import RootSearchPool
+from agents.lazy_smp import LazySMPPool
+from agents.pondering import Ponderer
+from agents.opening_book import OpeningBook
+
+# Số nút giữa hai lần kiểm tra hạn chót
+_TIME_CHECK_INTERVAL = 16
+
+# Cửa sổ aspiration rộng hơn mức này thì mở hẳn về vô cùng
+_ASPIRATION_LIMIT = 5000
+
+# Điểm của thế cờ có chuỗi VCF: vẫn là thắng nhưng kém thắng ngay (10000)
+_VCF_SCORE = 9000
+
+# Chỉ thử VCF tại các nút còn ít nhất độ sâu này (gần gốc, ít nút)
+_VCF_MIN_DEPTH = 2
+
+# Độ rộng cửa sổ rỗng của PVS (điểm đánh giá cách nhau xa hơn nhiều)
+_NULL_WINDOW = 1e-6
+
+# LMR: chỉ giảm ở nút còn ít nhất độ sâu này, từ nước thứ _LMR_FULL_MOVES + 1
+_LMR_MIN_DEPTH = 3
+_LMR_FULL_MOVES = 3
+
+# Loại cận khi đổi góc nhìn (đổi dấu điểm)
+_FLIPPED_FLAGS = {EXACT: EXACT, LOWER: UPPER, UPPER: LOWER}
+
+class _SearchTimeout(Exception):
+    """Hết thời gian trong khi đang tìm kiếm một độ sâu."""
 
 class AlphaBetaAgent(Player):
     """Agent sử dụng thuật toán Alpha-Beta Pruning."""
     
-    def __init__(self, symbol, depth=3):
-        """Khởi tạo agent Alpha-Beta."""
+    def __init__(self, symbol, depth=3, use_numpy=False, batch_leaves=False, tt_bits=16,
+                 symmetric_tt=False, time_limit=3.0, aspiration_window=50, vcf_budget=3000, vcf_node_budget=200,
+                 vct_budget=1000, solver_empty=20, solver_budget=5000, quiescence_depth=4,
+                 use_pvs=True, lmr_reduction=1, workers=1, smp_workers=0, ponder=False, book_path=None, seed=None):
+        """Khởi tạo agent Alpha-Beta.
+        
+        Args:
+            symbol: Ký hiệu của agent ('X' hoặc 'O')
+            depth: Độ sâu tìm kiếm tối đa
+            use_numpy: Dùng đường đánh giá NumPy nếu đã cài NumPy
+            batch_leaves: Đánh giá gộp các lá anh em bằng một lần gọi NumPy
+            tt_bits: Dung lượng bảng chuyển vị là 2 ** tt_bits mục
+            symmetric_tt: Dùng chung mục bảng chuyển vị cho các thế cờ đối xứng
+                (xoay, lật) nhau; hàm đánh giá không hoàn toàn đối xứng nên
+                điểm dùng chung chỉ gần đúng
+            time_limit: Thời gian tối đa (giây) cho mỗi nước đi, None nếu không giới hạn
+            aspiration_window: Nửa độ rộng cửa sổ quanh điểm của độ sâu trước
+            vcf_budget: Số nút VCF tối đa ở gốc trước khi tìm kiếm, 0 để tắt
+            vcf_node_budget: Số nút VCF tối đa tại mỗi nút bên trong được chọn, 0 để tắt
+            vct_budget: Số nút VCT (bốn và ba mở) tối đa ở gốc, 0 để tắt
+            solver_empty: Giải thế cờ bằng df-pn khi số ô trống trên bàn cờ không quá mức này
+            solver_budget: Số nút df-pn tối đa cho mỗi lần chứng minh, 0 để tắt
+            quiescence_depth: Số nước chiến thuật tối đa tìm tiếp ở lá, 0 để tắt
+            use_pvs: Tìm các nước sau nước đầu bằng cửa sổ rỗng (PVS)
+            lmr_reduction: Số nước giảm độ sâu cho nước yên tĩnh xếp cuối, 0 để
+                tắt (chỉ dùng khi use_pvs; không dùng khi workers > 1)
+            workers: Số tiến trình tìm song song các nước ở gốc, 1 để tìm tuần tự
+            smp_workers: Số tiến trình phụ Lazy SMP dùng chung bảng chuyển vị, 0 để tắt
+            ponder: Tìm kiếm trong luồng nền khi tới lượt đối thủ (cần Game báo
+                nước đi qua on_move_played)
+            book_path: Tệp sách khai cuộc (xem agents.opening_book), None nếu không dùng
+            seed: Hạt giống chọn ngẫu nhiên giữa các nước bằng điểm, cố định để
+                kết quả lặp lại được
+        """
         super().__init__(symbol)
         self.depth = depth
         self.name = f"Alpha-Beta Agent (Level {depth}) ({symbol})"
         self.opponent_symbol = 'O' if symbol == 'X' else 'X'
-        self.transposition_table = {}
-        self.move_history = {}
+        # Bảng chuyển vị kích thước cố định, giữ lại giữa các nước đi
+        self.tt_bits = tt_bits
+        if smp_workers > 0:
+            self.transposition_table = SharedTranspositionTable(tt_bits)
+        else:
+            self.transposition_table = TranspositionTable(tt_bits)
+        self.symmetric_tt = symmetric_tt
+        # Chỉ dùng điểm lưu ở đúng độ sâu (tiến trình con của tìm kiếm song song)
+        self.tt_exact_depth = False
+        
+        # Bảng killer/history/counter-move, tạo theo kích thước bàn cờ khi cần
+        self.ordering = None
+        self.root_ply = 0  # Số quân trên bàn ở gốc, để tính tầng của mỗi nút
+        
+        # Quản lý thời gian: hạn chót được kiểm tra mỗi _TIME_CHECK_INTERVAL nút
+        self.time_limit = time_limit
+        self.aspiration_window = aspiration_window
+        self.deadline = None
+        self.stop_event = None  # Cờ dừng của luồng ponder hoặc tiến trình phụ Lazy SMP
+        self.nodes = 0
+        
+        # Bộ giải VCF, bộ đệm thế cờ đã giải được giữ giữa các nước đi
+        self.vcf_solver = VCFSolver()
+        self.vcf_budget = vcf_budget
+        self.vcf_node_budget = vcf_node_budget
+        self.vct_solver = VCTSolver()
+        self.vct_budget = vct_budget
+        
+        # Bộ giải df-pn cho tàn cuộc, tạo khi cần lần đầu
+        self.solver = None
+        self.solver_empty = solver_empty
+        self.solver_budget = solver_budget
+        
+        # Tìm kiếm tĩnh ở lá: chỉ các nước bốn, chặn bốn và chặn ba mở
+        self.quiescence_depth = quiescence_depth
+        
+        # Tìm kiếm biến chính và giảm độ sâu nước muộn trong _negamax
+        self.use_pvs = use_pvs
+        self.lmr_reduction = lmr_reduction
+        
+        # Tìm kiếm song song ở gốc, nhóm tiến trình tạo khi cần lần đầu
+        self.workers = workers
+        self.pool = None
+        self.smp_workers = smp_workers
+        self.smp_pool = None
+        self.search_id = 0
+        self.rng = random.Random(seed)
+        
+        # Pondering: kết quả là (khóa Zobrist, số nước, nước đi, độ sâu đã tìm xong)
+        self.ponderer = Ponderer() if ponder else None
+        if ponder:
+            self.stop_event = self.ponderer.stop_event
+        self.ponder_result = None
+        self.ponder_hits = 0
+        self.ponder_misses = 0
+        
+        # Sách khai cuộc được tra trước mọi tìm kiếm
+        self.book = OpeningBook(book_path) if book_path else None
+        self.last_score = None  # Điểm ở gốc của lần tìm gần nhất, None nếu không tìm
         
         # Cân bằng giữa tấn công và phòng thủ
         self.defense_weight = 1.2  # Ưu tiên phòng thủ hơn
@@ -20,95 +145,358 @@ class AlphaBetaAgent(Player):
         # Trọng số khoảng cách cho sắp xếp nước đi
         self.distance_weights = {1: 10, 2: 5, 3: 1}
         
+        # Đánh giá bằng NumPy (tùy chọn), quay về Board.evaluate nếu không có NumPy
+        use_numpy = (use_numpy or batch_leaves) and HAS_NUMPY
+        self.vector_evaluator = VectorEvaluator() if use_numpy else None
+        self.batch_leaves = batch_leaves and use_numpy
+        
     def get_move(self, board):
-        """Lấy nước đi tốt nhất sử dụng thuật toán Alpha-Beta Pruning."""
+        """Lấy nước đi tốt nhất sử dụng thuật toán Alpha-Beta Pruning.
+        
+        Iterative deepening trong giới hạn time_limit giây: độ sâu đang tìm dở
+        khi hết giờ bị bỏ, nước đi được lấy từ độ sâu cuối cùng đã hoàn thành.
+        Nước trong sách khai cuộc, hoặc nước đã ponder đúng thế cờ này tới hết
+        độ sâu, được trả về ngay.
+        """
+        if self.ponderer is not None:
+            self.ponderer.stop()
+        
+        if self.book is not None:
+            move = self.book.best_move(board)
+            if move is not None:
+                self.ponder_result = None
+                return move
+        
+        result = self.ponder_result
+        self.ponder_result = None
+        if result is not None:
+            key, length, move, completed_depth = result
+            if key == board.zobrist and length == board.moves_count:
+                self.ponder_hits += 1
+                if completed_depth >= self.depth and board.is_valid_move(*move):
+                    return move
+            else:
+                self.ponder_misses += 1
+        
+        move, _ = self._think(board, self.time_limit)
+        return move
+    
+    def on_move_played(self, board, move, symbol):
+        """Bắt đầu ponder sau nước của agent, dừng ponder khi đối thủ đã đi."""
+        if self.ponderer is None:
+            return
+        if symbol != self.symbol:
+            # Kết quả ponder (nếu có) được get_move đối chiếu với thế cờ thật
+            self.ponderer.stop()
+            return
+        if board.check_winner() or board.is_full():
+            return
+        self.ponder_result = None
+        self.ponderer.start(self._ponder, board.copy())
+    
+    def _ponder(self, board):
+        """Đoán nước đáp của đối thủ rồi tìm nước tiếp theo của agent (luồng nền).
+        
+        Tìm kiếm không giới hạn thời gian, dừng khi hết độ sâu hoặc khi
+        stop_event được đặt; bảng chuyển vị và bảng sắp xếp nước đi được giữ
+        lại cho get_move. Tìm song song ở gốc (workers > 1) chỉ dừng khi xong
+        độ sâu đang tìm.
+        
+        Args:
+            board: Bản sao bàn cờ sau nước đi của agent
+        """
+        reply = self._predict_reply(board)
+        if reply is None:
+            return
+        board.make_move(reply[0], reply[1], self.opponent_symbol)
+        if board.check_winner() or board.is_full():
+            return
+        move, completed_depth = self._think(board, None)
+        self.ponder_result = (board.zobrist, board.moves_count, move, completed_depth)
+    
+    def _predict_reply(self, board):
+        """Nước đáp dự đoán của đối thủ sau nước vừa đi của agent.
+        
+        Là nước tốt nhất đã lưu trong bảng chuyển vị (đường PV của lượt tìm
+        trước), nếu không có thì là nước đứng đầu theo thứ tự sắp xếp.
+        """
+        board_hash, transform = self._tt_key(board)
+        entry = self.transposition_table.probe(board_hash)
+        if entry is not None and entry[3] is not None:
+            move = entry[3]
+            if transform is not None:
+                move = board.from_canonical(move, transform)
+            if board.is_valid_move(*move):
+                return move
+        moves = self._order_moves(board, self.opponent_symbol)
+        return moves[0] if moves else None
+    
+    def _think(self, board, time_limit):
+        """Tìm nước đi cho thế cờ hiện tại (phần chung của get_move và ponder).
+        
+        Args:
+            board: Bàn cờ
+            time_limit: Thời gian tối đa (giây), None nếu không giới hạn
+            
+        Returns:
+            tuple: (nước đi, độ sâu đã tìm xong); nước đi chắc chắn (thắng,
+            chặn, VCF, đã giải) được tính như đã tìm hết độ sâu
+        """
         start_time = time.time()
-        self.transposition_table = {}  # Reset bộ nhớ đệm
+        self.last_score = None
+        self.search_id += 1
+        self.transposition_table.new_search(self.symbol)
+        self._ordering_for(board).new_search()
+        self.root_ply = board.moves_count
+        self.deadline = None
         valid_moves = board.get_valid_moves()
         
         # Kiểm tra nhanh các trường hợp đặc biệt
         quick_move = self._check_quick_moves(board, valid_moves)
         if quick_move:
-            return quick_move
+            return quick_move, self.depth
+        
+        # Chuỗi bốn liên tiếp dẫn tới thắng, dù dài hơn độ sâu tìm kiếm
+        if self.vcf_budget:
+            line = self.vcf_solver.solve(board, self.symbol, self.vcf_budget, self.stop_event)
+            if line:
+                return line[0], self.depth
+        
+        # Chuỗi đe dọa liên tiếp có cả ba mở, đối thủ chỉ kịp chặn từng nước
+        if self.vct_budget:
+            line = self.vct_solver.solve(board, self.symbol, self.vct_budget, self.stop_event)
+            if line:
+                return line[0], self.depth
+        
+        # Tàn cuộc: còn ít ô để đi thì giải hẳn thế cờ thay cho tìm kiếm đầy đủ
+        empty_cells = board.size * board.size - board.moves_count
+        if self.solver_budget and 0 < empty_cells <= self.solver_empty:
+            if self.solver is None:
+                self.solver = DFPNSolver()
+            result, move = self.solver.solve(board, self.symbol, self.solver_budget,
+                                             self.stop_event)
+            # df-pn chỉ xét các nước trong bán kính move_radius: kết quả hòa
+            # chỉ đáng tin khi các nước đó đã gồm mọi ô trống
+            if move is not None and (result == WIN or (
+                    result == DRAW and len(valid_moves) == empty_cells)):
+                return move, self.depth
         
         # Nếu là nước đi đầu tiên, ưu tiên đi giữa bàn cờ
         if board.moves_count == 0:
             mid = board.size // 2
-            return (mid, mid)
+            return (mid, mid), self.depth
         
         # Sắp xếp nước đi theo mức ưu tiên
         valid_moves = self._order_moves(board)
         
-        best_score = float('-inf')
+        best_score = None
         best_moves = []
-        alpha = float('-inf')
-        beta = float('inf')
+        completed_depth = 0
+        
+        # Lazy SMP: các tiến trình phụ điền trước bảng chuyển vị chung
+        if self.smp_workers > 0:
+            deadline = start_time + time_limit if time_limit is not None else None
+            self._smp_helpers().start(board, self.symbol, self.depth, deadline)
         
         # Iterative deepening: Tăng dần độ sâu
         for current_depth in range(1, self.depth + 1):
-            # Kiểm tra thời gian
-            if time.time() - start_time > 3.0 and current_depth > 1:
-                break
-                
-            depth_best_score = float('-inf')
-            depth_best_moves = []
+            if current_depth > 1 and time_limit is not None:
+                # Đã dùng quá nửa thời gian thì độ sâu tiếp theo khó hoàn thành
+                if time.time() - start_time > time_limit / 2:
+                    break
+                # Độ sâu 1 luôn được tìm trọn, từ độ sâu 2 mới áp hạn chót
+                self.deadline = start_time + time_limit
             
-            for move in valid_moves:
-                row, col = move
-                board_copy = board.copy()
-                board_copy.make_move(row, col, self.symbol)
-                
-                score = self._alpha_beta(board_copy, current_depth - 1, alpha, beta, False)
-                
-                # Cập nhật lịch sử nước đi
-                if (row, col) not in self.move_history:
-                    self.move_history[(row, col)] = 0
-                self.move_history[(row, col)] += 2 ** current_depth
-                
-                if score > depth_best_score:
-                    depth_best_score = score
-                    depth_best_moves = [move]
-                elif score == depth_best_score:
-                    depth_best_moves.append(move)
-                
-                alpha = max(alpha, depth_best_score)
+            try:
+                best_score, best_moves, root_scores = self._aspiration_search(
+                    board, valid_moves, current_depth, best_score)
+            except _SearchTimeout:
+                break
+            completed_depth = current_depth
             
-            # Cập nhật nước đi tốt nhất
-            best_score = depth_best_score
-            best_moves = depth_best_moves.copy()
+            # Độ sâu sau duyệt các nước tốt nhất (PV) của độ sâu này trước
+            valid_moves.sort(key=lambda move: root_scores.get(move, float('-inf')), reverse=True)
             
             # Tìm thấy nước đi thắng, dừng tìm kiếm
             if best_score >= 8000:
+                completed_depth = self.depth
                 break
         
+        self.deadline = None
+        self.last_score = best_score
+        if self.smp_workers > 0:
+            self.smp_pool.stop()
+        
         # Chọn một trong các nước đi tốt nhất
         if best_moves:
-            return random.choice(best_moves)
+            return self.rng.choice(best_moves), completed_depth
         else:
-            return random.choice(valid_moves)
+            return self.rng.choice(valid_moves), completed_depth
+    
+    def _aspiration_search(self, board, moves, depth, previous_score):
+        """Tìm ở gốc với cửa sổ hẹp quanh điểm của độ sâu trước.
+        
+        Nếu điểm rơi ra ngoài cửa sổ, cửa sổ được nới rộng dần (rồi mở hẳn)
+        và tìm lại.
+        
+        Args:
+            board: Bàn cờ
+            moves: Các nước đi ở gốc theo thứ tự cần duyệt
+            depth: Độ sâu tìm kiếm
+            previous_score: Điểm của độ sâu trước, None nếu chưa có
+            
+        Returns:
+            tuple: (điểm tốt nhất, các nước đi tốt nhất, điểm của từng nước đã duyệt)
+        """
+        if previous_score is None or abs(previous_score) >= 8000:
+            return self._search_root(board, moves, depth, float('-inf'), float('inf'))
+        
+        delta = self.aspiration_window
+        alpha = previous_score - delta
+        beta = previous_score + delta
+        
+        while True:
+            result = self._search_root(board, moves, depth, alpha, beta)
+            score = result[0]
+            if alpha < score < beta:
+                return result
+            
+            delta *= 4
+            if score <= alpha:
+                alpha = previous_score - delta if delta < _ASPIRATION_LIMIT else float('-inf')
+            else:
+                beta = previous_score + delta if delta < _ASPIRATION_LIMIT else float('inf')
+            
+            if alpha == float('-inf') and beta == float('inf'):
+                return self._search_root(board, moves, depth, alpha, beta)
+    
+    def _search_root(self, board, moves, depth, alpha, beta):
+        """Duyệt các nước đi ở gốc với cửa sổ (alpha, beta).
+        
+        Returns:
+            tuple: (điểm tốt nhất, các nước đi tốt nhất, điểm của từng nước đã duyệt)
+        """
+        if self.workers > 1:
+            return self._root_pool().search(board, self.symbol, moves, depth, alpha, beta,
+                                            self.deadline, self.search_id)
+        
+        best_score = float('-inf')
+        best_moves = []
+        root_scores = {}
+        
+        for move in moves:
+            row, col = move
+            with board.try_move(row, col, self.symbol):
+                score = self._alpha_beta(board, depth - 1, max(alpha, best_score), beta, False)
+            root_scores[move] = score
+            
+            if score > best_score:
+                best_score = score
+                best_moves = [move]
+            elif score == best_score:
+                best_moves.append(move)
+            
+            # Vượt cận trên của cửa sổ: cần tìm lại với cửa sổ rộng hơn
+            if best_score >= beta:
+                break
+        
+        return best_score, best_moves, root_scores
+    
+    def _root_pool(self):
+        """Lấy (hoặc tạo) nhóm tiến trình tìm kiếm song song ở gốc."""
+        if self.pool is None:
+            options = {
+                'symbol': self.symbol,
+                'depth': self.depth,
+                'use_numpy': self.vector_evaluator is not None,
+                'batch_leaves': self.batch_leaves,
+                'tt_bits': self.tt_bits,
+                'symmetric_tt': self.symmetric_tt,
+                'vcf_node_budget': self.vcf_node_budget,
+                'quiescence_depth': self.quiescence_depth,
+                'use_pvs': self.use_pvs,
+                # LMR phụ thuộc cửa sổ, mà alpha chung đổi theo thứ tự hoàn thành
+                # của các tiến trình: tắt để kết quả lặp lại được
+                'lmr_reduction': 0
+            }
+            self.pool = RootSearchPool(self.workers, type(self), options)
+        return self.pool
+    
+    def _smp_helpers(self):
+        """Lấy (hoặc tạo) nhóm tiến trình phụ của Lazy SMP."""
+        if self.smp_pool is None:
+            options = {
+                'symbol': self.symbol,
+                'depth': self.depth,
+                'use_numpy': self.vector_evaluator is not None,
+                'batch_leaves': self.batch_leaves,
+                'tt_bits': self.tt_bits,
+                'symmetric_tt': self.symmetric_tt,
+                'vcf_node_budget': self.vcf_node_budget,
+                'quiescence_depth': self.quiescence_depth,
+                'use_pvs': self.use_pvs,
+                'lmr_reduction': self.lmr_reduction
+            }
+            self.smp_pool = LazySMPPool(self.smp_workers, type(self), options,
+                                        self.transposition_table)
+        return self.smp_pool
+    
+    def close(self):
+        """Dừng luồng ponder và các nhóm tiến trình tìm kiếm song song (nếu có)."""
+        if self.ponderer is not None:
+            self.ponderer.stop()
+        if self.book is not None:
+            self.book.close()
+            self.book = None
+        if self.pool is not None:
+            self.pool.close()
+            self.pool = None
+        if self.smp_pool is not None:
+            self.smp_pool.close()
+            self.smp_pool = None
+        if isinstance(self.transposition_table, SharedTranspositionTable):
+            self.transposition_table.close()
+            self.transposition_table = TranspositionTable(self.tt_bits)
     
     def _check_quick_moves(self, board, valid_moves):
         """Kiểm tra nhanh các nước đi chiến thắng hoặc phòng thủ quan trọng."""
         # Kiểm tra nước thắng ngay lập tức
         for move in valid_moves:
             row, col = move
-            board_copy = board.copy()
-            board_copy.make_move(row, col, self.symbol)
-            if board_copy.check_winner() == self.symbol:
-                return move
+            with board.try_move(row, col, self.symbol):
+                if board.check_winner() == self.symbol:
+                    return move
         
         # Kiểm tra nước chặn đối thủ thắng
         for move in valid_moves:
             row, col = move
-            board_copy = board.copy()
-            board_copy.make_move(row, col, self.opponent_symbol)
-            if board_copy.check_winner() == self.opponent_symbol:
-                return move
+            with board.try_move(row, col, self.opponent_symbol):
+                if board.check_winner() == self.opponent_symbol:
+                    return move
         
         return None
     
-    def _order_moves(self, board):
-        """Sắp xếp các nước đi hợp lệ theo thứ tự ưu tiên."""
+    def _ordering_for(self, board):
+        """Lấy bảng sắp xếp nước đi ứng với kích thước bàn cờ hiện tại."""
+        if self.ordering is None or self.ordering.size != board.size:
+            self.ordering = MoveOrdering(board.size)
+        return self.ordering
+    
+    def _order_moves(self, board, mover=None):
+        """Sắp xếp toàn bộ các nước đi hợp lệ theo thứ tự ưu tiên (dùng ở gốc).
+        
+        Args:
+            board: Bàn cờ
+            mover: Người chơi sắp đi, mặc định là agent
+            
+        Returns:
+            list: Các nước đi theo thứ tự giảm dần mức ưu tiên
+        """
+        mover = mover or self.symbol
+        ordering = self._ordering_for(board)
+        ply = board.moves_count - self.root_ply
+        counter_move = ordering.counter_move(mover, board.last_move)
+        
         valid_moves = board.get_valid_moves()
         move_scores = []
         
@@ -117,34 +505,60 @@ class AlphaBetaAgent(Player):
             score = 0
             
             # Kiểm tra nước đi thắng/chặn
-            board_copy = board.copy()
-            board_copy.make_move(row, col, self.symbol)
-            if board_copy.check_winner() == self.symbol:
+            if board._check_win_at(row, col, self.symbol):
                 score += 10000
-            
-            board_copy = board.copy()
-            board_copy.make_move(row, col, self.opponent_symbol)
-            if board_copy.check_winner() == self.opponent_symbol:
+            if board._check_win_at(row, col, self.opponent_symbol):
                 score += 10000
             
-            # Ưu tiên nước đi gần quân cờ đã đặt
-            score += self._calculate_distance_score(board, row, col)
-            
-            # Ưu tiên nước đi ở trung tâm
-            center = board.size // 2
-            distance_to_center = abs(row - center) + abs(col - center)
-            score += (board.size - distance_to_center) * 2
-            
-            # Sử dụng lịch sử nước đi
-            if (row, col) in self.move_history:
-                score += self.move_history[(row, col)] // 100
+            # Nước đã gây cắt tỉa ở cùng tầng (killer) hoặc đáp trả nước vừa đi
+            killer_slot = ordering.is_killer(ply, move)
+            if killer_slot >= 0:
+                score += 2000 - 100 * killer_slot
+            if move == counter_move:
+                score += 1500
             
+            score += self._quiet_score(board, move, mover, ordering)
             move_scores.append((move, score))
         
         # Sắp xếp nước đi theo điểm giảm dần
         move_scores.sort(key=lambda x: x[1], reverse=True)
         return [move for move, _ in move_scores]
     
+    def _generate_moves(self, board, mover, tt_move=None):
+        """Sinh nước đi theo giai đoạn cho một nút bên trong cây tìm kiếm.
+        
+        Args:
+            board: Bàn cờ
+            mover: Người chơi sắp đi
+            tt_move: Nước đi tốt nhất từ bảng chuyển vị, hoặc None
+            
+        Returns:
+            generator: Các cặp (nước đi, giai đoạn), xem staged_moves
+        """
+        ordering = self._ordering_for(board)
+        ply = board.moves_count - self.root_ply
+        killers = ordering.killer_moves(ply)
+        killers.append(ordering.counter_move(mover, board.last_move))
+        
+        return staged_moves(board, mover, tt_move, killers,
+                            lambda move: self._quiet_score(board, move, mover, ordering))
+    
+    def _quiet_score(self, board, move, mover, ordering):
+        """Điểm sắp xếp của một nước đi không có tính chiến thuật rõ ràng."""
+        row, col = move
+        
+        # Ưu tiên nước đi gần quân cờ đã đặt
+        score = self._calculate_distance_score(board, row, col)
+        
+        # Ưu tiên nước đi ở trung tâm
+        center = board.size // 2
+        distance_to_center = abs(row - center) + abs(col - center)
+        score += (board.size - distance_to_center) * 2
+        
+        # Điểm history của người sắp đi (giới hạn để không lấn át killer)
+        score += min(ordering.history_score(mover, move), 1000)
+        return score
+    
     def _calculate_distance_score(self, board, row, col):
         """Tính điểm cho nước đi dựa trên khoảng cách với quân cờ đã đặt."""
         score = 0
@@ -171,96 +585,297 @@ class AlphaBetaAgent(Player):
         
         return score
     
+    def _out_of_time(self):
+        """Đã quá hạn chót, hoặc được yêu cầu dừng (ponder, Lazy SMP)."""
+        if self.deadline is not None and time.time() > self.deadline:
+            return True
+        return self.stop_event is not None and self.stop_event.is_set()
+    
     def _alpha_beta(self, board, depth, alpha, beta, is_maximizing):
-        """Thuật toán Alpha-Beta Pruning."""
-        # Tạo hash key
-        board_hash = ''.join([''.join(row) for row in board.board]) + str(board.last_move)
+        """Thuật toán Alpha-Beta Pruning, điểm theo góc nhìn của agent.
+        
+        Bọc _negamax: với nút của đối thủ, cửa sổ và điểm được đổi dấu.
+        """
+        if is_maximizing:
+            return self._negamax(board, depth, alpha, beta, True)
+        return -self._negamax(board, depth, -beta, -alpha, False)
+    
+    def _negamax(self, board, depth, alpha, beta, is_maximizing):
+        """Negamax với tìm kiếm biến chính (PVS) và giảm độ sâu nước muộn (LMR).
+        
+        Nước đầu tiên được tìm với cửa sổ đầy đủ; các nước sau chỉ được thử
+        bằng cửa sổ rỗng (null window) và tìm lại khi vượt alpha. Nước yên
+        tĩnh ở cuối danh sách được tìm nông hơn lmr_reduction nước, rồi tìm
+        lại đủ độ sâu nếu vượt alpha; nước chiến thuật không bao giờ bị giảm.
         
-        # Kiểm tra trong bộ nhớ đệm
-        if board_hash in self.transposition_table:
-            cached_depth, cached_score = self.transposition_table[board_hash]
-            if cached_depth >= depth:
-                return cached_score
+        Args:
+            board: Bàn cờ
+            depth: Độ sâu còn lại
+            alpha, beta: Cửa sổ tìm kiếm theo góc nhìn của bên sắp đi
+            is_maximizing: Agent là bên sắp đi
+            
+        Returns:
+            float: Điểm của thế cờ theo góc nhìn của bên sắp đi
+        """
+        # Kiểm tra hạn chót định kỳ; try_move tự hoàn tác khi ngoại lệ đi qua
+        self.nodes += 1
+        if self.nodes % _TIME_CHECK_INTERVAL == 0 and self._out_of_time():
+            raise _SearchTimeout()
+        
+        # Bảng chuyển vị và các hàm đánh giá tính điểm theo góc nhìn của agent
+        sign = 1 if is_maximizing else -1
+        
+        # Khóa Zobrist (hoặc khóa đối xứng) được bàn cờ cập nhật sẵn sau mỗi nước đi
+        board_hash, transform = self._tt_key(board)
+        alpha_orig, beta_orig = alpha, beta
+        
+        # Kiểm tra trong bảng chuyển vị: điểm chính xác dùng ngay, cận dưới/trên
+        # thu hẹp cửa sổ; nước đi tốt nhất đã lưu được thử trước
+        tt_move = None
+        entry = self.transposition_table.probe(board_hash)
+        if entry is not None:
+            cached_depth, flag, cached_score, tt_move = entry
+            if transform is not None and tt_move is not None:
+                tt_move = board.from_canonical(tt_move, transform)
+            if cached_depth == depth or (cached_depth > depth and not self.tt_exact_depth):
+                cached_score *= sign
+                if sign < 0:
+                    flag = _FLIPPED_FLAGS[flag]
+                if flag == EXACT:
+                    return cached_score
+                if flag == LOWER:
+                    alpha = max(alpha, cached_score)
+                elif flag == UPPER:
+                    beta = min(beta, cached_score)
+                if alpha >= beta:
+                    return cached_score
         
         # Kiểm tra điều kiện kết thúc
         winner = board.check_winner()
         if winner == self.symbol:
-            return 10000
+            return 10000 * sign
         elif winner == self.opponent_symbol:
-            return -10000
-        elif board.is_full() or depth == 0:
-            return self._evaluate_board(board)
+            return -10000 * sign
+        elif board.is_full():
+            return self._evaluate_board(board) * sign
+        elif depth == 0:
+            if self.quiescence_depth:
+                return self._quiescence(board, alpha, beta, is_maximizing, self.quiescence_depth)
+            return self._evaluate_board(board) * sign
         
-        if is_maximizing:
+        mover = self.symbol if is_maximizing else self.opponent_symbol
+        
+        # Nút gần gốc: thử tìm VCF cho bên sắp đi với ngân sách nhỏ
+        if self.vcf_node_budget and depth >= _VCF_MIN_DEPTH:
+            line = self.vcf_solver.solve(board, mover, self.vcf_node_budget, self.stop_event)
+            if line:
+                self._tt_store(board, board_hash, transform, depth, EXACT, _VCF_SCORE * sign, line[0])
+                return _VCF_SCORE
+        
+        # Nước đi được sinh dần theo giai đoạn: nếu nước đầu đã gây cắt tỉa,
+        # các nước còn lại không cần chấm điểm
+        moves = self._generate_moves(board, mover, tt_move)
+        
+        # Các con của nút này đều là lá: đánh giá gộp trong một lần gọi NumPy
+        if depth == 1 and self.batch_leaves:
+            valid_moves = [move for move, _ in moves]
+            if is_maximizing:
+                best_score, best_move = self._alpha_beta_leaf_batch(
+                    board, valid_moves, alpha, beta, True)
+            else:
+                best_score, best_move = self._alpha_beta_leaf_batch(
+                    board, valid_moves, -beta, -alpha, False)
+                best_score = -best_score
+        else:
             best_score = float('-inf')
-            valid_moves = self._order_moves(board)
+            best_move = None
             
-            for move in valid_moves:
+            for index, (move, stage) in enumerate(moves):
                 row, col = move
-                board_copy = board.copy()
-                board_copy.make_move(row, col, self.symbol)
+                with board.try_move(row, col, mover):
+                    if index == 0 or not self.use_pvs:
+                        score = -self._negamax(board, depth - 1, -beta, -alpha, not is_maximizing)
+                    else:
+                        # Nước muộn, yên tĩnh, còn đủ sâu: thử nông hơn trước
+                        reduction = 0
+                        if (stage == STAGE_QUIET and depth >= _LMR_MIN_DEPTH
+                                and index >= _LMR_FULL_MOVES):
+                            reduction = min(self.lmr_reduction, depth - 1)
+                        
+                        null_beta = alpha + _NULL_WINDOW
+                        score = -self._negamax(board, depth - 1 - reduction,
+                                               -null_beta, -alpha, not is_maximizing)
+                        if score > alpha and reduction:
+                            score = -self._negamax(board, depth - 1,
+                                                   -null_beta, -alpha, not is_maximizing)
+                        if alpha < score < beta:
+                            score = -self._negamax(board, depth - 1, -beta, -alpha, not is_maximizing)
                 
-                score = self._alpha_beta(board_copy, depth - 1, alpha, beta, False)
-                best_score = max(best_score, score)
+                if score > best_score:
+                    best_score = score
+                    best_move = move
                 
                 alpha = max(alpha, best_score)
                 if beta <= alpha:
+                    self._record_cutoff(board, mover, move, depth)
                     break
+        
+        flag = bound_flag(best_score, alpha_orig, beta_orig)
+        if sign < 0:
+            flag = _FLIPPED_FLAGS[flag]
+        self._tt_store(board, board_hash, transform, depth, flag, best_score * sign, best_move)
+        return best_score
+    
+    def _tt_key(self, board):
+        """Khóa bảng chuyển vị của thế cờ.
+        
+        Returns:
+            tuple: (khóa, phép biến đổi về hướng chuẩn); phép biến đổi là None
+            khi không dùng khóa đối xứng
+        """
+        if self.symmetric_tt:
+            return board.canonical_key()
+        return board.zobrist, None
+    
+    def _tt_store(self, board, board_hash, transform, depth, flag, score, move):
+        """Lưu vào bảng chuyển vị, nước đi được đổi sang hướng chuẩn nếu cần."""
+        if transform is not None and move is not None:
+            move = board.to_canonical(move, transform)
+        self.transposition_table.store(board_hash, depth, flag, score, move)
+    
+    def _quiescence(self, board, alpha, beta, is_maximizing, depth, static_score=None):
+        """Tìm kiếm tĩnh ở lá: chỉ mở rộng các nước chiến thuật cho tới khi thế cờ yên.
+        
+        Bên sắp đi có thể dừng lại với điểm đánh giá hiện tại (stand-pat), hoặc
+        thử các nước tạo bốn và chặn ba mở của đối thủ. Khi đối thủ đã có bốn,
+        bên sắp đi không được dừng mà phải chặn.
+        
+        Args:
+            board: Bàn cờ
+            alpha, beta: Cửa sổ tìm kiếm theo góc nhìn của bên sắp đi
+            is_maximizing: Agent là bên sắp đi
+            depth: Số nước chiến thuật còn được tìm
+            static_score: Điểm đánh giá đã tính sẵn của thế cờ theo góc nhìn
+                của bên sắp đi (từ đánh giá gộp), None để tự tính
             
-            self.transposition_table[board_hash] = (depth, best_score)
-            return best_score
+        Returns:
+            float: Điểm của thế cờ theo góc nhìn của bên sắp đi
+        """
+        self.nodes += 1
+        if self.nodes % _TIME_CHECK_INTERVAL == 0 and self._out_of_time():
+            raise _SearchTimeout()
+        
+        mover = self.symbol if is_maximizing else self.opponent_symbol
+        opponent = self.opponent_symbol if is_maximizing else self.symbol
+        
+        # Thắng ngay, hoặc đối thủ có hai ô thắng không chặn hết được
+        if five_cells(board, mover):
+            return 10000
+        blocks = five_cells(board, opponent)
+        if len(blocks) >= 2:
+            return -10000
+        
+        sign = 1 if is_maximizing else -1
+        if depth == 0 or board.is_full():
+            return self._evaluate_board(board) * sign
+        
+        if blocks:
+            moves = list(blocks)
+            best_score = float('-inf')
         else:
-            best_score = float('inf')
-            valid_moves = self._order_moves(board)
+            best_score = static_score
+            if best_score is None:
+                best_score = self._evaluate_board(board) * sign
+            if best_score >= beta:
+                return best_score
+            alpha = max(alpha, best_score)
+            moves = quiescence_moves(board, mover)
+        
+        for row, col in moves:
+            with board.try_move(row, col, mover):
+                score = -self._quiescence(board, -beta, -alpha, not is_maximizing, depth - 1)
+            best_score = max(best_score, score)
+            alpha = max(alpha, best_score)
+            if alpha >= beta:
+                break
+        
+        return best_score
+    
+    def _alpha_beta_leaf_batch(self, board, valid_moves, alpha, beta, is_maximizing):
+        """Alpha-Beta tại nút có độ sâu 1 với các lá được đánh giá gộp.
+        
+        Điểm Board.evaluate của mọi nút con được tính trong một lần gọi NumPy,
+        sau đó mới duyệt theo thứ tự và áp dụng cắt tỉa; phần điểm còn lại của
+        _evaluate_board chỉ được tính cho các con được duyệt tới. Khi bật tìm
+        kiếm tĩnh, điểm này là điểm dừng (stand-pat) của tìm kiếm tĩnh ở con.
+        
+        Returns:
+            tuple: (điểm tốt nhất, nước đi tốt nhất)
+        """
+        mover = self.symbol if is_maximizing else self.opponent_symbol
+        base_scores = self.vector_evaluator.evaluate_children(
+            board, valid_moves, mover, self.symbol)
+        
+        best_score = float('-inf') if is_maximizing else float('inf')
+        best_move = None
+        for (row, col), base_score in zip(valid_moves, base_scores):
+            if board._check_win_at(row, col, mover):
+                score = 10000 if is_maximizing else -10000
+            else:
+                with board.try_move(row, col, mover):
+                    if board.is_full():
+                        score = self._evaluate_board(board)
+                    else:
+                        score = base_score + self._evaluate_extras(board)
+                        if self.quiescence_depth:
+                            # Tìm tĩnh theo góc nhìn của bên đi tiếp ở con
+                            child_sign = -1 if is_maximizing else 1
+                            low, high = (-beta, -alpha) if is_maximizing else (alpha, beta)
+                            score = child_sign * self._quiescence(
+                                board, low, high, not is_maximizing,
+                                self.quiescence_depth, score * child_sign)
             
-            for move in valid_moves:
-                row, col = move
-                board_copy = board.copy()
-                board_copy.make_move(row, col, self.opponent_symbol)
-                
-                score = self._alpha_beta(board_copy, depth - 1, alpha, beta, True)
-                best_score = min(best_score, score)
-                
+            if is_maximizing:
+                if score > best_score:
+                    best_score = score
+                    best_move = (row, col)
+                alpha = max(alpha, best_score)
+            else:
+                if score < best_score:
+                    best_score = score
+                    best_move = (row, col)
                 beta = min(beta, best_score)
-                if beta <= alpha:
-                    break
-            
-            self.transposition_table[board_hash] = (depth, best_score)
-            return best_score
+            if beta <= alpha:
+                self._record_cutoff(board, mover, (row, col), 1)
+                break
+        
+        return best_score, best_move
+    
+    def _record_cutoff(self, board, mover, move, depth):
+        """Ghi nhận nước đi gây cắt tỉa vào các bảng killer/history/counter-move."""
+        ply = board.moves_count - self.root_ply
+        self._ordering_for(board).record_cutoff(ply, mover, move, depth, board.last_move)
     
     def _evaluate_board(self, board):
         """Đánh giá trạng thái bàn cờ."""
-        # Sử dụng hàm đánh giá có sẵn của bàn cờ
-        base_score = board.evaluate(self.symbol)
-        
-        # Đánh giá tấn công và phòng thủ
-        attack_score = 0
-        defense_score = 0
-        
-        # Đánh giá các dòng theo 4 hướng
-        directions = [(0, 1), (1, 0), (1, 1), (1, -1)]
+        # Sử dụng hàm đánh giá có sẵn của bàn cờ hoặc bản NumPy cùng thang điểm
+        if self.vector_evaluator is not None:
+            base_score = self.vector_evaluator.evaluate(board, self.symbol)
+        else:
+            base_score = board.evaluate(self.symbol)
         
-        for row in range(board.size):
-            for col in range(board.size):
-                cell = board.board[row][col]
-                if cell == ' ':
-                    continue
-                    
-                for dr, dc in directions:
-                    # Không đánh giá lại các dòng đã xem xét
-                    if dr < 0 or (dr == 0 and dc < 0):
-                        continue
-                        
-                    # Đếm số quân liên tiếp và số đầu mở
-                    count = self._count_consecutive(board, row, col, dr, dc)
-                    
-                    if cell == self.symbol:
-                        attack_score += self._score_line(count)
-                    else:
-                        defense_score -= self._score_line(count)
+        return base_score + self._evaluate_extras(board)
+    
+    def _evaluate_extras(self, board):
+        """Phần điểm của agent ngoài Board.evaluate: tấn công, phòng thủ, trung tâm."""
+        # Đánh giá tấn công và phòng thủ theo các dãy quân trên 4 hướng,
+        # bàn cờ lưu điểm từng dòng và chỉ tính lại các dòng vừa thay đổi
+        run_scores = board.line_score_totals(self._score_line_runs)
+        attack_score = run_scores[self.symbol]
+        defense_score = -run_scores[self.opponent_symbol]
         
         # Cải thiện điểm số với trọng số phòng thủ
-        total_score = base_score + attack_score + self.defense_weight * defense_score
+        total_score = attack_score + self.defense_weight * defense_score
         
         # Cộng thêm điểm cho kiểm soát trung tâm
         center_score = self._evaluate_center_control(board)
@@ -268,39 +883,37 @@ class AlphaBetaAgent(Player):
         
         return total_score
     
-    def _count_consecutive(self, board, row, col, dr, dc):
-        """Đếm số quân liên tiếp và số đầu mở theo một hướng."""
-        symbol = board.board[row][col]
-        count = 1
-        open_ends = 0
-        
-        # Kiểm tra về sau
-        r, c = row + dr, col + dc
-        while 0 <= r < board.size and 0 <= c < board.size:
-            if board.board[r][c] == symbol:
-                count += 1
-            elif board.board[r][c] == ' ':
-                open_ends += 1
-                break
-            else:
-                break
-            r += dr
-            c += dc
+    def _score_line_runs(self, line):
+        """Tính điểm các dãy quân liên tiếp trên một dòng cho cả hai người chơi.
+        
+        Mỗi quân trong một dãy dài count với open_ends đầu mở đóng góp
+        _score_line((count, open_ends)), giống như đếm từng quân theo từng hướng.
+        """
+        scores = {'X': 0, 'O': 0}
+        length = len(line)
+        start = 0
+        
+        while start < length:
+            cell = line[start]
+            if cell == ' ':
+                start += 1
+                continue
             
-        # Kiểm tra về trước
-        r, c = row - dr, col - dc
-        while 0 <= r < board.size and 0 <= c < board.size:
-            if board.board[r][c] == symbol:
-                count += 1
-            elif board.board[r][c] == ' ':
+            end = start
+            while end < length and line[end] == cell:
+                end += 1
+            
+            count = end - start
+            open_ends = 0
+            if start > 0 and line[start - 1] == ' ':
                 open_ends += 1
-                break
-            else:
-                break
-            r -= dr
-            c -= dc
+            if end < length and line[end] == ' ':
+                open_ends += 1
+            
+            scores[cell] += count * self._score_line((count, open_ends))
+            start = end
         
-        return (count, open_ends)
+        return scores['X'], scores['O']
     
     def _score_line(self, count_data):
         """Tính điểm dựa trên số quân liên tiếp và số đầu mở."""
@@ -332,22 +945,18 @@ class AlphaBetaAgent(Player):
         center = board.size // 2
         center_radius = board.size // 4
         
-        # Đánh giá nhanh vùng trung tâm
-        for row in range(center - center_radius, center + center_radius + 1):
-            for col in range(center - center_radius, center + center_radius + 1):
-                if not (0 <= row < board.size and 0 <= col < board.size):
-                    continue
-                    
-                if board.board[row][col] == ' ':
-                    continue
-                
-                # Khoảng cách đến trung tâm
-                distance = abs(row - center) + abs(col - center)
-                weight = max(0, center_radius - distance + 1)
-                
-                if board.board[row][col] == self.symbol:
-                    score += weight * 2
-                else:
-                    score -= weight
+        # Đánh giá nhanh vùng trung tâm: chỉ duyệt các quân đã đặt
+        for row, col, player in board.move_history:
+            if abs(row - center) > center_radius or abs(col - center) > center_radius:
+                continue
+            
+            # Khoảng cách đến trung tâm
+            distance = abs(row - center) + abs(col - center)
+            weight = max(0, center_radius - distance + 1)
+            
+            if player == self.symbol:
+                score += weight * 2
+            else:
+                score -= weight
         
         return score
\ No newline at end of file
@@ -0,0 +1,285 @@
+"""Bộ giải df-pn (depth-first proof-number search) cho bàn cờ nhỏ và tàn cuộc.
+
+Mỗi lần chứng minh trả lời câu hỏi "người chơi mục tiêu có thắng được
+không": nút của người mục tiêu là nút OR, nút của đối thủ là nút AND. Số
+chứng minh (pn) và số bác bỏ (dn) của mỗi thế cờ được lưu trong một bảng
+kích thước cố định theo khóa Zobrist, nên bộ nhớ bị chặn dù số nút duyệt
+lớn. Thắng/thua/hòa của bên đến lượt được suy ra từ hai lần chứng minh,
+lần lượt với mục tiêu là mỗi bên; khóa được trộn với người mục tiêu nên
+kết quả của cả hai lần chứng minh cùng nằm trong bảng.
+
+Nước đi được sinh bằng Board.get_valid_moves như các agent khác; khi đối
+thủ đã có ô thắng, chỉ các ô chặn được xét.
+"""
+from array import array
+from game.board import DIRECTIONS
+from agents.vcf import five_cells
+
+# Kết quả giải, theo góc nhìn bên đến lượt
+WIN = 1
+DRAW = 0
+LOSS = -1
+
+_INFINITY = 1 << 40
+
+# Trộn vào khóa Zobrist để mục của hai người mục tiêu không lẫn nhau
+_TARGET_KEYS = {'X': 0, 'O': 0x9E3779B97F4A7C15}
+
+# Bàn cờ lớn hơn mức này không quét tìm cửa sổ thắng còn sống (quá tốn)
+_LIVE_WINDOW_LIMIT = 32
+
+
+def _has_live_window(board, player):
+    """Kiểm tra player còn cửa sổ 5 ô nào không có quân đối thủ (còn khả năng thắng).
+
+    Args:
+        board: Bàn cờ
+        player: Người chơi ('X' hoặc 'O')
+
+    Returns:
+        bool: True nếu còn ít nhất một cửa sổ như vậy
+    """
+    grid = board.board
+    size = board.size
+    for row_dir, col_dir in DIRECTIONS:
+        for start_row in range(size):
+            for start_col in range(size):
+                end_row = start_row + 4 * row_dir
+                end_col = start_col + 4 * col_dir
+                if not (end_row < size and 0 <= end_col < size):
+                    continue
+                for step in range(5):
+                    cell = grid[start_row + step * row_dir][start_col + step * col_dir]
+                    if cell != ' ' and cell != player:
+                        break
+                else:
+                    return True
+    return False
+
+
+class _BudgetExhausted(Exception):
+    """Đã dùng hết số nút cho phép."""
+
+
+class DFPNSolver:
+    """Bộ giải df-pn với bảng (pn, dn) kích thước cố định."""
+
+    def __init__(self, table_bits=18, symmetric=False):
+        """Khởi tạo bộ giải.
+
+        Args:
+            table_bits: Bảng có 2 ** table_bits mục (mỗi mục khoảng 24 byte)
+            symmetric: Dùng chung mục cho các thế cờ đối xứng (xoay, lật) nhau
+        """
+        self.capacity = 1 << table_bits
+        self.mask = self.capacity - 1
+        self.keys = array('Q', [0]) * self.capacity
+        self.proofs = array('q', [0]) * self.capacity  # 0 là ô trống
+        self.disproofs = array('q', [0]) * self.capacity
+        self.symmetric = symmetric
+
+        self.target = None
+        self.target_key = 0
+        self.nodes = 0
+        self.budget = 0
+        self.stop_event = None
+
+    def clear(self):
+        """Xóa toàn bộ bảng."""
+        self.proofs = array('q', [0]) * self.capacity
+        self.disproofs = array('q', [0]) * self.capacity
+
+    def solve(self, board, player, node_budget=20000, stop_event=None):
+        """Giải thế cờ cho player, người đang đến lượt đi.
+
+        Args:
+            board: Bàn cờ
+            player: Bên đến lượt ('X' hoặc 'O')
+            node_budget: Số nút tối đa cho mỗi lần chứng minh
+            stop_event: threading.Event (hoặc multiprocessing.Event), dừng như
+                khi hết ngân sách nếu được đặt; None nếu không dùng
+
+        Returns:
+            tuple: (kết quả, nước đi). Kết quả là WIN, DRAW, LOSS hoặc None nếu
+            chưa giải xong; nước đi là nước đạt được kết quả đó (None khi thua
+            hoặc chưa giải xong)
+        """
+        opponent = 'O' if player == 'X' else 'X'
+
+        proved, move = self.prove(board, player, player, node_budget, stop_event)
+        if proved is None:
+            return None, None
+        if proved:
+            return WIN, move
+
+        # Không thắng được: hòa nếu đối thủ cũng không thắng được
+        proved, move = self.prove(board, player, opponent, node_budget, stop_event)
+        if proved is None:
+            return None, None
+        if proved:
+            return LOSS, None
+        return DRAW, move
+
+    def prove(self, board, to_move, target, node_budget=20000, stop_event=None):
+        """Chứng minh hoặc bác bỏ việc target thắng từ thế cờ hiện tại.
+
+        Args:
+            board: Bàn cờ
+            to_move: Bên đến lượt đi
+            target: Người chơi cần chứng minh thắng
+            node_budget: Số nút tối đa được duyệt
+            stop_event: Cờ dừng như ở solve
+
+        Returns:
+            tuple: (True nếu chứng minh được, False nếu bác bỏ được, None nếu
+            hết ngân sách hoặc bị dừng; nước đi của to_move dẫn tới kết quả đó hoặc None)
+        """
+        self.target = target
+        self.target_key = _TARGET_KEYS[target]
+        self.nodes = 0
+        self.budget = node_budget
+        self.stop_event = stop_event
+
+        try:
+            proof, disproof = self._mid(board, to_move, _INFINITY - 1, _INFINITY - 1)
+        except _BudgetExhausted:
+            return None, None
+
+        if proof and disproof:
+            return None, None
+
+        # Nước đi của bên đến lượt giữ được kết quả: ô thắng ngay, con đã được
+        # chứng minh ở nút OR, con đã bị bác bỏ ở nút AND
+        solved = proof == 0
+        wins = five_cells(board, to_move)
+        if wins:
+            return solved, min(wins)
+
+        children = self._children(board, to_move)
+        if self._terminal(board, to_move) is not None:
+            # Kết quả đã rõ mà không cần duyệt con: nước nào cũng như nhau
+            return solved, children[0] if children else None
+
+        is_or = to_move == target
+        for child in children:
+            child_proof, child_disproof = self._child_numbers(board, child, to_move)
+            if (child_proof if is_or else child_disproof) == 0:
+                return solved, child
+        return solved, None
+
+    def _lookup(self, key):
+        """Lấy (pn, dn) đã lưu của thế cờ, (1, 1) nếu chưa có."""
+        index = key & self.mask
+        if self.proofs[index] and self.keys[index] == key:
+            return self.proofs[index] - 1, self.disproofs[index]
+        return 1, 1
+
+    def _store(self, key, proof, disproof):
+        """Lưu (pn, dn) của thế cờ, ghi đè mục cũ cùng vị trí."""
+        index = key & self.mask
+        self.keys[index] = key
+        self.proofs[index] = proof + 1  # Cộng 1 để 0 luôn là ô trống
+        self.disproofs[index] = disproof
+
+    def _child_numbers(self, board, move, to_move):
+        """(pn, dn) đã lưu của thế cờ sau nước đi, không cần đặt quân."""
+        row, col = move
+        if self.symmetric:
+            key = board.canonical_key_after(row, col, to_move)[0]
+        else:
+            key = board.zobrist ^ board.zobrist_table[row][col][to_move]
+        return self._lookup(key ^ self.target_key)
+
+    def _children(self, board, to_move):
+        """Các nước đi cần xét: chỉ các ô chặn nếu đối thủ đã có ô thắng."""
+        opponent = 'O' if to_move == 'X' else 'X'
+        blocks = five_cells(board, opponent)
+        if blocks:
+            return sorted(blocks)
+        if board.is_full():
+            return []
+        return board.get_valid_moves()
+
+    def _terminal(self, board, to_move):
+        """(pn, dn) của thế cờ đã biết kết quả ngay, hoặc None.
+
+        Bên đến lượt có ô thắng thì thắng; đối thủ có từ 2 ô thắng thì bên
+        đến lượt thua; bàn cờ đầy, hoặc người mục tiêu không còn cửa sổ 5 ô
+        nào chưa bị chặn, là người mục tiêu không thắng.
+        """
+        opponent = 'O' if to_move == 'X' else 'X'
+        if five_cells(board, to_move):
+            winner = to_move
+        elif len(five_cells(board, opponent)) >= 2:
+            winner = opponent
+        elif board.is_full():
+            winner = None
+        elif board.size <= _LIVE_WINDOW_LIMIT and not _has_live_window(board, self.target):
+            winner = None
+        else:
+            return None
+
+        if winner == self.target:
+            return 0, _INFINITY
+        return _INFINITY, 0
+
+    def _mid(self, board, to_move, proof_threshold, disproof_threshold):
+        """Mở rộng nút cho tới khi pn hoặc dn vượt ngưỡng.
+
+        Returns:
+            tuple: (pn, dn) mới của nút
+        """
+        key = board.canonical_key()[0] if self.symmetric else board.zobrist
+        key ^= self.target_key
+        terminal = self._terminal(board, to_move)
+        if terminal is not None:
+            self._store(key, *terminal)
+            return terminal
+
+        self.nodes += 1
+        if self.nodes > self.budget or (self.stop_event is not None and self.stop_event.is_set()):
+            raise _BudgetExhausted()
+
+        is_or = to_move == self.target
+        next_player = 'O' if to_move == 'X' else 'X'
+        children = self._children(board, to_move)
+
+        while True:
+            # pn/dn của nút từ các con: nút OR lấy min pn, tổng dn; nút AND ngược lại
+            best = None
+            best_value = second_value = _INFINITY
+            total = 0
+            best_numbers = (1, 1)
+            for child in children:
+                child_proof, child_disproof = self._child_numbers(board, child, to_move)
+                value, other = ((child_proof, child_disproof) if is_or
+                                else (child_disproof, child_proof))
+                total = min(total + other, _INFINITY)
+                if value < best_value:
+                    second_value = best_value
+                    best_value = value
+                    best = child
+                    best_numbers = (child_proof, child_disproof)
+                elif value < second_value:
+                    second_value = value
+
+            if is_or:
+                proof, disproof = best_value, total
+            else:
+                proof, disproof = total, best_value
+
+            if proof >= proof_threshold or disproof >= disproof_threshold:
+                self._store(key, proof, disproof)
+                return proof, disproof
+
+            # Ngưỡng cho con tốt nhất: vượt con tốt thứ hai thì quay lại chọn con khác
+            child_proof, child_disproof = best_numbers
+            if is_or:
+                child_proof_threshold = min(proof_threshold, second_value + 1)
+                child_disproof_threshold = disproof_threshold - disproof + child_disproof
+            else:
+                child_disproof_threshold = min(disproof_threshold, second_value + 1)
+                child_proof_threshold = proof_threshold - proof + child_proof
+
+            with board.try_move(best[0], best[1], to_move):
+                self._mid(board, next_player, child_proof_threshold, child_disproof_threshold)
@@ -0,0 +1,136 @@
+"""Tìm kiếm Lazy SMP: nhiều tiến trình cùng tìm một thế cờ qua bảng chuyển vị chung.
+
+Các tiến trình phụ chạy cùng một vòng iterative deepening với tiến trình
+chính nhưng lệch độ sâu (tiến trình phụ lẻ bỏ qua độ sâu 1) và xáo nhẹ thứ
+tự các nước ở gốc, nên chúng duyệt trước những nhánh khác nhau. Kết quả của
+tiến trình phụ không được dùng trực tiếp: chúng chỉ điền vào bảng chuyển vị
+dùng chung (SharedTranspositionTable), nhờ đó tiến trình chính gặp sẵn điểm
+và nước đi tốt nhất của nhiều thế cờ. Nước đi cuối cùng luôn là kết quả tìm
+kiếm của tiến trình chính.
+"""
+import random
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from agents.transposition import SharedTranspositionTable
+
+# Số nước đầu ở gốc mà tiến trình phụ xáo thứ tự
+_SHUFFLE_PREFIX = 4
+
+# Trạng thái của tiến trình phụ, tạo bởi _init_helper
+_HELPER = {}
+
+
+def _init_helper(agent_class, options, table_name, table_bits, stop_event):
+    """Khởi tạo tiến trình phụ: một agent dùng bảng chuyển vị chung.
+
+    Args:
+        agent_class: Lớp agent (AlphaBetaAgent)
+        options: Tham số khởi tạo agent
+        table_name: Tên vùng nhớ của bảng chuyển vị chung
+        table_bits: Số bit dung lượng của bảng
+        stop_event: multiprocessing.Event, được đặt khi tiến trình chính đã xong
+    """
+    agent = agent_class(**options)
+    agent.transposition_table = SharedTranspositionTable(table_bits, name=table_name)
+    agent.stop_event = stop_event
+    _HELPER.update(agent=agent, board_data=None, board=None)
+
+
+def _helper_search(board_class, board_data, symbol, max_depth, deadline, worker_index, generation):
+    """Chạy iterative deepening trong tiến trình phụ cho tới khi được dừng.
+
+    Args:
+        board_class: Lớp bàn cờ dùng để giải mã
+        board_data: Bàn cờ đã mã hóa bằng to_bytes
+        symbol: Quân của agent ở gốc
+        max_depth: Độ sâu tối đa
+        deadline: Hạn chót (time.time()) hoặc None
+        worker_index: Số thứ tự của tiến trình phụ, quyết định độ lệch
+        generation: Thế hệ hiện tại của bảng chuyển vị chung
+
+    Returns:
+        int: Độ sâu sâu nhất đã tìm xong
+    """
+    # Import tại chỗ để tránh import vòng với alphabeta_agent
+    from agents.alphabeta_agent import _SearchTimeout
+
+    agent = _HELPER['agent']
+    if board_data != _HELPER['board_data']:
+        _HELPER['board'] = board_class.from_bytes(board_data)
+        _HELPER['board_data'] = board_data
+    board = _HELPER['board']
+
+    agent.symbol = symbol
+    agent.opponent_symbol = 'O' if symbol == 'X' else 'X'
+    agent.transposition_table.follow(symbol, generation)
+    agent._ordering_for(board).new_search()
+    agent.root_ply = board.moves_count
+    agent.deadline = deadline
+
+    moves = agent._order_moves(board)
+    prefix = moves[:_SHUFFLE_PREFIX]
+    random.Random(worker_index).shuffle(prefix)
+    moves[:_SHUFFLE_PREFIX] = prefix
+
+    completed = 0
+    for depth in range(1 + worker_index % 2, max_depth + 1):
+        try:
+            _, _, root_scores = agent._search_root(board, moves, depth,
+                                                   float('-inf'), float('inf'))
+        except _SearchTimeout:
+            break
+        completed = depth
+        moves.sort(key=lambda move: root_scores.get(move, float('-inf')), reverse=True)
+    return completed
+
+
+class LazySMPPool:
+    """Nhóm tiến trình phụ của tìm kiếm Lazy SMP."""
+
+    def __init__(self, workers, agent_class, options, table):
+        """Tạo nhóm tiến trình phụ.
+
+        Args:
+            workers: Số tiến trình phụ
+            agent_class: Lớp agent được tạo trong mỗi tiến trình phụ
+            options: Tham số khởi tạo agent trong tiến trình phụ
+            table: SharedTranspositionTable của tiến trình chính
+        """
+        self.workers = workers
+        self.table = table
+        self.stop_event = multiprocessing.Event()
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_helper,
+            initargs=(agent_class, options, table.name, table.capacity_bits, self.stop_event))
+        self.futures = []
+
+    def start(self, board, symbol, max_depth, deadline):
+        """Cho các tiến trình phụ bắt đầu tìm thế cờ hiện tại.
+
+        Args:
+            board: Bàn cờ ở gốc
+            symbol: Quân của agent
+            max_depth: Độ sâu tối đa
+            deadline: Hạn chót hoặc None
+        """
+        self.stop_event.clear()
+        board_data = board.to_bytes()
+        self.futures = [self.executor.submit(_helper_search, type(board), board_data, symbol,
+                                             max_depth, deadline, index, self.table.generation)
+                        for index in range(self.workers)]
+
+    def stop(self):
+        """Dừng các tiến trình phụ và chờ chúng rời khỏi tìm kiếm.
+
+        Returns:
+            list: Độ sâu sâu nhất mỗi tiến trình phụ đã tìm xong
+        """
+        self.stop_event.set()
+        depths = [future.result() for future in self.futures]
+        self.futures = []
+        return depths
+
+    def close(self):
+        """Dừng các tiến trình phụ."""
+        self.stop_event.set()
+        self.executor.shutdown(wait=True, cancel_futures=True)
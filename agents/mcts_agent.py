@@ -0,0 +1,514 @@
+import math
+import time
+import random
+from game.player import Player
+from game.board import DIRECTIONS
+from agents.vcf import five_cells
+from agents.pondering import Ponderer
+
+# Số thử ngẫu nhiên tối đa để tìm một ô trống trong danh sách ứng viên của playout
+_SAMPLE_TRIES = 16
+
+# Số playout tối đa của một lượt ponder, để cây không lớn mãi khi đối thủ nghĩ lâu
+_PONDER_PLAYOUT_LIMIT = 200000
+
+# Bàn cờ lớn hơn mức này (SparseBoard không giới hạn) dùng playout trên lưới
+_BITMASK_SIZE_LIMIT = 64
+
+class _Node:
+    """Một nút của cây tìm kiếm Monte Carlo."""
+    
+    __slots__ = ('move', 'parent', 'player', 'children', 'untried', 'prior',
+                 'visits', 'wins', 'terminal', 'winner')
+    
+    def __init__(self, move=None, parent=None, player=None, prior=1.0):
+        """Khởi tạo nút.
+        
+        Args:
+            move: Nước đi dẫn tới nút, None với gốc
+            parent: Nút cha
+            player: Người vừa đi nước move (điểm wins tính theo góc nhìn này)
+            prior: Xác suất tiên nghiệm của nước đi (dùng cho PUCT)
+        """
+        self.move = move
+        self.parent = parent
+        self.player = player
+        self.children = {}
+        self.untried = None  # Sinh khi nút được mở rộng lần đầu
+        self.prior = prior
+        self.visits = 0
+        self.wins = 0.0
+        self.terminal = False
+        self.winner = None
+
+def _build_five_offsets():
+    """Các ô hoàn thành 5 quân trong mỗi cửa sổ 9 ô của một người chơi.
+    
+    Returns:
+        list: Phần tử thứ window (bit k là ô thứ k có quân) là tuple các chỉ
+        số ô trống mà đặt quân vào thì có 5 quân liên tiếp
+    """
+    table = []
+    for window in range(1 << 9):
+        cells = []
+        for index in range(9):
+            if window >> index & 1:
+                continue
+            filled = window | (1 << index)
+            for start in range(max(0, index - 4), min(index, 4) + 1):
+                if all(filled >> (start + offset) & 1 for offset in range(5)):
+                    cells.append(index)
+                    break
+        table.append(tuple(cells))
+    return table
+
+_FIVE_OFFSETS = _build_five_offsets()
+
+# Bảng ô của playout theo kích thước bàn cờ, tạo bởi _playout_cells
+_PLAYOUT_CELLS = {}
+
+def _playout_cells(size):
+    """Lấy (hoặc tạo) bảng ô cho playout bitmask.
+    
+    Mỗi hướng có một cách xếp bit riêng: các ô của cùng một dòng nằm liền
+    nhau, giữa hai dòng có 4 bit trống. Nhờ vậy cửa sổ 9 ô quanh một ô theo
+    hướng đó chỉ cần một phép dịch và một phép AND.
+    
+    Returns:
+        list: Phần tử thứ row * size + col là tuple 4 bộ (bit của ô trong
+        cách xếp của hướng, độ dịch để lấy cửa sổ 9 ô, tuple bit của 9 ô trong
+        cửa sổ theo chỉ số row * size + col, 0 nếu ngoài bàn cờ)
+    """
+    if size not in _PLAYOUT_CELLS:
+        count = size * size
+        layouts = [[] for _ in range(count)]
+        for row_dir, col_dir in DIRECTIONS:
+            position = 4
+            for row in range(size):
+                for col in range(size):
+                    # Chỉ bắt đầu dòng ở ô mà ô liền trước nằm ngoài bàn cờ
+                    if 0 <= row - row_dir < size and 0 <= col - col_dir < size:
+                        continue
+                    r, c = row, col
+                    while 0 <= r < size and 0 <= c < size:
+                        window = tuple(
+                            1 << ((r + k * row_dir) * size + c + k * col_dir)
+                            if 0 <= r + k * row_dir < size and 0 <= c + k * col_dir < size else 0
+                            for k in range(-4, 5))
+                        layouts[r * size + c].append((1 << position, position - 4, window))
+                        position += 1
+                        r += row_dir
+                        c += col_dir
+                    position += 4
+        _PLAYOUT_CELLS[size] = [tuple(layout) for layout in layouts]
+    return _PLAYOUT_CELLS[size]
+
+def _place_stone(state, layout, index, side):
+    """Đặt quân của side (0 là X, 1 là O) tại ô index vào trạng thái playout.
+    
+    Chỉ các dòng qua ô vừa đặt mới có thể có thêm ô hoàn thành 5, nên tập ô
+    thắng của side chỉ được bổ sung từ 4 cửa sổ 9 ô quanh ô đó.
+    """
+    lines, fives, _ = state
+    side_lines = lines[side]
+    cells = fives[side]
+    for direction, (bit, shift, window) in enumerate(layout[index]):
+        line = side_lines[direction] | bit
+        side_lines[direction] = line
+        for offset in _FIVE_OFFSETS[(line >> shift) & 511]:
+            cells |= window[offset]
+    fives[side] = cells
+    state[2] |= 1 << index
+
+def _playout_state(board):
+    """Trạng thái playout của bàn cờ: [dòng theo từng hướng, ô thắng, ô đã có quân].
+    
+    Ô thắng của mỗi bên có thể gồm ô đã có quân, nơi dùng tự lọc bằng ô trống.
+    """
+    size = board.size
+    layout = _playout_cells(size)
+    state = [([0, 0, 0, 0], [0, 0, 0, 0]), [0, 0], 0]
+    for row, col, player in board.move_history:
+        _place_stone(state, layout, row * size + col, 0 if player == 'X' else 1)
+    return state
+
+def _playout(root_state, path, size, player, candidates, rng, max_plies):
+    """Chơi nhanh tới hết ván (hoặc max_plies nước) trên bitmask, không sửa bàn cờ.
+    
+    Nước đi được chọn ngẫu nhiên trong các ứng viên, nhưng luôn thắng ngay
+    nếu có ô thắng và chặn ngay ô thắng của đối thủ (kể cả bốn gãy X_XXX).
+    
+    Args:
+        root_state: Trạng thái playout của thế cờ ở gốc cây (không bị sửa)
+        path: Các nước (row, col, player) từ gốc tới lá
+        size: Kích thước bàn cờ
+        player: Người đi trước trong playout
+        candidates: Danh sách ô ứng viên (thường là biên nước đi của lá)
+        rng: Bộ sinh số ngẫu nhiên
+        max_plies: Số nước tối đa, quá thì coi là hòa
+    
+    Returns:
+        str hoặc None: Người thắng hoặc None nếu hòa
+    """
+    lines, fives, occupied = root_state
+    state = [(list(lines[0]), list(lines[1])), list(fives), occupied]
+    layout = _playout_cells(size)
+    for row, col, stone in path:
+        _place_stone(state, layout, row * size + col, 0 if stone == 'X' else 1)
+    fives = state[1]
+    
+    indices = [row * size + col for row, col in candidates]
+    count = len(indices)
+    side = 0 if player == 'X' else 1
+    for _ in range(max_plies):
+        occupied = state[2]
+        
+        # Thắng ngay, nếu không thì chặn ô thắng của đối thủ
+        if fives[side] & ~occupied:
+            return 'X' if side == 0 else 'O'
+        block = fives[1 - side] & ~occupied
+        if block:
+            index = (block & -block).bit_length() - 1
+        else:
+            for _ in range(_SAMPLE_TRIES):
+                index = indices[int(rng.random() * count)]
+                if not occupied >> index & 1:
+                    break
+            else:
+                return None
+        
+        _place_stone(state, layout, index, side)
+        side = 1 - side
+    
+    return None
+
+def _playout_grid(board, player, candidates, rng, max_plies):
+    """Playout trên lưới cho bàn cờ quá lớn để dùng bitmask.
+    
+    Các quân của playout được giữ trong một dict riêng. Nước đi được chọn
+    ngẫu nhiên trong các ứng viên, nhưng luôn thắng ngay nếu có ô thắng và
+    chặn ngay ô thắng của đối thủ (chỉ xét dãy liên tiếp để rẻ).
+    
+    Args:
+        board: Bàn cờ tại lá
+        player: Người đi trước trong playout
+        candidates: Danh sách ô ứng viên (thường là biên nước đi của lá)
+        rng: Bộ sinh số ngẫu nhiên
+        max_plies: Số nước tối đa, quá thì coi là hòa
+    
+    Returns:
+        str hoặc None: Người thắng hoặc None nếu hòa
+    """
+    grid = board.board
+    size = board.size
+    placed = {}
+    pending = {'X': [], 'O': []}  # Các ô mà người chơi đặt vào là thành 5
+    
+    def is_free(cell):
+        r, c = cell
+        return cell not in placed and 0 <= r < size and 0 <= c < size and grid[r][c] == ' '
+    
+    count = len(candidates)
+    for _ in range(max_plies):
+        opponent = 'O' if player == 'X' else 'X'
+        
+        # Thắng ngay, nếu không thì chặn ô thắng của đối thủ
+        for cell in pending[player]:
+            if is_free(cell):
+                return player
+        move = None
+        for cell in pending[opponent]:
+            if is_free(cell):
+                move = cell
+                break
+        
+        if move is None:
+            for _ in range(_SAMPLE_TRIES):
+                cell = candidates[int(rng.random() * count)]
+                if is_free(cell):
+                    move = cell
+                    break
+            else:
+                return None
+        
+        placed[move] = player
+        row, col = move
+        for row_dir, col_dir in DIRECTIONS:
+            ends = []
+            run = 1
+            for sign in (1, -1):
+                r, c = row + sign * row_dir, col + sign * col_dir
+                while True:
+                    stone = placed.get((r, c))
+                    if stone is None:
+                        if not (0 <= r < size and 0 <= c < size):
+                            break
+                        stone = grid[r][c]
+                    if stone != player:
+                        break
+                    run += 1
+                    r += sign * row_dir
+                    c += sign * col_dir
+                ends.append((r, c))
+            if run >= 5:
+                return player
+            if run == 4:
+                pending[player].extend(ends)
+        
+        player = opponent
+    
+    return None
+
+class MCTSAgent(Player):
+    """Agent sử dụng tìm kiếm cây Monte Carlo (UCT hoặc PUCT)."""
+    
+    def __init__(self, symbol, time_limit=2.0, max_playouts=None, exploration=1.4,
+                 use_puct=False, playout_depth=40, ponder=False, seed=None):
+        """Khởi tạo agent MCTS.
+        
+        Args:
+            symbol: Ký hiệu của agent ('X' hoặc 'O')
+            time_limit: Thời gian tối đa (giây) cho mỗi nước đi, None nếu không giới hạn
+            max_playouts: Số playout tối đa cho mỗi nước đi, None nếu không giới hạn
+            exploration: Hằng số khám phá của UCT/PUCT
+            use_puct: Dùng công thức PUCT với xác suất tiên nghiệm theo mẫu đe dọa
+            playout_depth: Số nước tối đa của mỗi playout
+            ponder: Chạy tiếp MCTS trong luồng nền khi tới lượt đối thủ
+            seed: Hạt giống ngẫu nhiên, cố định để kết quả lặp lại được
+        """
+        super().__init__(symbol)
+        self.name = f"MCTS Agent ({symbol})"
+        self.time_limit = time_limit
+        self.max_playouts = max_playouts
+        self.exploration = exploration
+        self.use_puct = use_puct
+        self.playout_depth = playout_depth
+        self.rng = random.Random(seed)
+        
+        # Cây được giữ lại giữa các nước đi
+        self.root = None
+        self.root_key = None  # Khóa Zobrist của thế cờ ở gốc
+        self.root_length = 0  # Số nước đã đi ở gốc
+        self.last_playouts = 0
+        
+        # Trạng thái playout (bitmask) của thế cờ ở gốc, theo khóa Zobrist
+        self.playout_root = None
+        self.playout_key = None
+        
+        # Pondering: cây được mở rộng trong thời gian của đối thủ, nhánh của
+        # nước đối thủ thật sự đi được giữ lại khi gọi get_move
+        self.ponderer = Ponderer() if ponder else None
+        self.ponder_playouts = 0
+    
+    def get_move(self, board):
+        """Lấy nước đi được thăm nhiều nhất sau các vòng MCTS.
+        
+        Args:
+            board: Bàn cờ hiện tại
+        
+        Returns:
+            tuple: Tọa độ (row, col) của nước đi
+        """
+        if self.ponderer is not None:
+            self.ponderer.stop()
+        
+        if board.moves_count == 0:
+            mid = board.size // 2
+            return (mid, mid)
+        
+        if self.max_playouts is None and self.time_limit is None:
+            raise ValueError("Cần time_limit hoặc max_playouts để dừng tìm kiếm")
+        
+        root = self._reuse_root(board)
+        deadline = time.time() + self.time_limit if self.time_limit is not None else None
+        playouts = 0
+        
+        while self.max_playouts is None or playouts < self.max_playouts:
+            # Luôn chạy ít nhất một vòng để gốc có nút con, kể cả khi hết giờ
+            if playouts and deadline is not None and time.time() > deadline:
+                break
+            self._iterate(board, root)
+            playouts += 1
+            
+            # Chỉ còn một nước để xét (thắng ngay hoặc chặn bắt buộc)
+            if root.untried is not None and not root.untried and len(root.children) == 1:
+                break
+        
+        self.last_playouts = playouts
+        if not root.children:
+            # max_playouts = 0: chưa mở rộng nút nào, lấy nước hợp lệ đầu tiên
+            return board.get_valid_moves()[0]
+        best = max(root.children.values(), key=lambda child: (child.visits, child.wins))
+        return best.move
+    
+    def on_move_played(self, board, move, symbol):
+        """Bắt đầu ponder sau nước của agent, dừng ponder khi đối thủ đã đi."""
+        if self.ponderer is None:
+            return
+        self.ponderer.stop()
+        if symbol != self.symbol or board.check_winner() or board.is_full():
+            return
+        board = board.copy()
+        self.ponderer.start(self._ponder, board, self._reuse_root(board))
+    
+    def _ponder(self, board, root):
+        """Chạy các vòng MCTS từ thế cờ sau nước của agent (luồng nền).
+        
+        Args:
+            board: Bản sao bàn cờ sau nước đi của agent
+            root: Gốc cây ứng với thế cờ đó
+        """
+        playouts = 0
+        stop_event = self.ponderer.stop_event
+        while not stop_event.is_set() and playouts < _PONDER_PLAYOUT_LIMIT:
+            self._iterate(board, root)
+            playouts += 1
+        self.ponder_playouts = playouts
+    
+    def close(self):
+        """Dừng luồng ponder (nếu có)."""
+        if self.ponderer is not None:
+            self.ponderer.stop()
+    
+    def _reuse_root(self, board):
+        """Lấy gốc cho thế cờ hiện tại, đi xuống cây cũ theo các nước đã đi.
+        
+        Returns:
+            _Node: Nút gốc (mới nếu cây cũ không chứa thế cờ này)
+        """
+        node = self.root
+        history = board.move_history
+        if node is not None and self.root_length <= len(history):
+            # Các nước mới phải nối tiếp đúng thế cờ ở gốc cũ
+            key = self.root_key
+            for row, col, player in history[self.root_length:]:
+                key ^= board.zobrist_table[row][col][player]
+            if key == board.zobrist:
+                for row, col, _ in history[self.root_length:]:
+                    node = node.children.get((row, col))
+                    if node is None:
+                        break
+            else:
+                node = None
+        else:
+            node = None
+        
+        if node is None:
+            # Người vừa đi ở gốc: nước cuối trên bàn, hoặc đối thủ nếu bàn trống
+            previous = history[-1][2] if history else ('O' if self.symbol == 'X' else 'X')
+            node = _Node(player=previous)
+        node.parent = None  # Bỏ phần cây phía trên để giải phóng bộ nhớ
+        
+        self.root = node
+        self.root_key = board.zobrist
+        self.root_length = len(history)
+        return node
+    
+    def _iterate(self, board, root):
+        """Một vòng MCTS: chọn, mở rộng, playout và lan truyền ngược."""
+        # Trạng thái playout của thế cờ ở gốc chỉ tính lại khi gốc đổi
+        if board.size <= _BITMASK_SIZE_LIMIT and self.playout_key != board.zobrist:
+            self.playout_root = _playout_state(board)
+            self.playout_key = board.zobrist
+        
+        node = root
+        depth = 0
+        try:
+            # Chọn: đi xuống khi nút đã mở rộng hết
+            while not node.terminal:
+                if node.untried is None:
+                    node.untried = self._candidate_moves(board, node)
+                if node.untried or not node.children:
+                    break
+                node = self._select(node)
+                board.make_move(node.move[0], node.move[1], node.player)
+                depth += 1
+            
+            # Mở rộng một nước chưa thử
+            if not node.terminal and node.untried:
+                move, prior = node.untried.pop()
+                mover = 'O' if node.player == 'X' else 'X'
+                child = _Node(move, node, mover, prior)
+                if board._check_win_at(move[0], move[1], mover):
+                    child.terminal = True
+                    child.winner = mover
+                node.children[move] = child
+                board.make_move(move[0], move[1], mover)
+                depth += 1
+                node = child
+                if not node.terminal and board.is_full():
+                    node.terminal = True
+            
+            # Playout từ lá
+            if node.terminal:
+                winner = node.winner
+            else:
+                to_move = 'O' if node.player == 'X' else 'X'
+                # Biên nước đi của bàn cờ là danh sách ứng viên, không cần sắp xếp
+                candidates = list(board.frontier) or board.get_valid_moves()
+                if board.size <= _BITMASK_SIZE_LIMIT:
+                    path = board.move_history[len(board.move_history) - depth:]
+                    winner = _playout(self.playout_root, path, board.size, to_move,
+                                      candidates, self.rng, self.playout_depth)
+                else:
+                    winner = _playout_grid(board, to_move, candidates, self.rng,
+                                           self.playout_depth)
+        finally:
+            for _ in range(depth):
+                board.undo_move()
+        
+        # Lan truyền ngược: thắng 1, hòa 0.5 theo góc nhìn người vừa đi
+        while node is not None:
+            node.visits += 1
+            if winner is None:
+                node.wins += 0.5
+            elif winner == node.player:
+                node.wins += 1.0
+            node = node.parent
+    
+    def _select(self, node):
+        """Chọn nút con theo UCT hoặc PUCT."""
+        log_visits = math.log(node.visits) if node.visits > 1 else 0.0
+        sqrt_visits = math.sqrt(node.visits)
+        exploration = self.exploration
+        
+        best = None
+        best_value = float('-inf')
+        for child in node.children.values():
+            value = child.wins / child.visits
+            if self.use_puct:
+                value += exploration * child.prior * sqrt_visits / (1 + child.visits)
+            else:
+                value += exploration * math.sqrt(log_visits / child.visits)
+            if value > best_value:
+                best_value = value
+                best = child
+        return best
+    
+    def _candidate_moves(self, board, node):
+        """Các nước chưa thử của nút kèm xác suất tiên nghiệm.
+        
+        Có ô thắng thì chỉ xét ô thắng, đối thủ có ô thắng thì chỉ xét ô chặn;
+        ngoài ra là các nước hợp lệ. Danh sách được xếp để nước có tiên nghiệm
+        cao nhất được lấy ra (pop) trước.
+        
+        Returns:
+            list: Các cặp (nước đi, xác suất tiên nghiệm)
+        """
+        mover = 'O' if node.player == 'X' else 'X'
+        wins = five_cells(board, mover)
+        if wins:
+            return [(move, 1.0 / len(wins)) for move in sorted(wins)]
+        blocks = five_cells(board, node.player)
+        if blocks:
+            return [(move, 1.0 / len(blocks)) for move in sorted(blocks)]
+        
+        # Tiên nghiệm theo mức đe dọa tấn công và phòng thủ của ô
+        weights = []
+        for row, col in board.get_valid_moves():
+            weight = (1 + board._check_threat_patterns(row, col, mover)
+                      + board._check_threat_patterns(row, col, node.player))
+            weights.append((weight, (row, col)))
+        total = sum(weight for weight, _ in weights)
+        weights.sort()
+        return [(move, weight / total) for weight, move in weights]
\ No newline at end of file
@@ -1,22 +1,29 @@
 import time
 import random
+from itertools import islice
 from game.player import Player
+from agents.transposition import TranspositionTable, EXACT, LOWER, UPPER, bound_flag
+from agents.move_generator import staged_moves
 
 class MinimaxAgent(Player):
     """Agent sử dụng thuật toán Minimax."""
     
-    def __init__(self, symbol, depth=2):
+    def __init__(self, symbol, depth=2, tt_bits=16, symmetric_tt=False):
         """Khởi tạo agent Minimax.
         
         Args:
             symbol: Ký hiệu của agent ('X' hoặc 'O')
             depth: Độ sâu tìm kiếm của Minimax
+            tt_bits: Dung lượng bảng chuyển vị là 2 ** tt_bits mục
+            symmetric_tt: Dùng chung mục bảng chuyển vị cho các thế cờ đối xứng (xoay, lật);
+                hàm đánh giá không hoàn toàn đối xứng nên điểm dùng chung chỉ gần đúng
         """
         super().__init__(symbol)
         self.depth = depth
         self.name = f"Minimax Agent (Level {depth}) ({symbol})"
         self.opponent_symbol = 'O' if symbol == 'X' else 'X'
-        self.position_cache = {}
+        self.transposition_table = TranspositionTable(tt_bits)  # Giữ lại giữa các nước đi
+        self.symmetric_tt = symmetric_tt
         
         # Pattern scores - điểm cố định cho các mẫu
         self.pattern_scores = {
@@ -29,7 +36,7 @@ class MinimaxAgent(Player):
     def get_move(self, board):
         """Lấy nước đi tốt nhất Minimax."""
         start_time = time.time()
-        self.position_cache.clear()  # Xóa cache
+        self.transposition_table.new_search(self.symbol)
         
         # Kiểm tra nhanh các trường hợp đặc biệt
         if board.moves_count == 0:
@@ -43,16 +50,14 @@ class MinimaxAgent(Player):
             row, col = move
             
             # Kiểm tra nước thắng nhanh
-            board_copy = board.copy()
-            board_copy.make_move(row, col, self.symbol)
-            if board_copy.check_winner() == self.symbol:
-                return move
+            with board.try_move(row, col, self.symbol):
+                if board.check_winner() == self.symbol:
+                    return move
             
             # Kiểm tra nước chặn thắng
-            board_copy = board.copy()
-            board_copy.make_move(row, col, self.opponent_symbol)
-            if board_copy.check_winner() == self.opponent_symbol:
-                return move
+            with board.try_move(row, col, self.opponent_symbol):
+                if board.check_winner() == self.opponent_symbol:
+                    return move
         
         # Chạy minimax cho những nước đi hứa hẹn nhất
         best_score = float('-inf')
@@ -61,10 +66,8 @@ class MinimaxAgent(Player):
         # Chỉ xét tối đa 12 nước đi hứa hẹn nhất để tăng tốc
         for move in valid_moves[:min(len(valid_moves), 12)]:
             row, col = move
-            board_copy = board.copy()
-            board_copy.make_move(row, col, self.symbol)
-            
-            score = self._minimax(board_copy, self.depth - 1, False, float('-inf'), float('inf'))
+            with board.try_move(row, col, self.symbol):
+                score = self._minimax(board, self.depth - 1, False, float('-inf'), float('inf'))
             
             if score > best_score:
                 best_score = score
@@ -83,129 +86,146 @@ class MinimaxAgent(Player):
         if not valid_moves:
             return []
             
-        scored_moves = []
-        
-        for move in valid_moves:
-            row, col = move
-            score = 0
-            
-            # 1. Ưu tiên nước đi gần quân cờ đã đặt
-            nearby_pieces = 0
-            for dr in range(-2, 3):
-                for dc in range(-2, 3):
-                    r, c = row + dr, col + dc
-                    if 0 <= r < board.size and 0 <= c < board.size and board.board[r][c] != ' ':
-                        # Quân càng gần càng có giá trị cao
-                        dist = abs(dr) + abs(dc)
-                        if dist == 1:
-                            nearby_pieces += 3  # Liền kề
-                        elif dist == 2:
-                            nearby_pieces += 1  # Cách 1 ô
-            
-            score += nearby_pieces * 10
-            
-            # 2. Điểm cho vị trí trung tâm
-            center = board.size // 2
-            distance_to_center = abs(row - center) + abs(col - center)
-            center_score = max(0, board.size - distance_to_center * 2)
-            score += center_score
-            
-            # 3. Đánh giá nhanh mẫu tấn công/phòng thủ
-            # Kiểm tra mẫu tấn công nhanh
-            board_copy = board.copy()
-            board_copy.make_move(row, col, self.symbol)
-            if self._has_potential_threat(board_copy, self.symbol):
-                score += 300
-                
-            # Kiểm tra mẫu phòng thủ nhanh
-            board_copy = board.copy()
-            board_copy.make_move(row, col, self.opponent_symbol)
-            if self._has_potential_threat(board_copy, self.opponent_symbol):
-                score += 250
-            
-            scored_moves.append((move, score))
+        scored_moves = [(move, self._promising_score(board, move)) for move in valid_moves]
         
         # Sắp xếp theo điểm giảm dần
         scored_moves.sort(key=lambda x: x[1], reverse=True)
         return [move for move, _ in scored_moves]
     
+    def _promising_score(self, board, move):
+        """Điểm hứa hẹn của một nước đi."""
+        row, col = move
+        score = 0
+        
+        # 1. Ưu tiên nước đi gần quân cờ đã đặt
+        nearby_pieces = 0
+        for dr in range(-2, 3):
+            for dc in range(-2, 3):
+                r, c = row + dr, col + dc
+                if 0 <= r < board.size and 0 <= c < board.size and board.board[r][c] != ' ':
+                    # Quân càng gần càng có giá trị cao
+                    dist = abs(dr) + abs(dc)
+                    if dist == 1:
+                        nearby_pieces += 3  # Liền kề
+                    elif dist == 2:
+                        nearby_pieces += 1  # Cách 1 ô
+        
+        score += nearby_pieces * 10
+        
+        # 2. Điểm cho vị trí trung tâm
+        center = board.size // 2
+        distance_to_center = abs(row - center) + abs(col - center)
+        center_score = max(0, board.size - distance_to_center * 2)
+        score += center_score
+        
+        # 3. Đánh giá nhanh mẫu tấn công/phòng thủ
+        # Kiểm tra mẫu tấn công nhanh
+        with board.try_move(row, col, self.symbol):
+            if self._has_potential_threat(board, self.symbol):
+                score += 300
+            
+        # Kiểm tra mẫu phòng thủ nhanh
+        with board.try_move(row, col, self.opponent_symbol):
+            if self._has_potential_threat(board, self.opponent_symbol):
+                score += 250
+        
+        return score
+    
     def _has_potential_threat(self, board, symbol):
         """Kiểm tra nhanh xem có mối đe dọa tiềm năng không."""
         # Kiểm tra nhanh các mẫu nguy hiểm: 4 liên tiếp hoặc 3 liên tiếp 2 đầu mở
-        for row in range(board.size):
-            for col in range(board.size):
-                if board.board[row][col] != symbol:
-                    continue
+        # Chỉ duyệt các quân đã đặt thay vì quét cả bàn cờ
+        for row, col, player in board.move_history:
+            if player != symbol:
+                continue
+            
+            # Kiểm tra các hướng
+            directions = [(0, 1), (1, 0), (1, 1), (1, -1)]
+            for dr, dc in directions:
+                consecutive = 1
+                open_ends = 0
                 
-                # Kiểm tra các hướng
-                directions = [(0, 1), (1, 0), (1, 1), (1, -1)]
-                for dr, dc in directions:
-                    consecutive = 1
-                    open_ends = 0
-                    
-                    # Kiểm tra trước
-                    r, c = row - dr, col - dc
-                    if 0 <= r < board.size and 0 <= c < board.size:
-                        if board.board[r][c] == ' ':
-                            open_ends += 1
-                        elif board.board[r][c] == symbol:
-                            consecutive += 1
-                            # Kiểm tra thêm
-                            r2, c2 = r - dr, c - dc
-                            if 0 <= r2 < board.size and 0 <= c2 < board.size:
-                                if board.board[r2][c2] == symbol:
-                                    consecutive += 1
-                                    r3, c3 = r2 - dr, c2 - dc
-                                    if 0 <= r3 < board.size and 0 <= c3 < board.size:
-                                        if board.board[r3][c3] == symbol:
-                                            consecutive += 1
-                                            r4, c4 = r3 - dr, c3 - dc
-                                            if 0 <= r4 < board.size and 0 <= c4 < board.size and board.board[r4][c4] == ' ':
-                                                open_ends += 1
-                                        elif board.board[r3][c3] == ' ':
+                # Kiểm tra trước
+                r, c = row - dr, col - dc
+                if 0 <= r < board.size and 0 <= c < board.size:
+                    if board.board[r][c] == ' ':
+                        open_ends += 1
+                    elif board.board[r][c] == symbol:
+                        consecutive += 1
+                        # Kiểm tra thêm
+                        r2, c2 = r - dr, c - dc
+                        if 0 <= r2 < board.size and 0 <= c2 < board.size:
+                            if board.board[r2][c2] == symbol:
+                                consecutive += 1
+                                r3, c3 = r2 - dr, c2 - dc
+                                if 0 <= r3 < board.size and 0 <= c3 < board.size:
+                                    if board.board[r3][c3] == symbol:
+                                        consecutive += 1
+                                        r4, c4 = r3 - dr, c3 - dc
+                                        if 0 <= r4 < board.size and 0 <= c4 < board.size and board.board[r4][c4] == ' ':
                                             open_ends += 1
-                                elif board.board[r2][c2] == ' ':
-                                    open_ends += 1
-                    
-                    # Kiểm tra sau
-                    r, c = row + dr, col + dc
-                    if 0 <= r < board.size and 0 <= c < board.size:
-                        if board.board[r][c] == ' ':
-                            open_ends += 1
-                        elif board.board[r][c] == symbol:
-                            consecutive += 1
-                            # Kiểm tra thêm
-                            r2, c2 = r + dr, c + dc
-                            if 0 <= r2 < board.size and 0 <= c2 < board.size:
-                                if board.board[r2][c2] == symbol:
-                                    consecutive += 1
-                                    r3, c3 = r2 + dr, c2 + dc
-                                    if 0 <= r3 < board.size and 0 <= c3 < board.size:
-                                        if board.board[r3][c3] == symbol:
-                                            consecutive += 1
-                                            r4, c4 = r3 + dr, c3 + dc
-                                            if 0 <= r4 < board.size and 0 <= c4 < board.size and board.board[r4][c4] == ' ':
-                                                open_ends += 1
-                                        elif board.board[r3][c3] == ' ':
+                                    elif board.board[r3][c3] == ' ':
+                                        open_ends += 1
+                            elif board.board[r2][c2] == ' ':
+                                open_ends += 1
+                
+                # Kiểm tra sau
+                r, c = row + dr, col + dc
+                if 0 <= r < board.size and 0 <= c < board.size:
+                    if board.board[r][c] == ' ':
+                        open_ends += 1
+                    elif board.board[r][c] == symbol:
+                        consecutive += 1
+                        # Kiểm tra thêm
+                        r2, c2 = r + dr, c + dc
+                        if 0 <= r2 < board.size and 0 <= c2 < board.size:
+                            if board.board[r2][c2] == symbol:
+                                consecutive += 1
+                                r3, c3 = r2 + dr, c2 + dc
+                                if 0 <= r3 < board.size and 0 <= c3 < board.size:
+                                    if board.board[r3][c3] == symbol:
+                                        consecutive += 1
+                                        r4, c4 = r3 + dr, c3 + dc
+                                        if 0 <= r4 < board.size and 0 <= c4 < board.size and board.board[r4][c4] == ' ':
                                             open_ends += 1
-                                elif board.board[r2][c2] == ' ':
-                                    open_ends += 1
-                    
-                    # Mẫu nguy hiểm
-                    if consecutive >= 4 or (consecutive == 3 and open_ends == 2):
-                        return True
+                                    elif board.board[r3][c3] == ' ':
+                                        open_ends += 1
+                            elif board.board[r2][c2] == ' ':
+                                open_ends += 1
+                
+                # Mẫu nguy hiểm
+                if consecutive >= 4 or (consecutive == 3 and open_ends == 2):
+                    return True
         
         return False
     
     def _minimax(self, board, depth, is_maximizing, alpha, beta):
         """Thuật toán Minimax với cắt tỉa Alpha-Beta."""
-        # Hash bàn cờ
-        board_hash = hash(str(board.board))
-        cache_key = (board_hash, depth, is_maximizing)
+        # Khóa Zobrist của bàn cờ; lượt đi được suy ra từ các quân trên bàn.
+        # Với khóa đối xứng, nước đi được lưu theo hướng chuẩn của thế cờ
+        transform = None
+        if self.symmetric_tt:
+            board_hash, transform = board.canonical_key()
+        else:
+            board_hash = board.zobrist
+        alpha_orig, beta_orig = alpha, beta
         
-        # Kiểm tra cache
-        if cache_key in self.position_cache:
-            return self.position_cache[cache_key]
+        # Kiểm tra bảng chuyển vị
+        tt_move = None
+        entry = self.transposition_table.probe(board_hash)
+        if entry is not None:
+            cached_depth, flag, cached_score, tt_move = entry
+            if transform is not None and tt_move is not None:
+                tt_move = board.from_canonical(tt_move, transform)
+            if cached_depth >= depth:
+                if flag == EXACT:
+                    return cached_score
+                if flag == LOWER:
+                    alpha = max(alpha, cached_score)
+                elif flag == UPPER:
+                    beta = min(beta, cached_score)
+                if alpha >= beta:
+                    return cached_score
         
         # Kiểm tra điều kiện kết thúc
         winner = board.check_winner()
@@ -216,41 +236,46 @@ class MinimaxAgent(Player):
         elif board.is_full() or depth == 0:
             return self._evaluate_board(board)
         
-        # Chỉ lấy một số nước đi hứa hẹn để tăng tốc
-        moves = self._get_promising_moves(board)[:8]  # Giới hạn 8 nước đi
+        # Chỉ lấy 8 nước đi đầu tiên của bộ sinh theo giai đoạn: nước từ bảng
+        # chuyển vị, thắng, chặn, tạo đe dọa rồi mới đến các nước hứa hẹn khác;
+        # điểm hứa hẹn chỉ được tính khi các giai đoạn trước chưa đủ 8 nước
+        mover = self.symbol if is_maximizing else self.opponent_symbol
+        moves = islice(staged_moves(board, mover, tt_move,
+                                    quiet_score=lambda move: self._promising_score(board, move)), 8)
         
+        best_move = None
         if is_maximizing:
             best_score = float('-inf')
-            for move in moves:
+            for move, _ in moves:
                 row, col = move
-                board_copy = board.copy()
-                board_copy.make_move(row, col, self.symbol)
-                
-                score = self._minimax(board_copy, depth - 1, False, alpha, beta)
-                best_score = max(best_score, score)
+                with board.try_move(row, col, self.symbol):
+                    score = self._minimax(board, depth - 1, False, alpha, beta)
+                if score > best_score:
+                    best_score = score
+                    best_move = move
                 
                 alpha = max(alpha, best_score)
                 if beta <= alpha:
                     break
-            
-            self.position_cache[cache_key] = best_score
-            return best_score
         else:
             best_score = float('inf')
-            for move in moves:
+            for move, _ in moves:
                 row, col = move
-                board_copy = board.copy()
-                board_copy.make_move(row, col, self.opponent_symbol)
-                
-                score = self._minimax(board_copy, depth - 1, True, alpha, beta)
-                best_score = min(best_score, score)
+                with board.try_move(row, col, self.opponent_symbol):
+                    score = self._minimax(board, depth - 1, True, alpha, beta)
+                if score < best_score:
+                    best_score = score
+                    best_move = move
                 
                 beta = min(beta, best_score)
                 if beta <= alpha:
                     break
-            
-            self.position_cache[cache_key] = best_score
-            return best_score
+        
+        flag = bound_flag(best_score, alpha_orig, beta_orig)
+        if transform is not None and best_move is not None:
+            best_move = board.to_canonical(best_move, transform)
+        self.transposition_table.store(board_hash, depth, flag, best_score, best_move)
+        return best_score
     
     def _evaluate_board(self, board):
         """Đánh giá trạng thái bàn cờ."""
@@ -267,67 +292,68 @@ class MinimaxAgent(Player):
         score = 0
         checked = set()  # Tránh đánh giá lặp lại
         
-        for row in range(board.size):
-            for col in range(board.size):
-                if board.board[row][col] != symbol or (row, col) in checked:
+        # Duyệt các quân đã đặt theo thứ tự hàng-cột (như khi quét cả bàn cờ)
+        stones = sorted((row, col) for row, col, player in board.move_history if player == symbol)
+        for row, col in stones:
+            if (row, col) in checked:
+                continue
+            
+            # Đánh giá 4 hướng
+            directions = [(0, 1), (1, 0), (1, 1), (1, -1)]
+            
+            for dr, dc in directions:
+                # Bỏ qua nếu đã kiểm tra
+                if (row, col, dr, dc) in checked:
                     continue
+                    
+                consecutive = 1
+                open_ends = 0
+                pattern_cells = [(row, col)]
                 
-                # Đánh giá 4 hướng
-                directions = [(0, 1), (1, 0), (1, 1), (1, -1)]
+                # Kiểm tra về trước
+                r, c = row - dr, col - dc
+                while 0 <= r < board.size and 0 <= c < board.size:
+                    if board.board[r][c] == symbol:
+                        consecutive += 1
+                        pattern_cells.append((r, c))
+                    elif board.board[r][c] == ' ':
+                        open_ends += 1
+                        break
+                    else:
+                        break
+                    r -= dr
+                    c -= dc
                 
-                for dr, dc in directions:
-                    # Bỏ qua nếu đã kiểm tra
-                    if (row, col, dr, dc) in checked:
-                        continue
-                        
-                    consecutive = 1
-                    open_ends = 0
-                    pattern_cells = [(row, col)]
-                    
-                    # Kiểm tra về trước
-                    r, c = row - dr, col - dc
-                    while 0 <= r < board.size and 0 <= c < board.size:
-                        if board.board[r][c] == symbol:
-                            consecutive += 1
-                            pattern_cells.append((r, c))
-                        elif board.board[r][c] == ' ':
-                            open_ends += 1
-                            break
-                        else:
-                            break
-                        r -= dr
-                        c -= dc
-                    
-                    # Kiểm tra về sau
-                    r, c = row + dr, col + dc
-                    while 0 <= r < board.size and 0 <= c < board.size:
-                        if board.board[r][c] == symbol:
-                            consecutive += 1
-                            pattern_cells.append((r, c))
-                        elif board.board[r][c] == ' ':
-                            open_ends += 1
-                            break
-                        else:
-                            break
-                        r += dr
-                        c += dc
-                    
-                    # Đánh dấu các ô đã kiểm tra
-                    for cell in pattern_cells:
-                        checked.add(cell)
-                    checked.add((row, col, dr, dc))
-                    
-                    # Tính điểm dựa trên mẫu
-                    if consecutive >= 5:
-                        score += self.pattern_scores[5] * weight
-                    elif consecutive == 4:
-                        if open_ends in self.pattern_scores[4]:
-                            score += self.pattern_scores[4][open_ends] * weight
-                    elif consecutive == 3:
-                        if open_ends in self.pattern_scores[3]:
-                            score += self.pattern_scores[3][open_ends] * weight
-                    elif consecutive == 2:
-                        if open_ends in self.pattern_scores[2]:
-                            score += self.pattern_scores[2][open_ends] * weight
+                # Kiểm tra về sau
+                r, c = row + dr, col + dc
+                while 0 <= r < board.size and 0 <= c < board.size:
+                    if board.board[r][c] == symbol:
+                        consecutive += 1
+                        pattern_cells.append((r, c))
+                    elif board.board[r][c] == ' ':
+                        open_ends += 1
+                        break
+                    else:
+                        break
+                    r += dr
+                    c += dc
+                
+                # Đánh dấu các ô đã kiểm tra
+                for cell in pattern_cells:
+                    checked.add(cell)
+                checked.add((row, col, dr, dc))
+                
+                # Tính điểm dựa trên mẫu
+                if consecutive >= 5:
+                    score += self.pattern_scores[5] * weight
+                elif consecutive == 4:
+                    if open_ends in self.pattern_scores[4]:
+                        score += self.pattern_scores[4][open_ends] * weight
+                elif consecutive == 3:
+                    if open_ends in self.pattern_scores[3]:
+                        score += self.pattern_scores[3][open_ends] * weight
+                elif consecutive == 2:
+                    if open_ends in self.pattern_scores[2]:
+                        score += self.pattern_scores[2][open_ends] * weight
         
         return score
\ No newline at end of file
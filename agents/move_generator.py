@@ -0,0 +1,117 @@
+"""Sinh nước đi theo từng giai đoạn, chỉ tính điểm khi giai đoạn đó được dùng tới.
+
+Thứ tự các giai đoạn: nước đi từ bảng chuyển vị, nước thắng ngay, nước chặn
+đối thủ thắng, nước tạo bốn/ba mở, các nước killer, cuối cùng là các nước
+yên tĩnh được sắp xếp dần theo hàm chấm điểm. Khi nước đầu tiên đã gây cắt
+tỉa, các giai đoạn sau không bao giờ được tính.
+
+quiescence_moves sinh tập nước hẹp hơn nhiều cho tìm kiếm tĩnh ở lá: chỉ
+các nước tạo bốn và các nước chặn ba mở của đối thủ.
+"""
+import heapq
+from game.patterns import THREAT_OPEN_FOUR
+from agents.vcf import four_moves, _window_empties
+
+# Các giai đoạn sinh nước đi
+STAGE_TT = 0
+STAGE_WIN = 1
+STAGE_BLOCK = 2
+STAGE_THREAT = 3
+STAGE_KILLER = 4
+STAGE_QUIET = 5
+
+
+def staged_moves(board, mover, tt_move=None, killers=(), quiet_score=None):
+    """Sinh lần lượt các nước đi (move, stage) theo thứ tự giai đoạn.
+
+    Args:
+        board: Bàn cờ
+        mover: Người chơi sắp đi ('X' hoặc 'O')
+        tt_move: Nước đi tốt nhất từ bảng chuyển vị, hoặc None
+        killers: Các nước killer/counter-move theo thứ tự ưu tiên
+        quiet_score: Hàm nhận nước đi, trả về điểm để sắp xếp các nước yên tĩnh
+
+    Yields:
+        tuple: (nước đi (row, col), giai đoạn STAGE_*)
+    """
+    opponent = 'O' if mover == 'X' else 'X'
+    candidates = board.get_valid_moves()
+    remaining = dict.fromkeys(candidates)  # Giữ thứ tự, loại dần các nước đã sinh
+
+    if tt_move is not None and tt_move in remaining:
+        del remaining[tt_move]
+        yield tt_move, STAGE_TT
+
+    # Thắng ngay
+    wins = [move for move in remaining if board._check_win_at(move[0], move[1], mover)]
+    for move in wins:
+        del remaining[move]
+        yield move, STAGE_WIN
+
+    # Chặn nước thắng của đối thủ
+    blocks = [move for move in remaining if board._check_win_at(move[0], move[1], opponent)]
+    for move in blocks:
+        del remaining[move]
+        yield move, STAGE_BLOCK
+
+    # Tạo bốn hoặc ba mở, mạnh nhất trước. Mức đe dọa lấy từ threat cache của
+    # bàn cờ (bốn mở 100, bốn 50, ba mở 20 mỗi hướng), vẫn đúng qua các nước
+    # đi ở xa nên thường không phải tính lại
+    threats = []
+    for move in remaining:
+        level = board._check_threat_patterns(move[0], move[1], mover)
+        if level:
+            threats.append((level, move))
+    threats.sort(key=lambda item: item[0], reverse=True)
+    for _, move in threats:
+        del remaining[move]
+        yield move, STAGE_THREAT
+
+    # Killer và counter-move
+    for move in killers:
+        if move is not None and move in remaining:
+            del remaining[move]
+            yield move, STAGE_KILLER
+
+    # Các nước yên tĩnh: chỉ chấm điểm khi tới giai đoạn này, lấy dần từ heap
+    if quiet_score is None:
+        for move in list(remaining):
+            yield move, STAGE_QUIET
+        return
+
+    heap = [(-quiet_score(move), index, move) for index, move in enumerate(remaining)]
+    heapq.heapify(heap)
+    while heap:
+        yield heapq.heappop(heap)[2], STAGE_QUIET
+
+
+def quiescence_moves(board, mover):
+    """Các nước chiến thuật cho tìm kiếm tĩnh: tạo bốn, rồi chặn ba mở của đối thủ.
+
+    Ô chặn ba mở là ô mà đối thủ đặt vào sẽ thành bốn mở. Trường hợp đối
+    thủ đã có bốn (phải chặn ô thắng) do nơi gọi xử lý trước.
+
+    Args:
+        board: Bàn cờ
+        mover: Người chơi sắp đi ('X' hoặc 'O')
+
+    Returns:
+        list: Các nước đi (row, col), mạnh nhất trước
+    """
+    opponent = 'O' if mover == 'X' else 'X'
+
+    fours = [(board._check_threat_patterns(row, col, mover), (row, col))
+             for row, col in four_moves(board, mover)]
+    fours.sort(reverse=True)
+    moves = [move for _, move in fours]
+
+    seen = set(moves)
+    for empties in _window_empties(board, opponent, 3):
+        for cell in empties:
+            if cell in seen:
+                continue
+            seen.add(cell)
+            patterns = board.get_threat_patterns(cell[0], cell[1], opponent)
+            if any(pattern.threat == THREAT_OPEN_FOUR for pattern in patterns):
+                moves.append(cell)
+    return moves
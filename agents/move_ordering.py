@@ -0,0 +1,115 @@
+"""Các bảng heuristic sắp xếp nước đi dùng chung cho tìm kiếm Alpha-Beta.
+
+- Killer: mỗi tầng (ply) giữ vài nước gần đây gây cắt tỉa ở tầng đó.
+- History (butterfly): điểm size x size cho mỗi bên, cộng depth^2 mỗi lần
+  nước đi gây cắt tỉa, giảm một nửa sau mỗi lượt tìm kiếm.
+- Counter-move: nước đáp trả đã gây cắt tỉa cho từng nước đi trước đó của
+  đối thủ.
+
+Mọi bảng đều có kích thước cố định theo bàn cờ. Bàn cờ quá lớn (bàn cờ
+thưa) dùng dict chỉ chứa các ô đã từng gây cắt tỉa.
+"""
+from collections import Counter
+
+# Bàn cờ có nhiều ô hơn mức này dùng bảng dạng dict thay cho list
+_DENSE_LIMIT = 128 * 128
+
+
+class MoveOrdering:
+    """Bảng killer, history và counter-move cho một kích thước bàn cờ."""
+
+    def __init__(self, size, max_ply=64, killer_slots=2):
+        """Khởi tạo các bảng rỗng.
+
+        Args:
+            size: Kích thước bàn cờ
+            max_ply: Số tầng tối đa có bảng killer
+            killer_slots: Số nước killer giữ ở mỗi tầng
+        """
+        self.size = size
+        self.max_ply = max_ply
+        self.killer_slots = killer_slots
+        self.dense = size * size <= _DENSE_LIMIT
+
+        self.killers = [[None] * killer_slots for _ in range(max_ply)]
+        if self.dense:
+            self.history = {'X': [0] * (size * size), 'O': [0] * (size * size)}
+            self.counter_moves = {'X': [None] * (size * size), 'O': [None] * (size * size)}
+        else:
+            # Counter trả về 0 cho ô chưa có mà không thêm mục mới
+            self.history = {'X': Counter(), 'O': Counter()}
+            self.counter_moves = {'X': {}, 'O': {}}
+
+    def _index(self, move):
+        """Chỉ số phẳng của nước đi (row, col)."""
+        return move[0] * self.size + move[1]
+
+    def new_search(self):
+        """Chuẩn bị cho lượt tìm kiếm mới: xóa killer, giảm một nửa điểm history."""
+        for slots in self.killers:
+            for index in range(self.killer_slots):
+                slots[index] = None
+
+        for player in ('X', 'O'):
+            table = self.history[player]
+            if self.dense:
+                for index, value in enumerate(table):
+                    if value:
+                        table[index] = value // 2
+            else:
+                self.history[player] = Counter({index: value // 2
+                                                for index, value in table.items() if value > 1})
+
+    def is_killer(self, ply, move):
+        """Kiểm tra nước đi có nằm trong các ô killer của tầng ply không.
+
+        Returns:
+            int: Thứ tự ô killer (0 là mới nhất), -1 nếu không phải killer
+        """
+        if ply < self.max_ply:
+            slots = self.killers[ply]
+            if move in slots:
+                return slots.index(move)
+        return -1
+
+    def killer_moves(self, ply):
+        """Các nước killer của tầng ply, mới nhất trước."""
+        if ply < self.max_ply:
+            return [move for move in self.killers[ply] if move is not None]
+        return []
+
+    def history_score(self, player, move):
+        """Điểm history của nước đi cho người chơi."""
+        return self.history[player][self._index(move)]
+
+    def counter_move(self, player, previous_move):
+        """Nước đáp trả tốt của player cho nước đi trước đó của đối thủ, hoặc None."""
+        if previous_move is None:
+            return None
+        table = self.counter_moves[player]
+        index = self._index(previous_move)
+        return table[index] if self.dense else table.get(index)
+
+    def record_cutoff(self, ply, player, move, depth, previous_move):
+        """Ghi nhận nước đi gây cắt tỉa vào cả ba bảng.
+
+        Args:
+            ply: Tầng của nút (0 là gốc)
+            player: Người chơi đi nước đó
+            move: Nước đi (row, col) gây cắt tỉa
+            depth: Độ sâu còn lại của nút
+            previous_move: Nước đi trước đó của đối thủ (row, col) hoặc None
+        """
+        if ply < self.max_ply:
+            slots = self.killers[ply]
+            if slots[0] != move:
+                if move in slots:
+                    slots.remove(move)
+                else:
+                    slots.pop()
+                slots.insert(0, move)
+
+        self.history[player][self._index(move)] += depth * depth
+
+        if previous_move is not None:
+            self.counter_moves[player][self._index(previous_move)] = move
@@ -0,0 +1,197 @@
+"""Sách khai cuộc: nước đi đã tìm sẵn cho các thế cờ đầu ván.
+
+Tệp sách gồm một header (mã nhận dạng, phiên bản, kích thước bàn cờ, số bản
+ghi) và các bản ghi kích thước cố định (khóa, hàng, cột, điểm) được sắp xếp
+theo khóa. Khóa là Board.canonical_key nên mỗi thế cờ chỉ cần một bản ghi cho
+cả 8 hướng đối xứng; nước đi được lưu theo hướng chuẩn. OpeningBook mở tệp
+bằng mmap và tìm nhị phân trực tiếp trên tệp, không nạp toàn bộ vào bộ nhớ.
+
+Tạo sách (tìm kiếm sâu, chạy một lần):
+    python -m agents.opening_book opening_book.bin --size 15 --plies 4 --depth 4
+"""
+import argparse
+import mmap
+import struct
+from game.bitboard import BitBoard
+
+_MAGIC = b'CRBK'
+_VERSION = 1
+_HEADER = struct.Struct('<4sHHI')  # Mã nhận dạng, phiên bản, kích thước bàn cờ, số bản ghi
+_RECORD = struct.Struct('<QHHi')   # Khóa, hàng, cột, điểm
+_KEY = struct.Struct('<Q')
+
+_SCORE_LIMIT = (1 << 31) - 1
+
+
+def write_book(path, board_size, entries):
+    """Ghi tệp sách khai cuộc.
+
+    Args:
+        path: Đường dẫn tệp
+        board_size: Kích thước bàn cờ của sách
+        entries: Dict khóa -> (nước đi theo hướng chuẩn, điểm)
+    """
+    with open(path, 'wb') as book_file:
+        book_file.write(_HEADER.pack(_MAGIC, _VERSION, board_size, len(entries)))
+        for key in sorted(entries):
+            (row, col), score = entries[key]
+            score = max(-_SCORE_LIMIT, min(_SCORE_LIMIT, int(round(score))))
+            book_file.write(_RECORD.pack(key, row, col, score))
+
+
+def build_book(path, board_size=15, plies=4, depth=4, width=3, agent_options=None, verbose=False):
+    """Tạo sách khai cuộc bằng tìm kiếm Alpha-Beta cho plies nước đầu.
+
+    Từ bàn cờ trống, mỗi thế cờ được tìm với độ sâu depth; nước tốt nhất và
+    width - 1 nước đứng đầu theo thứ tự sắp xếp được đi tiếp để sách có cả
+    các nước đáp hợp lý của đối thủ. Các thế cờ đối xứng chỉ được tìm một lần.
+
+    Args:
+        path: Đường dẫn tệp sách
+        board_size: Kích thước bàn cờ
+        plies: Số nước đầu ván được đưa vào sách
+        depth: Độ sâu tìm kiếm cho mỗi thế cờ
+        width: Số nước được đi tiếp từ mỗi thế cờ
+        agent_options: Tham số thêm cho AlphaBetaAgent
+        verbose: In tiến độ
+
+    Returns:
+        int: Số thế cờ trong sách
+    """
+    # Import tại chỗ để tránh import vòng với alphabeta_agent
+    from agents.alphabeta_agent import AlphaBetaAgent
+
+    options = {'time_limit': None, 'ponder': False}
+    options.update(agent_options or {})
+    agents = {symbol: AlphaBetaAgent(symbol, depth, **options) for symbol in ('X', 'O')}
+    entries = {}
+    board = BitBoard(board_size)
+
+    def visit(player, ply):
+        if ply >= plies or board.check_winner() or board.is_full():
+            return
+        key, transform = board.canonical_key()
+        if key in entries:
+            return
+
+        agent = agents[player]
+        move = agent.get_move(board)
+        entries[key] = (board.to_canonical(move, transform), agent.last_score or 0)
+        if verbose:
+            print(f"Sách khai cuộc: {len(entries)} thế cờ (nước {ply + 1}: {move})")
+
+        # Nước tốt nhất rồi các nước đứng đầu, bỏ các nước cho thế cờ đối xứng nhau
+        children = []
+        child_keys = set()
+        for row, col in [move] + agent._order_moves(board, player):
+            child_key = board.canonical_key_after(row, col, player)[0]
+            if child_key not in child_keys:
+                child_keys.add(child_key)
+                children.append((row, col))
+                if len(children) == width:
+                    break
+
+        opponent = 'O' if player == 'X' else 'X'
+        for row, col in children:
+            with board.try_move(row, col, player):
+                visit(opponent, ply + 1)
+
+    visit('X', 0)
+    for agent in agents.values():
+        agent.close()
+
+    write_book(path, board_size, entries)
+    return len(entries)
+
+
+class OpeningBook:
+    """Đọc sách khai cuộc bằng mmap và tìm nhị phân theo khóa đối xứng."""
+
+    def __init__(self, path):
+        """Mở tệp sách.
+
+        Args:
+            path: Đường dẫn tệp sách
+
+        Raises:
+            ValueError: Tệp không phải sách khai cuộc hợp lệ
+        """
+        self.file = open(path, 'rb')
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, self.board_size, self.count = _HEADER.unpack_from(self.data, 0)
+            if (magic != _MAGIC or version != _VERSION
+                    or len(self.data) != _HEADER.size + self.count * _RECORD.size):
+                raise ValueError(f"Tệp sách khai cuộc không hợp lệ: {path}")
+        except (ValueError, struct.error):
+            self.close()
+            raise
+
+    def __len__(self):
+        return self.count
+
+    def probe(self, key):
+        """Các bản ghi của một khóa.
+
+        Args:
+            key: Khóa canonical_key của thế cờ
+
+        Returns:
+            list: Các cặp (nước đi theo hướng chuẩn, điểm)
+        """
+        data = self.data
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if _KEY.unpack_from(data, _HEADER.size + middle * _RECORD.size)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        results = []
+        for index in range(low, self.count):
+            record_key, row, col, score = _RECORD.unpack_from(
+                data, _HEADER.size + index * _RECORD.size)
+            if record_key != key:
+                break
+            results.append(((row, col), score))
+        return results
+
+    def best_move(self, board):
+        """Nước đi của sách cho thế cờ hiện tại.
+
+        Args:
+            board: Bàn cờ
+
+        Returns:
+            tuple hoặc None: Nước đi (row, col) điểm cao nhất, None nếu thế cờ
+            không có trong sách
+        """
+        if board.size != self.board_size:
+            return None
+        key, transform = board.canonical_key()
+        entries = self.probe(key)
+        if not entries:
+            return None
+        move, _ = max(entries, key=lambda entry: entry[1])
+        move = board.from_canonical(move, transform)
+        return move if board.is_valid_move(*move) else None
+
+    def close(self):
+        """Đóng tệp sách."""
+        if getattr(self, 'data', None) is not None:
+            self.data.close()
+            self.data = None
+        self.file.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Tạo sách khai cuộc cho Alpha-Beta Agent")
+    parser.add_argument('path', help="Tệp sách cần ghi")
+    parser.add_argument('--size', type=int, default=15, help="Kích thước bàn cờ")
+    parser.add_argument('--plies', type=int, default=4, help="Số nước đầu ván")
+    parser.add_argument('--depth', type=int, default=4, help="Độ sâu tìm kiếm mỗi thế cờ")
+    parser.add_argument('--width', type=int, default=3, help="Số nước đi tiếp từ mỗi thế cờ")
+    args = parser.parse_args()
+    count = build_book(args.path, args.size, args.plies, args.depth, args.width, verbose=True)
+    print(f"Đã ghi {count} thế cờ vào {args.path}")
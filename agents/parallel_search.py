@@ -0,0 +1,152 @@
+"""Tìm kiếm Alpha-Beta song song ở gốc trên một nhóm tiến trình.
+
+Các nước đi ở gốc (đã sắp xếp) được gửi lần lượt cho các tiến trình con
+của một ProcessPoolExecutor. Bàn cờ được gửi dưới dạng mã hóa gọn
+(Board.to_bytes) thay vì pickle cả đối tượng. Alpha tốt nhất hiện tại được
+chia sẻ qua một multiprocessing.Value, nên các nước được duyệt sau vẫn bị
+cắt tỉa theo kết quả của các tiến trình khác.
+
+Để kết quả không phụ thuộc thứ tự hoàn thành của các tiến trình, mỗi nước
+được tìm với cận dưới thấp hơn alpha chung một khoảng nhỏ (các nước hòa
+điểm với nước tốt nhất vẫn có điểm chính xác), và bảng chuyển vị của tiến
+trình con chỉ dùng điểm lưu ở đúng độ sâu đang tìm. Tiến trình con không
+giảm độ sâu các nước xếp cuối (LMR), vì độ giảm phụ thuộc cửa sổ tìm kiếm
+mà cửa sổ lại lấy từ alpha chung.
+"""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# Khoảng hạ cận dưới để nhận ra chính xác các nước hòa điểm tốt nhất
+_TIE_MARGIN = 1e-6
+
+# Trạng thái của tiến trình con, tạo bởi _init_worker
+_WORKER = {}
+
+
+def _init_worker(agent_class, options, shared_alpha):
+    """Khởi tạo tiến trình con: một agent riêng và alpha dùng chung.
+
+    Args:
+        agent_class: Lớp agent (AlphaBetaAgent)
+        options: Tham số khởi tạo agent
+        shared_alpha: multiprocessing.Value chứa alpha tốt nhất hiện tại
+    """
+    agent = agent_class(**options)
+    agent.tt_exact_depth = True
+    _WORKER.update(agent=agent, shared_alpha=shared_alpha,
+                   board_data=None, board=None, search_id=None)
+
+
+def _search_move(board_class, board_data, symbol, move, depth, alpha, beta, deadline, search_id):
+    """Tìm điểm của một nước đi ở gốc trong tiến trình con.
+
+    Args:
+        board_class: Lớp bàn cờ dùng để giải mã
+        board_data: Bàn cờ đã mã hóa bằng to_bytes
+        symbol: Quân của agent ở gốc
+        move: Nước đi ở gốc cần tìm
+        depth: Độ sâu tìm kiếm tính từ gốc
+        alpha, beta: Cửa sổ tìm kiếm ở gốc
+        deadline: Hạn chót (time.time()) hoặc None
+        search_id: Mã lượt tìm kiếm, đổi mỗi nước đi của agent
+
+    Returns:
+        tuple: (nước đi, điểm), điểm là None nếu nước không cần tìm nữa
+    """
+    agent = _WORKER['agent']
+    shared_alpha = _WORKER['shared_alpha']
+
+    if board_data != _WORKER['board_data']:
+        _WORKER['board'] = board_class.from_bytes(board_data)
+        _WORKER['board_data'] = board_data
+    board = _WORKER['board']
+
+    if search_id != _WORKER['search_id']:
+        _WORKER['search_id'] = search_id
+        agent.symbol = symbol
+        agent.opponent_symbol = 'O' if symbol == 'X' else 'X'
+        agent.transposition_table.new_search(symbol)
+        agent._ordering_for(board).new_search()
+        agent.root_ply = board.moves_count
+
+    # Bộ đệm VCF phụ thuộc các nước đã tìm trước đó trong tiến trình này
+    agent.vcf_solver.cache.clear()
+    agent.deadline = deadline
+
+    lower = max(alpha, shared_alpha.value)
+    if lower >= beta:
+        return move, None
+
+    row, col = move
+    with board.try_move(row, col, symbol):
+        score = agent._alpha_beta(board, depth - 1, lower - _TIE_MARGIN, beta, False)
+
+    with shared_alpha.get_lock():
+        if score > shared_alpha.value:
+            shared_alpha.value = score
+    return move, score
+
+
+class RootSearchPool:
+    """Nhóm tiến trình tìm các nước đi ở gốc song song."""
+
+    def __init__(self, workers, agent_class, options):
+        """Tạo nhóm tiến trình.
+
+        Args:
+            workers: Số tiến trình con
+            agent_class: Lớp agent được tạo trong mỗi tiến trình con
+            options: Tham số khởi tạo agent trong tiến trình con
+        """
+        self.workers = workers
+        self.shared_alpha = multiprocessing.Value('d', float('-inf'))
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker,
+            initargs=(agent_class, options, self.shared_alpha))
+
+    def search(self, board, symbol, moves, depth, alpha, beta, deadline, search_id):
+        """Tìm điểm của các nước đi ở gốc.
+
+        Args:
+            board: Bàn cờ ở gốc
+            symbol: Quân của agent
+            moves: Các nước đi theo thứ tự ưu tiên
+            depth: Độ sâu tìm kiếm
+            alpha, beta: Cửa sổ tìm kiếm
+            deadline: Hạn chót hoặc None
+            search_id: Mã lượt tìm kiếm
+
+        Returns:
+            tuple: (điểm tốt nhất, các nước đi tốt nhất theo thứ tự của moves,
+            điểm của từng nước đã tìm)
+        """
+        with self.shared_alpha.get_lock():
+            self.shared_alpha.value = alpha
+
+        board_data = board.to_bytes()
+        futures = [self.executor.submit(_search_move, type(board), board_data, symbol, move,
+                                        depth, alpha, beta, deadline, search_id)
+                   for move in moves]
+
+        root_scores = {}
+        try:
+            for future in futures:
+                move, score = future.result()
+                if score is not None:
+                    root_scores[move] = score
+        except BaseException:
+            # Hết giờ (hoặc lỗi): bỏ các nước còn trong hàng đợi; nước nào đã
+            # được tiến trình con nhận thì trả về ngay vì alpha chung vượt beta
+            for future in futures:
+                future.cancel()
+            with self.shared_alpha.get_lock():
+                self.shared_alpha.value = float('inf')
+            raise
+
+        best_score = max(root_scores.values(), default=float('-inf'))
+        best_moves = [move for move in moves if root_scores.get(move) == best_score]
+        return best_score, best_moves, root_scores
+
+    def close(self):
+        """Dừng các tiến trình con."""
+        self.executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,44 @@
+"""Suy nghĩ trong thời gian của đối thủ (pondering) bằng một luồng chạy nền.
+
+Agent bắt đầu ponder ngay sau nước đi của chính mình (Player.on_move_played)
+trên một bản sao bàn cờ, và dừng khi nước của đối thủ tới hoặc khi được hỏi
+nước đi. Luồng nền dùng chung bảng chuyển vị, bảng sắp xếp nước đi hay cây
+tìm kiếm của agent, nên công sức bỏ ra vẫn còn sau khi dừng. Trong lúc
+Game.play chờ input() của người chơi, luồng nền có trọn CPU; khi đối thủ là
+một engine khác trong cùng tiến trình, hai bên chia nhau GIL.
+"""
+import threading
+
+
+class Ponderer:
+    """Quản lý luồng ponder của một agent: bắt đầu, dừng và cờ dừng."""
+
+    def __init__(self):
+        """Khởi tạo, chưa có luồng nào chạy."""
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    @property
+    def active(self):
+        """Luồng ponder đang chạy hay không."""
+        return self.thread is not None
+
+    def start(self, target, *args):
+        """Dừng lượt ponder cũ (nếu có) và chạy target(*args) trong luồng nền.
+
+        Args:
+            target: Hàm tìm kiếm, cần tự dừng khi stop_event được đặt
+            args: Tham số của target
+        """
+        self.stop()
+        self.thread = threading.Thread(target=target, args=args, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Yêu cầu luồng ponder dừng và chờ nó kết thúc."""
+        if self.thread is None:
+            return
+        self.stop_event.set()
+        self.thread.join()
+        self.thread = None
+        self.stop_event.clear()
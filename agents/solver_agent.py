@@ -0,0 +1,41 @@
+from game.player import Player
+from agents.alphabeta_agent import AlphaBetaAgent
+from agents.dfpn import DFPNSolver, WIN, DRAW
+
+class SolverAgent(Player):
+    """Agent giải thế cờ bằng df-pn, dùng Alpha-Beta khi chưa giải được."""
+    
+    def __init__(self, symbol, node_budget=20000, table_bits=18, fallback_depth=3, symmetric=False):
+        """Khởi tạo agent giải cờ.
+        
+        Args:
+            symbol: Ký hiệu của agent ('X' hoặc 'O')
+            node_budget: Số nút df-pn tối đa cho mỗi lần chứng minh
+            table_bits: Bảng pn/dn có 2 ** table_bits mục
+            fallback_depth: Độ sâu Alpha-Beta khi không giải được thế cờ
+            symmetric: Bảng pn/dn dùng chung mục cho các thế cờ đối xứng
+        """
+        super().__init__(symbol)
+        self.name = f"Solver Agent ({symbol})"
+        self.solver = DFPNSolver(table_bits, symmetric)
+        self.node_budget = node_budget
+        self.fallback = AlphaBetaAgent(symbol, fallback_depth)
+        self.last_result = None  # Kết quả giải của nước đi gần nhất
+    
+    def get_move(self, board):
+        """Lấy nước đi thắng (hoặc giữ hòa) đã được chứng minh, nếu có.
+        
+        Args:
+            board: Bàn cờ hiện tại
+        
+        Returns:
+            tuple: Tọa độ (row, col) của nước đi
+        """
+        self.last_result, move = self.solver.solve(board, self.symbol, self.node_budget)
+        if self.last_result in (WIN, DRAW) and move is not None:
+            return move
+        
+        # Thua hoặc chưa giải xong: chơi như Alpha-Beta
+        self.fallback.symbol = self.symbol
+        self.fallback.opponent_symbol = 'O' if self.symbol == 'X' else 'X'
+        return self.fallback.get_move(board)
\ No newline at end of file
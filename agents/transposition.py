@@ -0,0 +1,358 @@
+"""Bảng chuyển vị (transposition table) kích thước cố định cho các agent tìm kiếm.
+
+Các mục được lưu trong các mảng song song (module array) chia thành từng
+nhóm (bucket) nhiều ô, nên bộ nhớ không tăng theo số thế cờ đã gặp. Mỗi mục
+giữ điểm kèm loại cận (chính xác / cận dưới / cận trên), nước đi tốt nhất
+để sắp xếp nước đi và thế hệ tìm kiếm để ưu tiên thay các mục cũ.
+
+SharedTranspositionTable có cùng giao diện nhưng đặt các mục (đóng gói thành
+bản ghi 16 byte) trong vùng nhớ dùng chung, cho tìm kiếm Lazy SMP.
+"""
+import struct
+from array import array
+from multiprocessing import shared_memory
+
+# Loại cận của điểm được lưu
+EXACT = 0  # Điểm chính xác, nằm trong cửa sổ (alpha, beta)
+LOWER = 1  # Cận dưới: tìm kiếm bị cắt vì điểm >= beta
+UPPER = 2  # Cận trên: không nước nào vượt được alpha
+
+_EMPTY_DEPTH = -1
+_NO_MOVE = -1
+_GENERATION_MASK = 0xFFFF
+
+
+def _encode_move(move):
+    """Mã hóa nước đi (row, col) thành một số nguyên, None thành _NO_MOVE."""
+    if move is None:
+        return _NO_MOVE
+    row, col = move
+    return (row << 32) | col
+
+
+def _decode_move(code):
+    """Giải mã số nguyên thành nước đi (row, col) hoặc None."""
+    if code == _NO_MOVE:
+        return None
+    return code >> 32, code & 0xFFFFFFFF
+
+
+class TranspositionTable:
+    """Bảng chuyển vị dạng mảng với số mục cố định.
+
+    Khóa 64-bit (Zobrist) chọn một nhóm gồm `ways` ô. Khi nhóm đầy, mục bị
+    thay là mục thuộc thế hệ tìm kiếm cũ, rồi đến mục có độ sâu nhỏ nhất.
+    """
+
+    def __init__(self, capacity_bits=16, ways=4):
+        """Khởi tạo bảng với 2 ** capacity_bits mục.
+
+        Args:
+            capacity_bits: Số bit của dung lượng bảng (số mục = 2 ** capacity_bits)
+            ways: Số ô trong mỗi nhóm
+        """
+        self.capacity = 1 << capacity_bits
+        self.ways = ways
+        self.bucket_mask = self.capacity // ways - 1
+
+        self.keys = array('Q', [0]) * self.capacity
+        self.scores = array('d', [0.0]) * self.capacity
+        self.depths = array('h', [_EMPTY_DEPTH]) * self.capacity
+        self.flags = array('b', [EXACT]) * self.capacity
+        self.moves = array('q', [_NO_MOVE]) * self.capacity
+        self.generations = array('H', [0]) * self.capacity
+
+        self.perspective = None
+        self.generation = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.overwrites = 0
+
+    def new_search(self, perspective=None):
+        """Bắt đầu một lượt tìm kiếm mới: các mục hiện có trở thành thế hệ cũ.
+
+        Args:
+            perspective: Góc nhìn của điểm được lưu (thường là quân của agent);
+                nếu khác lượt trước, các mục cũ không còn đúng nên bảng được xóa
+        """
+        if perspective != self.perspective:
+            self.clear()
+            self.perspective = perspective
+        self.generation = (self.generation + 1) & _GENERATION_MASK
+
+    def clear(self):
+        """Xóa toàn bộ các mục và thống kê."""
+        self.depths = array('h', [_EMPTY_DEPTH]) * self.capacity
+        self.generation = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.overwrites = 0
+
+    def probe(self, key):
+        """Tìm mục của một thế cờ.
+
+        Args:
+            key: Khóa Zobrist 64-bit của thế cờ
+
+        Returns:
+            tuple hoặc None: (độ sâu, loại cận, điểm, nước đi tốt nhất) nếu có
+        """
+        self.probes += 1
+        start = (key & self.bucket_mask) * self.ways
+        keys = self.keys
+        depths = self.depths
+
+        for index in range(start, start + self.ways):
+            if keys[index] == key and depths[index] != _EMPTY_DEPTH:
+                self.hits += 1
+                # Mục còn được dùng thì coi như thuộc lượt tìm kiếm hiện tại
+                self.generations[index] = self.generation
+                return (depths[index], self.flags[index], self.scores[index],
+                        _decode_move(self.moves[index]))
+
+        return None
+
+    def store(self, key, depth, flag, score, move=None):
+        """Lưu kết quả tìm kiếm của một thế cờ.
+
+        Args:
+            key: Khóa Zobrist 64-bit của thế cờ
+            depth: Độ sâu còn lại đã tìm
+            flag: Loại cận (EXACT, LOWER hoặc UPPER)
+            score: Điểm tìm được
+            move: Nước đi tốt nhất (row, col) hoặc None
+        """
+        start = (key & self.bucket_mask) * self.ways
+        keys = self.keys
+        depths = self.depths
+        generations = self.generations
+        generation = self.generation
+
+        victim = start
+        victim_rank = None
+        for index in range(start, start + self.ways):
+            entry_depth = depths[index]
+            if entry_depth == _EMPTY_DEPTH:
+                victim = index
+                break
+
+            if keys[index] == key:
+                # Cùng thế cờ: không để kết quả nông hơn đè lên kết quả sâu
+                # của cùng lượt tìm kiếm, nhưng vẫn giữ lại nước đi tốt nhất
+                if (entry_depth > depth and generations[index] == generation
+                        and flag != EXACT):
+                    if move is not None:
+                        self.moves[index] = _encode_move(move)
+                    return
+                victim = index
+                break
+
+            # Ưu tiên thay mục thế hệ cũ, sau đó đến mục nông nhất
+            rank = (generations[index] == generation, entry_depth)
+            if victim_rank is None or rank < victim_rank:
+                victim = index
+                victim_rank = rank
+        else:
+            self.overwrites += 1
+
+        self.stores += 1
+        keys[victim] = key
+        depths[victim] = depth
+        self.flags[victim] = flag
+        self.scores[victim] = score
+        self.moves[victim] = _encode_move(move)
+        generations[victim] = generation
+
+    def stats(self):
+        """Thống kê sử dụng bảng.
+
+        Returns:
+            dict: Số lần tra, trúng, tỉ lệ trúng, số lần lưu và ghi đè mục khác
+        """
+        return {
+            'probes': self.probes,
+            'hits': self.hits,
+            'hit_rate': self.hits / self.probes if self.probes else 0.0,
+            'stores': self.stores,
+            'overwrites': self.overwrites,
+            'capacity': self.capacity
+        }
+
+
+# Bố cục 64 bit dữ liệu của một mục trong bảng dùng chung:
+# điểm float32 (32) | độ sâu + 1 (6) | loại cận (2) | thế hệ (4) | nước đi (20)
+_SCORE_BITS = 32
+_DEPTH_SHIFT = 32
+_FLAG_SHIFT = 38
+_GENERATION_SHIFT = 40
+_MOVE_SHIFT = 44
+_MAX_SHARED_DEPTH = 62
+_SHARED_GENERATIONS = 16
+_COORD_BITS = 10  # Hàng/cột của nước đi lưu được phải nhỏ hơn 2 ** 10
+_SHARED_NO_MOVE = 0
+_FLOAT32 = struct.Struct('<f')
+_UINT32 = struct.Struct('<I')
+
+
+def _pack_entry(depth, flag, score, move, generation):
+    """Đóng gói một mục thành số nguyên 64 bit."""
+    score_bits = _UINT32.unpack(_FLOAT32.pack(score))[0]
+    move_code = _SHARED_NO_MOVE
+    if move is not None and max(move) < (1 << _COORD_BITS):
+        move_code = ((move[0] << _COORD_BITS) | move[1]) + 1
+    return (score_bits
+            | (min(depth, _MAX_SHARED_DEPTH) + 1) << _DEPTH_SHIFT
+            | flag << _FLAG_SHIFT
+            | generation << _GENERATION_SHIFT
+            | move_code << _MOVE_SHIFT)
+
+
+def _unpack_entry(data):
+    """Giải nén số nguyên 64 bit thành (độ sâu, loại cận, điểm, nước đi, thế hệ)."""
+    score = _FLOAT32.unpack(_UINT32.pack(data & 0xFFFFFFFF))[0]
+    depth = ((data >> _DEPTH_SHIFT) & 0x3F) - 1
+    flag = (data >> _FLAG_SHIFT) & 0x3
+    generation = (data >> _GENERATION_SHIFT) & 0xF
+    move_code = data >> _MOVE_SHIFT
+    move = None
+    if move_code != _SHARED_NO_MOVE:
+        move_code -= 1
+        move = (move_code >> _COORD_BITS, move_code & ((1 << _COORD_BITS) - 1))
+    return depth, flag, score, move, generation
+
+
+class SharedTranspositionTable:
+    """Bảng chuyển vị đặt trong multiprocessing.shared_memory, dùng chung giữa các tiến trình.
+
+    Mỗi mục gồm 2 từ 64 bit: (khóa XOR dữ liệu, dữ liệu). Không dùng khóa
+    (lock): khi hai tiến trình ghi chồng lên nhau, cặp từ bị lệch sẽ không
+    qua được phép kiểm tra XOR và được coi như không có mục. Mỗi nhóm có 2
+    ô: ô ưu tiên độ sâu và ô luôn được ghi đè. Điểm được lưu dạng float32.
+    """
+
+    def __init__(self, capacity_bits=16, name=None):
+        """Tạo bảng mới hoặc gắn vào bảng đã có.
+
+        Args:
+            capacity_bits: Số bit của dung lượng bảng (số mục = 2 ** capacity_bits)
+            name: Tên vùng nhớ dùng chung đã có, None để tạo mới
+        """
+        self.capacity = 1 << capacity_bits
+        self.capacity_bits = capacity_bits
+        self.bucket_mask = self.capacity // 2 - 1
+        if name is None:
+            self.memory = shared_memory.SharedMemory(create=True, size=self.capacity * 16)
+            self.owner = True
+        else:
+            self.memory = shared_memory.SharedMemory(name=name)
+            self.owner = False
+        self.name = self.memory.name
+        self.words = self.memory.buf.cast('Q')
+        if self.owner:
+            self.clear()
+
+        self.perspective = None
+        self.generation = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.overwrites = 0
+
+    def new_search(self, perspective=None):
+        """Bắt đầu một lượt tìm kiếm mới, như TranspositionTable.new_search."""
+        if perspective != self.perspective:
+            self.clear()
+            self.perspective = perspective
+        self.generation = (self.generation + 1) % _SHARED_GENERATIONS
+
+    def follow(self, perspective, generation):
+        """Theo lượt tìm kiếm của tiến trình tạo bảng mà không xóa bảng.
+
+        Args:
+            perspective: Người chơi mà điểm được tính theo
+            generation: Thế hệ hiện tại của tiến trình tạo bảng
+        """
+        self.perspective = perspective
+        self.generation = generation
+
+    def clear(self):
+        """Xóa toàn bộ các mục (mọi tiến trình cùng thấy) và thống kê."""
+        self.memory.buf[:] = bytes(self.capacity * 16)
+        self.generation = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.overwrites = 0
+
+    def probe(self, key):
+        """Tìm mục của một thế cờ.
+
+        Returns:
+            tuple hoặc None: (độ sâu, loại cận, điểm, nước đi tốt nhất) nếu có
+        """
+        self.probes += 1
+        words = self.words
+        start = (key & self.bucket_mask) * 4
+        for index in (start, start + 2):
+            data = words[index + 1]
+            if data and words[index] ^ data == key:
+                self.hits += 1
+                return _unpack_entry(data)[:4]
+        return None
+
+    def store(self, key, depth, flag, score, move=None):
+        """Lưu kết quả tìm kiếm của một thế cờ (xem TranspositionTable.store)."""
+        words = self.words
+        start = (key & self.bucket_mask) * 4
+
+        # Ô đầu giữ mục sâu nhất của lượt hiện tại, ô sau luôn bị ghi đè
+        index = start + 2
+        data = words[start + 1]
+        if not data:
+            index = start
+        else:
+            entry_depth, _, _, entry_move, entry_generation = _unpack_entry(data)
+            if words[start] ^ data == key:
+                if (entry_depth > depth and entry_generation == self.generation
+                        and flag != EXACT):
+                    return
+                index = start
+                if move is None:
+                    move = entry_move
+            elif entry_generation != self.generation or depth >= entry_depth:
+                index = start
+                self.overwrites += 1
+
+        self.stores += 1
+        data = _pack_entry(depth, flag, score, move, self.generation)
+        words[index] = key ^ data
+        words[index + 1] = data
+
+    def stats(self):
+        """Thống kê sử dụng bảng của tiến trình hiện tại."""
+        return {
+            'probes': self.probes,
+            'hits': self.hits,
+            'hit_rate': self.hits / self.probes if self.probes else 0.0,
+            'stores': self.stores,
+            'overwrites': self.overwrites,
+            'capacity': self.capacity
+        }
+
+    def close(self):
+        """Đóng vùng nhớ dùng chung; tiến trình tạo bảng giải phóng nó."""
+        self.words.release()
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+
+def bound_flag(score, alpha, beta):
+    """Loại cận của điểm trả về từ tìm kiếm với cửa sổ (alpha, beta) ban đầu."""
+    if score <= alpha:
+        return UPPER
+    if score >= beta:
+        return LOWER
+    return EXACT
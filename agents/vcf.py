@@ -0,0 +1,246 @@
+"""Tìm thắng bằng chuỗi bốn liên tiếp (VCF - Victory by Continuous Fours).
+
+Bên tấn công chỉ đi các nước tạo bốn (còn đúng một ô để thành 5); bên phòng
+thủ buộc phải chặn đúng ô đó, trừ khi đã có sẵn một ô thắng của riêng mình.
+Vì mỗi nút chỉ có vài nước, cây tìm kiếm rất hẹp và có thể tìm ra các chuỗi
+thắng dài hơn nhiều so với độ sâu của Alpha-Beta.
+"""
+from game.board import DIRECTIONS
+
+# Số ô trong một cửa sổ thắng
+_FIVE = 5
+
+
+def _window_empties(board, player, own_count):
+    """Các cửa sổ 5 ô có đúng own_count quân của player và phần còn lại trống.
+
+    Quân của player được gom theo từng đường thẳng; mỗi đoạn quanh các quân
+    (mở rộng 4 ô mỗi bên) chỉ được đọc một lần rồi trượt cửa sổ trên đó.
+
+    Args:
+        board: Bàn cờ
+        player: Người chơi ('X' hoặc 'O')
+        own_count: Số quân của player trong cửa sổ
+
+    Returns:
+        list: Mỗi phần tử là tuple các ô trống (row, col) của một cửa sổ
+    """
+    grid = board.board
+    size = board.size
+
+    # (hướng, ô tại t = 0) -> vị trí t của các quân trên đường đó
+    lines = {}
+    for row, col, stone in board.move_history:
+        if stone != player:
+            continue
+        for row_dir, col_dir in DIRECTIONS:
+            t = row if row_dir else col
+            key = (row_dir, col_dir, row - t * row_dir, col - t * col_dir)
+            lines.setdefault(key, []).append(t)
+
+    windows = []
+    for (row_dir, col_dir, base_row, base_col), positions in lines.items():
+        if own_count > len(positions):
+            continue
+        positions.sort()
+
+        # Gộp các đoạn [t - 4, t + 4] chồng nhau
+        spans = []
+        for t in positions:
+            if spans and t - (_FIVE - 1) <= spans[-1][1] + 1:
+                spans[-1][1] = t + _FIVE - 1
+            else:
+                spans.append([t - (_FIVE - 1), t + _FIVE - 1])
+
+        for low, high in spans:
+            cells = []
+            codes = []  # 0 trống, 1 quân mình, 2 bị chặn
+            for t in range(low, high + 1):
+                r = base_row + t * row_dir
+                c = base_col + t * col_dir
+                if 0 <= r < size and 0 <= c < size:
+                    cell = grid[r][c]
+                    codes.append(1 if cell == player else (0 if cell == ' ' else 2))
+                else:
+                    codes.append(2)
+                cells.append((r, c))
+
+            own = blocked = 0
+            for index, code in enumerate(codes):
+                if code == 1:
+                    own += 1
+                elif code == 2:
+                    blocked += 1
+                if index >= _FIVE:
+                    old = codes[index - _FIVE]
+                    if old == 1:
+                        own -= 1
+                    elif old == 2:
+                        blocked -= 1
+                if index >= _FIVE - 1 and own == own_count and not blocked:
+                    first = index - _FIVE + 1
+                    windows.append(tuple(cells[first + step] for step in range(_FIVE)
+                                         if not codes[first + step]))
+
+    return windows
+
+
+def five_cells(board, player):
+    """Các ô trống mà player đặt vào sẽ thành 5 quân liên tiếp.
+
+    Args:
+        board: Bàn cờ
+        player: Người chơi ('X' hoặc 'O')
+
+    Returns:
+        set: Tập các ô (row, col)
+    """
+    return {empties[0] for empties in _window_empties(board, player, _FIVE - 1)}
+
+
+def four_moves(board, player):
+    """Các nước tạo bốn của player cùng các ô thắng mà nước đó tạo ra.
+
+    Args:
+        board: Bàn cờ
+        player: Người chơi ('X' hoặc 'O')
+
+    Returns:
+        dict: Nước đi (row, col) -> tập các ô thắng sau khi đi nước đó
+    """
+    moves = {}
+    for first, second in _window_empties(board, player, _FIVE - 2):
+        moves.setdefault(first, set()).add(second)
+        moves.setdefault(second, set()).add(first)
+    return moves
+
+
+def _new_five_cells(board, row, col, player):
+    """Các ô thắng của player do quân đặt tại (row, col) tạo ra (tính trước khi đặt)."""
+    cells = set()
+    for (row_dir, col_dir), pattern in zip(DIRECTIONS, board.get_threat_patterns(row, col, player)):
+        for offset in pattern.five_offsets:
+            cells.add((row + offset * row_dir, col + offset * col_dir))
+    return cells
+
+
+class _BudgetExhausted(Exception):
+    """Đã dùng hết số nút cho phép."""
+
+
+class VCFSolver:
+    """Bộ giải VCF có bộ đệm các thế cờ đã giải, dùng lại được giữa các lần gọi."""
+
+    def __init__(self, cache_size=50000, max_depth=40):
+        """Khởi tạo bộ giải.
+
+        Args:
+            cache_size: Số thế cờ tối đa trong bộ đệm (đầy thì xóa toàn bộ)
+            max_depth: Số nước tấn công tối đa trong một chuỗi
+        """
+        self.cache_size = cache_size
+        self.max_depth = max_depth
+        self.cache = {}  # (khóa Zobrist, bên tấn công) -> chuỗi thắng hoặc None
+        self.nodes = 0
+        self.budget = 0
+        self.stop_event = None
+
+    def solve(self, board, player, node_budget=2000, stop_event=None):
+        """Tìm chuỗi VCF cho player, người đang đến lượt đi.
+
+        Args:
+            board: Bàn cờ
+            player: Bên tấn công ('X' hoặc 'O')
+            node_budget: Số nút tối đa được duyệt
+            stop_event: threading.Event (hoặc multiprocessing.Event), dừng tìm
+                như khi hết ngân sách nếu được đặt; None nếu không dùng
+
+        Returns:
+            list hoặc None: Chuỗi nước đi xen kẽ công/thủ kết thúc bằng nước
+            thành 5, hoặc None nếu không có VCF (hoặc chưa tìm ra trong ngân sách)
+        """
+        opponent = 'O' if player == 'X' else 'X'
+
+        # Thắng ngay
+        wins = five_cells(board, player)
+        if wins:
+            return [min(wins)]
+
+        self.nodes = 0
+        self.budget = node_budget
+        self.stop_event = stop_event
+        try:
+            line = self._attack(board, player, opponent, five_cells(board, opponent), 0)
+        except _BudgetExhausted:
+            return None
+        return list(line) if line else None
+
+    def _attack(self, board, player, opponent, defender_fives, depth):
+        """Tìm VCF tại nút bên tấn công đến lượt.
+
+        Args:
+            defender_fives: Các ô thắng hiện có của bên phòng thủ
+
+        Returns:
+            tuple hoặc None: Chuỗi thắng, None nếu không có
+        """
+        key = (board.zobrist, player)
+        if key in self.cache:
+            return self.cache[key]
+
+        self.nodes += 1
+        if self.nodes > self.budget or (self.stop_event is not None and self.stop_event.is_set()):
+            raise _BudgetExhausted()
+
+        # Bên phòng thủ có từ 2 ô thắng: không chặn kịp bằng một nước bốn
+        if len(defender_fives) >= 2 or depth >= self.max_depth:
+            return self._remember(key, None)
+
+        candidates = four_moves(board, player)
+        if defender_fives:
+            # Bắt buộc chặn ô thắng của đối thủ, và nước chặn phải là nước bốn
+            (forced,) = defender_fives
+            candidates = {forced: candidates[forced]} if forced in candidates else {}
+
+        # Thử trước các nước tạo nhiều ô thắng (bốn mở, bốn kép)
+        for move in sorted(candidates, key=lambda move: len(candidates[move]), reverse=True):
+            fives = candidates[move]
+            if len(fives) >= 2:
+                defence = min(fives)
+                fives = sorted(fives - {defence})
+                return self._remember(key, (move, defence, fives[0]))
+
+            # Đối thủ buộc chặn ô thắng duy nhất; ô chặn không thể là ô thắng
+            # của đối thủ vì mọi ô thắng cũ của đối thủ đã bị nước này chiếm
+            (defence,) = fives
+            row, col = move
+            with board.try_move(row, col, player):
+                new_defender_fives = _new_five_cells(board, defence[0], defence[1], opponent)
+                with board.try_move(defence[0], defence[1], opponent):
+                    line = self._attack(board, player, opponent, new_defender_fives, depth + 1)
+            if line:
+                return self._remember(key, (move, defence) + line)
+
+        return self._remember(key, None)
+
+    def _remember(self, key, line):
+        """Lưu kết quả vào bộ đệm (xóa bộ đệm khi đầy)."""
+        if len(self.cache) >= self.cache_size:
+            self.cache.clear()
+        self.cache[key] = line
+        return line
+
+
+def find_vcf(board, player, node_budget=2000):
+    """Tìm chuỗi thắng bằng các nước bốn liên tiếp cho player.
+
+    Args:
+        board: Bàn cờ, player đang đến lượt đi
+        player: Bên tấn công ('X' hoặc 'O')
+        node_budget: Số nút tối đa được duyệt
+
+    Returns:
+        list hoặc None: Chuỗi nước đi (công, thủ, công, ...) kết thúc bằng nước
+        thành 5, hoặc None
+    """
+    return VCFSolver().solve(board, player, node_budget)
@@ -0,0 +1,263 @@
+"""Tìm kiếm không gian đe dọa (VCT - Victory by Continuous Threats).
+
+Mở rộng VCF: ngoài các nước bốn, bên tấn công còn được đi các nước tạo ba
+mở (thêm một quân là thành bốn mở). Bên phòng thủ chỉ được xét các nước có
+thể hóa giải: chặn ô thắng, các ô tạo bốn mở của bên tấn công cùng các ô
+phòng thủ (defence_offsets) của mọi mẫu ba đang sống trên bàn, và các nước
+phản công bằng bốn của chính mình. Cây AND/OR này hẹp hơn nhiều so với cây
+đầy đủ nên có thể chứng minh thắng ở độ sâu mà Alpha-Beta không với tới.
+"""
+from game.board import DIRECTIONS
+from game.patterns import THREAT_OPEN_THREE, THREAT_FOUR, THREAT_OPEN_FOUR
+from agents.vcf import five_cells, four_moves, _window_empties
+
+
+def _defence_cells(board, row, col, player, threats=(THREAT_OPEN_THREE,)):
+    """Các ô phòng thủ của những mẫu đe dọa do quân đặt tại (row, col) tạo ra.
+
+    Tính trước khi đặt quân, ô (row, col) được coi như đã có quân của player.
+    Chặn trước vào một ô phòng thủ thì nước (row, col) không còn tạo được mẫu đó.
+
+    Args:
+        board: Bàn cờ
+        row, col: Ô đặt quân
+        player: Người chơi ('X' hoặc 'O')
+        threats: Các mức đe dọa THREAT_* được xét
+
+    Returns:
+        set: Tập các ô (row, col); rỗng nếu nước đi không tạo mẫu đủ mạnh
+    """
+    cells = set()
+    for (row_dir, col_dir), pattern in zip(DIRECTIONS, board.get_threat_patterns(row, col, player)):
+        if pattern.threat in threats:
+            for offset in pattern.defence_offsets:
+                cells.add((row + offset * row_dir, col + offset * col_dir))
+    return cells
+
+
+def three_moves(board, player):
+    """Các nước tạo ba mở (chưa thành bốn) của player, mạnh nhất trước.
+
+    Args:
+        board: Bàn cờ
+        player: Người chơi ('X' hoặc 'O')
+
+    Returns:
+        list: Các nước đi (row, col)
+    """
+    candidates = set()
+    for empties in _window_empties(board, player, 2):
+        candidates.update(empties)
+
+    scored = []
+    for row, col in candidates:
+        threats = [pattern.threat for pattern in board.get_threat_patterns(row, col, player)]
+        if THREAT_OPEN_THREE in threats and max(threats) < THREAT_FOUR:
+            # Nhiều hướng ba mở (ba-ba) và tổng điểm đe dọa cao được thử trước
+            scored.append((threats.count(THREAT_OPEN_THREE),
+                           board._check_threat_patterns(row, col, player), (row, col)))
+    scored.sort(reverse=True)
+    return [move for _, _, move in scored]
+
+
+def _threat_replies(board, attacker, pending=()):
+    """Các nước hóa giải của bên phòng thủ khi bên tấn công còn nước tạo bốn mở.
+
+    Gồm mọi ô làm mất một nước bốn mở (kể cả bốn kép) của bên tấn công, dù
+    mối ba đó được tạo từ nước nào, các ô còn treo và các nước phản công
+    bằng bốn. Đi ngoài tập này thì bên tấn công vẫn còn nước tạo bốn mở.
+
+    Args:
+        board: Bàn cờ, bên phòng thủ đến lượt đi
+        attacker: Bên tấn công ('X' hoặc 'O')
+        pending: Các ô phòng thủ của mẫu ba mở vừa được tạo
+
+    Returns:
+        list: Các nước đi (row, col) đã sắp xếp; rỗng nếu bên tấn công không
+        còn nước tạo bốn mở nào
+    """
+    defender = 'O' if attacker == 'X' else 'X'
+    open_fours = [move for move, fives in four_moves(board, attacker).items()
+                  if len(fives) >= 2]
+    if not open_fours:
+        return []
+
+    responses = set(pending) | set(four_moves(board, defender))
+    for move in open_fours:
+        responses.add(move)
+        responses |= _defence_cells(board, move[0], move[1], attacker,
+                                    (THREAT_FOUR, THREAT_OPEN_FOUR))
+    return sorted(move for move in responses if board.is_valid_move(*move))
+
+
+class _BudgetExhausted(Exception):
+    """Đã dùng hết số nút cho phép."""
+
+
+class VCTSolver:
+    """Bộ giải VCT có bộ đệm kết quả các nút tấn công."""
+
+    def __init__(self, cache_size=50000, max_depth=8):
+        """Khởi tạo bộ giải.
+
+        Args:
+            cache_size: Số thế cờ tối đa trong bộ đệm (đầy thì xóa toàn bộ)
+            max_depth: Số nước tấn công tối đa trong một chuỗi
+        """
+        self.cache_size = cache_size
+        self.max_depth = max_depth
+        # (khóa Zobrist, bên tấn công, ô phòng thủ còn treo) -> (chuỗi thắng hoặc
+        # None, số nước còn lại đã tìm)
+        self.cache = {}
+        self.nodes = 0
+        self.budget = 0
+        self.stop_event = None
+        self.attacker = None
+        self.defender = None
+
+    def solve(self, board, player, budget=5000, stop_event=None):
+        """Tìm chuỗi VCT cho player, người đang đến lượt đi.
+
+        Args:
+            board: Bàn cờ
+            player: Bên tấn công ('X' hoặc 'O')
+            budget: Số nút tối đa được duyệt
+            stop_event: threading.Event (hoặc multiprocessing.Event), dừng tìm
+                như khi hết ngân sách nếu được đặt; None nếu không dùng
+
+        Returns:
+            list hoặc None: Biến chính (công, thủ, công, ...) kết thúc bằng
+            nước thành 5, hoặc None nếu không chứng minh được thắng
+        """
+        self.attacker = player
+        self.defender = 'O' if player == 'X' else 'X'
+        self.nodes = 0
+        self.budget = budget
+        self.stop_event = stop_event
+
+        # Tăng dần số nước tấn công để chuỗi ngắn được tìm thấy trước
+        try:
+            for max_depth in range(1, self.max_depth + 1):
+                line = self._attack(board, max_depth, frozenset())
+                if line:
+                    return list(line)
+        except _BudgetExhausted:
+            pass
+        return None
+
+    def _count_node(self):
+        """Đếm một nút, dừng tìm kiếm khi hết ngân sách hoặc được yêu cầu dừng."""
+        self.nodes += 1
+        if self.nodes > self.budget or (self.stop_event is not None and self.stop_event.is_set()):
+            raise _BudgetExhausted()
+
+    def _attack(self, board, depth, pending):
+        """Nút OR: bên tấn công đến lượt, chỉ cần một nước dẫn tới thắng.
+
+        Args:
+            board: Bàn cờ
+            depth: Số nước tấn công còn được đi
+            pending: frozenset các ô phòng thủ của mối đe dọa ba mở còn treo
+
+        Returns:
+            tuple hoặc None: Biến chính nếu thắng
+        """
+        attacker, defender = self.attacker, self.defender
+
+        wins = five_cells(board, attacker)
+        if wins:
+            return (min(wins),)
+
+        # Kết quả thắng luôn đúng; không thắng chỉ đúng với số nước không lớn hơn.
+        # Các ô còn treo quyết định nước hóa giải của bên phòng thủ nên thuộc khóa
+        key = (board.zobrist, attacker, pending)
+        entry = self.cache.get(key)
+        if entry is not None and (entry[0] or entry[1] >= depth):
+            return entry[0]
+        self._count_node()
+
+        defender_fives = five_cells(board, defender)
+        if len(defender_fives) >= 2 or depth == 0:
+            return self._remember(key, None, depth)
+
+        if defender_fives:
+            # Phải chặn ô thắng của đối thủ; mối đe dọa cũ vẫn còn treo
+            (move,) = defender_fives
+            defences = pending | _defence_cells(board, move[0], move[1], attacker)
+            with board.try_move(move[0], move[1], attacker):
+                line = self._defend(board, depth - 1, defences)
+            return (move,) + line if line else None
+
+        fours = four_moves(board, attacker)
+        moves = sorted(fours, key=lambda move: len(fours[move]), reverse=True)
+        moves += three_moves(board, attacker)
+
+        for move in moves:
+            defences = _defence_cells(board, move[0], move[1], attacker)
+            with board.try_move(move[0], move[1], attacker):
+                line = self._defend(board, depth - 1, defences)
+            if line:
+                return self._remember(key, (move,) + line, depth)
+
+        return self._remember(key, None, depth)
+
+    def _defend(self, board, depth, pending):
+        """Nút AND: bên phòng thủ đến lượt, mọi nước hóa giải đều phải thua.
+
+        Args:
+            board: Bàn cờ
+            depth: Số nước tấn công còn được đi
+            pending: Các ô phòng thủ của mẫu ba mở vừa được tạo
+
+        Returns:
+            tuple hoặc None: Biến chính dài nhất (phòng thủ tốt nhất) nếu thắng
+        """
+        attacker, defender = self.attacker, self.defender
+        self._count_node()
+
+        if five_cells(board, defender):
+            return None
+
+        attacker_fives = sorted(five_cells(board, attacker))
+        if len(attacker_fives) >= 2:
+            return tuple(attacker_fives[:2])
+
+        if attacker_fives:
+            responses = attacker_fives
+        else:
+            responses = _threat_replies(board, attacker, pending)
+            if not responses:
+                return None
+
+        best_line = None
+        for move in responses:
+            with board.try_move(move[0], move[1], defender):
+                line = self._attack(board, depth, frozenset(pending))
+            if not line:
+                return None
+            if best_line is None or len(line) + 1 > len(best_line):
+                best_line = (move,) + line
+
+        return best_line
+
+    def _remember(self, key, line, depth):
+        """Lưu kết quả cùng số nước còn lại vào bộ đệm (xóa bộ đệm khi đầy)."""
+        if len(self.cache) >= self.cache_size:
+            self.cache.clear()
+        self.cache[key] = (line, depth)
+        return line
+
+
+def find_vct(board, player, budget=5000):
+    """Tìm chuỗi thắng bằng các nước đe dọa liên tiếp (bốn và ba mở) cho player.
+
+    Args:
+        board: Bàn cờ, player đang đến lượt đi
+        player: Bên tấn công ('X' hoặc 'O')
+        budget: Số nút tối đa được duyệt
+
+    Returns:
+        list hoặc None: Biến chính (công, thủ, công, ...) kết thúc bằng nước
+        thành 5, hoặc None
+    """
+    return VCTSolver().solve(board, player, budget)
@@ -1,3 +1,5 @@
 # __init__.py cho package game
 from game.board import Board
+from game.bitboard import BitBoard
+from game.sparse_board import SparseBoard
 from game.player import Player, HumanPlayer, Game
\ No newline at end of file
@@ -0,0 +1,168 @@
+from game.board import Board
+
+class BitBoard(Board):
+    """Bàn cờ Caro lưu thêm một bitmask số nguyên cho mỗi người chơi.
+
+    Ô (row, col) ứng với bit row * stride + col, với stride = size + 1.
+    Cột đệm cuối mỗi hàng luôn bằng 0 nên các phép dịch bit không tràn
+    sang hàng kế tiếp. Lưới self.board vẫn được giữ đồng bộ để các agent
+    truy cập board.board[row][col] như trước. Nước đi ứng viên lấy từ biên
+    nước đi (frontier) mà Board duy trì, không tính lại từ bitmask.
+    """
+
+    # Bộ đệm mặt nạ dùng chung theo kích thước bàn cờ
+    _mask_cache = {}
+
+    def __init__(self, size=15, move_radius=3):
+        """Khởi tạo bàn cờ bitboard với kích thước cho trước.
+
+        Args:
+            size: Kích thước bàn cờ (size x size)
+            move_radius: Bán kính quanh các quân đã đặt để sinh nước đi ứng viên
+        """
+        super().__init__(size, move_radius)
+        self.stride = size + 1
+        self.masks = {'X': 0, 'O': 0}
+
+        # Các bước dịch cho 4 hướng: ngang, dọc, chéo chính, chéo phụ
+        self.shifts = (1, self.stride, self.stride + 1, self.stride - 1)
+
+        if size not in BitBoard._mask_cache:
+            BitBoard._mask_cache[size] = self._build_full_mask()
+        self.full_mask = BitBoard._mask_cache[size]
+
+    def _build_full_mask(self):
+        """Tạo mặt nạ gồm mọi ô hợp lệ của bàn cờ.
+
+        Returns:
+            int: Bitmask các ô hợp lệ (không gồm cột đệm)
+        """
+        full_mask = 0
+        for row in range(self.size):
+            for col in range(self.size):
+                full_mask |= self._bit(row, col)
+
+        return full_mask
+
+    def _bit(self, row, col):
+        """Lấy bit ứng với ô (row, col)."""
+        return 1 << (row * self.stride + col)
+
+    def occupied_mask(self):
+        """Mặt nạ các ô đã có quân."""
+        return self.masks['X'] | self.masks['O']
+
+    def is_valid_move(self, row, col):
+        """Kiểm tra nước đi có hợp lệ không bằng phép AND trên bitmask.
+
+        Args:
+            row: Chỉ số hàng
+            col: Chỉ số cột
+
+        Returns:
+            bool: True nếu nước đi hợp lệ, False nếu không
+        """
+        if not (0 <= row < self.size and 0 <= col < self.size):
+            return False
+
+        return not self.occupied_mask() & self._bit(row, col)
+
+    def make_move(self, row, col, player):
+        """Thực hiện nước đi và cập nhật bitmask của người chơi.
+
+        Args:
+            row: Chỉ số hàng
+            col: Chỉ số cột
+            player: Người chơi ('X' hoặc 'O')
+
+        Returns:
+            bool: True nếu nước đi thành công, False nếu không
+        """
+        if not super().make_move(row, col, player):
+            return False
+
+        self.masks[player] |= self._bit(row, col)
+        return True
+
+    def undo_move(self):
+        """Hoàn tác nước đi cuối cùng và xóa bit tương ứng.
+
+        Returns:
+            tuple hoặc None: Nước đi (row, col, player) vừa hoàn tác
+        """
+        move = super().undo_move()
+        if move is not None:
+            row, col, player = move
+            self.masks[player] &= ~self._bit(row, col)
+        return move
+
+    def check_winner(self):
+        """Kiểm tra người thắng bằng các phép dịch bit quanh nước đi cuối.
+
+        Returns:
+            str: 'X' hoặc 'O' nếu có người thắng, None nếu chưa có người thắng
+        """
+        if self.last_move is None:
+            return None
+
+        row, col = self.last_move
+        player = self.board[row][col]
+
+        if self._has_five_through(self.masks[player], row, col):
+            return player
+
+        return None
+
+    def _check_win_at(self, row, col, player):
+        """Kiểm tra nếu đặt quân tại vị trí này sẽ tạo thành 5 liên tiếp.
+
+        Không phụ thuộc vào việc ô (row, col) đã được ghi tạm lên lưới hay chưa.
+
+        Args:
+            row: Chỉ số hàng
+            col: Chỉ số cột
+            player: Người chơi ('X' hoặc 'O')
+
+        Returns:
+            bool: True nếu sẽ thắng, False nếu không
+        """
+        mask = self.masks[player] | self._bit(row, col)
+        return self._has_five_through(mask, row, col)
+
+    def _has_five_through(self, mask, row, col):
+        """Kiểm tra mặt nạ có dãy 5 quân đi qua ô (row, col) không.
+
+        Args:
+            mask: Bitmask quân của một người chơi
+            row, col: Ô cần đi qua
+
+        Returns:
+            bool: True nếu có ít nhất 5 quân liên tiếp qua ô này
+        """
+        bit = self._bit(row, col)
+
+        for shift in self.shifts:
+            # Bit s của fives bật khi s, s+d, ..., s+4d đều có quân
+            pairs = mask & (mask >> shift)
+            quads = pairs & (pairs >> (2 * shift))
+            fives = quads & (mask >> (4 * shift))
+            if not fives:
+                continue
+
+            # Các điểm bắt đầu của dãy 5 có chứa ô (row, col)
+            starts = (bit | (bit >> shift) | (bit >> (2 * shift)) |
+                      (bit >> (3 * shift)) | (bit >> (4 * shift)))
+            if fives & starts:
+                return True
+
+        return False
+
+    def copy(self):
+        """Tạo một bản sao của bàn cờ, bao gồm cả bitmask.
+
+        Returns:
+            BitBoard: Bản sao của bàn cờ
+        """
+        new_board = super().copy()
+        new_board.masks = dict(self.masks)
+        return new_board
@@ -1,18 +1,238 @@
+import random
+from array import array
+from contextlib import contextmanager
+from game.patterns import SEGMENT_OFFSETS, SEGMENT_PATTERNS, score_line_windows
+
+# 4 hướng: ngang, dọc, chéo chính, chéo phụ
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+# Bước dịch (hàng, cột) và trọng số chữ số của từng ô trong đoạn 9 ô, theo hướng
+_SEGMENT_STEPS = {
+    (row_dir, col_dir): tuple((offset * row_dir, offset * col_dir, 3 ** index)
+                              for index, offset in enumerate(SEGMENT_OFFSETS))
+    for row_dir, col_dir in DIRECTIONS
+}
+
+# Bảng số ngẫu nhiên Zobrist dùng chung theo kích thước bàn cờ
+_ZOBRIST_TABLES = {}
+_ZOBRIST_SEED = 0x5A0B1457
+
+def _get_zobrist_table(size):
+    """Lấy (hoặc tạo) bảng Zobrist 64-bit cho bàn cờ kích thước size.
+    
+    Bảng được sinh từ seed cố định nên khóa của cùng một thế cờ giống nhau
+    giữa các tiến trình và các lần chạy.
+    
+    Args:
+        size: Kích thước bàn cờ
+        
+    Returns:
+        list: Bảng table[row][col][player] các số ngẫu nhiên 64-bit
+    """
+    if size not in _ZOBRIST_TABLES:
+        rng = random.Random(_ZOBRIST_SEED + size)
+        _ZOBRIST_TABLES[size] = [
+            [{'X': rng.getrandbits(64), 'O': rng.getrandbits(64)} for _ in range(size)]
+            for _ in range(size)
+        ]
+    return _ZOBRIST_TABLES[size]
+
+# Phép biến đổi ngược của từng phép đối xứng (xem transform_cell)
+INVERSE_TRANSFORMS = (0, 3, 2, 1, 4, 5, 6, 7)
+
+def transform_cell(row, col, size, transform):
+    """Ảnh của ô (row, col) qua một trong 8 phép đối xứng của bàn cờ vuông.
+    
+    Phép biến đổi t gồm lật trái-phải (nếu t & 4) rồi xoay 90 độ (t & 3) lần;
+    0 là phép đồng nhất.
+    
+    Args:
+        row: Chỉ số hàng
+        col: Chỉ số cột
+        size: Kích thước bàn cờ
+        transform: Số hiệu phép biến đổi (0-7)
+        
+    Returns:
+        tuple: Tọa độ (row, col) của ảnh
+    """
+    last = size - 1
+    if transform & 4:
+        col = last - col
+    for _ in range(transform & 3):
+        row, col = col, last - row
+    return row, col
+
+# Bảng khóa Zobrist theo 8 phép đối xứng, dùng chung theo kích thước bàn cờ
+_SYMMETRY_TABLES = {}
+
+def _get_symmetry_table(size):
+    """Lấy (hoặc tạo) bảng khóa đối xứng của bàn cờ kích thước size.
+    
+    Args:
+        size: Kích thước bàn cờ
+        
+    Returns:
+        list: Bảng table[row][col][player] gồm 8 khóa Zobrist của ảnh ô
+        (row, col) qua từng phép đối xứng
+    """
+    if size not in _SYMMETRY_TABLES:
+        zobrist = _get_zobrist_table(size)
+        table = []
+        for row in range(size):
+            table_row = []
+            for col in range(size):
+                images = [transform_cell(row, col, size, t) for t in range(8)]
+                table_row.append({player: tuple(zobrist[r][c][player] for r, c in images)
+                                  for player in ('X', 'O')})
+            table.append(table_row)
+        _SYMMETRY_TABLES[size] = table
+    return _SYMMETRY_TABLES[size]
+
+# Danh sách ô lân cận dùng chung theo (kích thước, bán kính)
+_NEIGHBOURHOODS = {}
+
+def _get_neighbourhoods(size, radius):
+    """Lấy (hoặc tạo) danh sách ô lân cận trong phạm vi radius của mỗi ô.
+    
+    Args:
+        size: Kích thước bàn cờ
+        radius: Bán kính lân cận (hình vuông, gồm cả chính ô đó)
+        
+    Returns:
+        list: Phần tử thứ row * size + col là tuple các cặp (chỉ số, (r, c))
+    """
+    key = (size, radius)
+    if key not in _NEIGHBOURHOODS:
+        neighbourhoods = []
+        for row in range(size):
+            for col in range(size):
+                neighbourhoods.append(tuple(
+                    (r * size + c, (r, c))
+                    for r in range(max(0, row - radius), min(size, row + radius + 1))
+                    for c in range(max(0, col - radius), min(size, col + radius + 1))
+                ))
+        _NEIGHBOURHOODS[key] = neighbourhoods
+    return _NEIGHBOURHOODS[key]
+
+# Vùng ảnh hưởng của mỗi ô lên threat cache, dùng chung theo kích thước bàn cờ
+_THREAT_ZONES = {}
+
+def _get_threat_zones(size):
+    """Lấy (hoặc tạo) danh sách khóa threat cache bị ảnh hưởng bởi mỗi ô.
+    
+    Một ô ảnh hưởng tới các ô trên 4 dòng đi qua nó trong phạm vi 4 ô, là
+    tầm với của đoạn 9 ô trong bảng mẫu.
+    
+    Args:
+        size: Kích thước bàn cờ
+        
+    Returns:
+        list: Phần tử thứ row * size + col là tuple các khóa (r, c, player)
+    """
+    if size not in _THREAT_ZONES:
+        zones = []
+        for row in range(size):
+            for col in range(size):
+                keys = [(row, col, 'X'), (row, col, 'O')]
+                for row_dir, col_dir in DIRECTIONS:
+                    for offset in SEGMENT_OFFSETS:
+                        r, c = row + offset * row_dir, col + offset * col_dir
+                        if 0 <= r < size and 0 <= c < size:
+                            keys.append((r, c, 'X'))
+                            keys.append((r, c, 'O'))
+                zones.append(tuple(keys))
+        _THREAT_ZONES[size] = zones
+    return _THREAT_ZONES[size]
+
+def _center_regions(size):
+    """Các vùng vuông trên đường chéo chính dùng để đánh giá kiểm soát trung tâm.
+    
+    Args:
+        size: Kích thước bàn cờ
+        
+    Returns:
+        list: Các bộ (start, end, weight), vùng gồm các ô start <= row, col < end
+    """
+    center = size // 2
+    regions = [
+        (0, center // 2),    # Vùng góc
+        (center // 2, center * 3 // 4),  # Vùng biên
+        (center * 3 // 4, center * 5 // 4),  # Vùng gần trung tâm
+        (center * 5 // 4, center * 3 // 2),  # Vùng biên
+        (center * 3 // 2, size)  # Vùng góc
+    ]
+    weights = [1, 2, 3, 2, 1]
+    return [(start, min(end, size), weight) for (start, end), weight in zip(regions, weights)]
+
+# Trọng số kiểm soát trung tâm dùng chung theo kích thước bàn cờ
+_CENTER_WEIGHTS = {}
+
+def _get_center_weights(size):
+    """Lấy (hoặc tạo) trọng số kiểm soát trung tâm của từng ô.
+    
+    Cùng cách chia vùng như Board._evaluate_center_control trước đây: các vùng
+    vuông nằm trên đường chéo chính với trọng số 1, 2, 3, 2, 1.
+    
+    Args:
+        size: Kích thước bàn cờ
+        
+    Returns:
+        list: Phần tử thứ row * size + col là trọng số của ô (row, col)
+    """
+    if size not in _CENTER_WEIGHTS:
+        cell_weights = [0] * (size * size)
+        for start, end, weight in _center_regions(size):
+            for row in range(start, end):
+                for col in range(start, end):
+                    cell_weights[row * size + col] += weight
+        _CENTER_WEIGHTS[size] = cell_weights
+    return _CENTER_WEIGHTS[size]
+
 class Board:
     """Quản lý bàn cờ và luật chơi của cờ Caro."""
     
-    def __init__(self, size=15):
+    def __init__(self, size=15, move_radius=3):
         """Khởi tạo bàn cờ với kích thước cho trước.
         
         Args:
             size: Kích thước bàn cờ (size x size)
+            move_radius: Bán kính quanh các quân đã đặt để sinh nước đi ứng viên
         """
         self.size = size
-        self.board = [[' ' for _ in range(size)] for _ in range(size)]
+        self.move_radius = move_radius
         self.last_move = None
         self.moves_count = 0
         self.move_history = []  # Lưu lịch sử các nước đi
         self.threat_cache = {}  # Cache để lưu trữ các mối đe dọa
+        self.threat_cache_hits = 0
+        self.threat_cache_misses = 0
+        self.zobrist = 0  # Khóa Zobrist 64-bit, cập nhật O(1) mỗi nước đi
+        # Khóa Zobrist của 8 ảnh đối xứng, chỉ được duy trì sau lần đầu gọi canonical_key
+        self.symmetry_keys = None
+        
+        # Biên nước đi: tập các ô trống có quân trong phạm vi move_radius
+        # (dict dùng như tập hợp)
+        self.frontier = {}
+        
+        # Đánh giá tăng dần: điểm từng dòng được lưu theo hàm chấm điểm và chỉ
+        # các dòng đi qua nước vừa đi/hoàn tác mới bị đánh dấu cần tính lại
+        self.line_caches = {}
+        self.center_balance = 0  # Tổng trọng số trung tâm của X trừ của O
+        
+        self._init_storage()
+        
+    def _init_storage(self):
+        """Tạo lưới ô và các bảng tra cứu phụ thuộc kích thước bàn cờ.
+        
+        Lớp con có cách lưu trữ khác (ví dụ bàn cờ thưa) ghi đè hàm này.
+        """
+        size = self.size
+        self.board = [[' ' for _ in range(size)] for _ in range(size)]
+        self.threat_zones = _get_threat_zones(size)
+        self.zobrist_table = _get_zobrist_table(size)
+        self.neighbourhoods = _get_neighbourhoods(size, self.move_radius)
+        self.neighbour_counts = [0] * (size * size)  # Số quân trong phạm vi move_radius của mỗi ô
+        self.center_weights = _get_center_weights(size)
         
     def is_valid_move(self, row, col):
         """Kiểm tra nước đi có hợp lệ không.
@@ -49,12 +269,278 @@ class Board:
         self.last_move = (row, col)
         self.moves_count += 1
         self.move_history.append((row, col, player))
+        self.zobrist ^= self.zobrist_table[row][col][player]
+        if self.symmetry_keys is not None:
+            self._update_symmetry_keys(row, col, player)
+        self._frontier_add_stone(row, col)
+        self._mark_lines_dirty(row, col)
+        self._update_center_balance(row, col, player, 1)
         
-        # Reset threat cache khi có nước đi mới
-        self.threat_cache = {}
+        # Chỉ xóa các mục threat cache nằm trong tầm ảnh hưởng của nước đi
+        self._invalidate_threats(row, col)
         
         return True
     
+    def undo_move(self):
+        """Hoàn tác nước đi cuối cùng, khôi phục chính xác trạng thái trước đó.
+        
+        Returns:
+            tuple hoặc None: Nước đi (row, col, player) vừa hoàn tác, None nếu chưa có nước đi
+        """
+        if not self.move_history:
+            return None
+        
+        row, col, player = self.move_history.pop()
+        self.board[row][col] = ' '
+        self.moves_count -= 1
+        self.last_move = self.move_history[-1][:2] if self.move_history else None
+        self.zobrist ^= self.zobrist_table[row][col][player]
+        if self.symmetry_keys is not None:
+            self._update_symmetry_keys(row, col, player)
+        self._frontier_remove_stone(row, col)
+        self._mark_lines_dirty(row, col)
+        self._update_center_balance(row, col, player, -1)
+        
+        # Chỉ xóa các mục threat cache nằm trong tầm ảnh hưởng của nước đi
+        self._invalidate_threats(row, col)
+        
+        return row, col, player
+    
+    def canonical_key(self):
+        """Khóa của thế cờ không đổi qua 8 phép đối xứng (xoay, lật) của bàn cờ.
+        
+        Lần gọi đầu tính 8 khóa từ lịch sử nước đi; từ đó chúng được cập nhật
+        tăng dần sau mỗi nước đi/hoàn tác.
+        
+        Returns:
+            tuple: (khóa, phép biến đổi). Khóa là khóa Zobrist nhỏ nhất trong
+            8 ảnh của thế cờ; phép biến đổi đưa thế cờ hiện tại về ảnh đó
+            (dùng với to_canonical/from_canonical)
+        """
+        keys = self.symmetry_keys
+        if keys is None:
+            keys = self.symmetry_keys = [0] * 8
+            for row, col, player in self.move_history:
+                self._update_symmetry_keys(row, col, player)
+        key = min(keys)
+        return key, keys.index(key)
+    
+    def canonical_key_after(self, row, col, player):
+        """Khóa canonical_key của thế cờ sau nước đi, không cần đặt quân.
+        
+        Returns:
+            tuple: (khóa, phép biến đổi) như canonical_key
+        """
+        self.canonical_key()
+        codes = self._symmetry_codes(row, col, player)
+        keys = [key ^ code for key, code in zip(self.symmetry_keys, codes)]
+        key = min(keys)
+        return key, keys.index(key)
+    
+    def to_canonical(self, move, transform):
+        """Đổi tọa độ nước đi của thế cờ hiện tại sang hướng chuẩn."""
+        return transform_cell(move[0], move[1], self.size, transform)
+    
+    def from_canonical(self, move, transform):
+        """Đổi tọa độ nước đi lưu theo hướng chuẩn về thế cờ hiện tại."""
+        return transform_cell(move[0], move[1], self.size, INVERSE_TRANSFORMS[transform])
+    
+    def _symmetry_codes(self, row, col, player):
+        """8 khóa Zobrist của các ảnh đối xứng của quân player tại (row, col)."""
+        return _get_symmetry_table(self.size)[row][col][player]
+    
+    def _update_symmetry_keys(self, row, col, player):
+        """Bật/tắt quân tại (row, col) trong 8 khóa đối xứng."""
+        keys = self.symmetry_keys
+        for index, code in enumerate(self._symmetry_codes(row, col, player)):
+            keys[index] ^= code
+    
+    def _invalidate_threats(self, row, col):
+        """Xóa các mục threat cache bị ảnh hưởng khi ô (row, col) thay đổi.
+        
+        Mức đe dọa của một ô chỉ phụ thuộc vào đoạn 9 ô quanh nó theo 4 hướng,
+        nên chỉ các ô trên 4 dòng qua (row, col) trong phạm vi 4 ô bị ảnh hưởng.
+        
+        Args:
+            row: Chỉ số hàng
+            col: Chỉ số cột
+        """
+        cache = self.threat_cache
+        if cache:
+            for key in self.threat_zones[row * self.size + col]:
+                cache.pop(key, None)
+    
+    def threat_cache_stats(self):
+        """Thống kê sử dụng threat cache.
+        
+        Returns:
+            dict: Số lần trúng, trượt, số mục hiện có và tỉ lệ trúng
+        """
+        lookups = self.threat_cache_hits + self.threat_cache_misses
+        return {
+            'hits': self.threat_cache_hits,
+            'misses': self.threat_cache_misses,
+            'entries': len(self.threat_cache),
+            'hit_rate': self.threat_cache_hits / lookups if lookups else 0.0
+        }
+    
+    def _frontier_add_stone(self, row, col):
+        """Cập nhật biên nước đi sau khi đặt quân tại (row, col).
+        
+        Mỗi quân tự đếm chính ô của nó, nên một ô chuyển từ 0 lên 1 chắc chắn
+        đang trống (trừ chính ô vừa đặt, được loại ra ở cuối).
+        
+        Args:
+            row: Chỉ số hàng
+            col: Chỉ số cột
+        """
+        counts = self.neighbour_counts
+        frontier = self.frontier
+        
+        for index, cell in self.neighbourhoods[row * self.size + col]:
+            count = counts[index] + 1
+            counts[index] = count
+            if count == 1:
+                frontier[cell] = None
+        
+        frontier.pop((row, col), None)
+    
+    def _frontier_remove_stone(self, row, col):
+        """Cập nhật biên nước đi sau khi gỡ quân tại (row, col).
+        
+        Args:
+            row: Chỉ số hàng
+            col: Chỉ số cột
+        """
+        counts = self.neighbour_counts
+        frontier = self.frontier
+        
+        for index, cell in self.neighbourhoods[row * self.size + col]:
+            count = counts[index] - 1
+            counts[index] = count
+            if not count:
+                frontier.pop(cell, None)
+        
+        # Ô vừa trống lại thuộc biên nếu vẫn còn quân lân cận
+        if counts[row * self.size + col]:
+            frontier[(row, col)] = None
+    
+    def _lines_through(self, row, col):
+        """Lấy mã của 4 dòng đi qua ô (row, col).
+        
+        Mã dòng là (hướng, khóa): 0 hàng ngang theo row, 1 hàng dọc theo col,
+        2 chéo chính theo row - col, 3 chéo phụ theo row + col.
+        
+        Args:
+            row: Chỉ số hàng
+            col: Chỉ số cột
+            
+        Returns:
+            tuple: 4 mã dòng
+        """
+        return (0, row), (1, col), (2, row - col), (3, row + col)
+    
+    def _line_cells(self, line_id):
+        """Lấy nội dung các ô của một dòng theo mã dòng.
+        
+        Args:
+            line_id: Mã dòng (hướng, khóa)
+            
+        Returns:
+            list: Danh sách các ô trong dòng, theo chiều tăng của hàng (hoặc cột)
+        """
+        direction, key = line_id
+        board = self.board
+        size = self.size
+        
+        if direction == 0:
+            return board[key]
+        if direction == 1:
+            return [board[row][key] for row in range(size)]
+        if direction == 2:
+            return [board[row][row - key] for row in range(max(0, key), min(size, size + key))]
+        return [board[row][key - row] for row in range(max(0, key - size + 1), min(size, key + 1))]
+    
+    def _mark_lines_dirty(self, row, col):
+        """Đánh dấu 4 dòng qua ô (row, col) cần tính lại trong mọi cache dòng.
+        
+        Args:
+            row: Chỉ số hàng
+            col: Chỉ số cột
+        """
+        if self.line_caches:
+            lines = self._lines_through(row, col)
+            for cache in self.line_caches.values():
+                cache['dirty'].update(lines)
+    
+    def line_score_totals(self, scorer):
+        """Tổng điểm theo dòng của một hàm chấm điểm, cập nhật tăng dần.
+        
+        Lần đầu gọi với một scorer, mọi dòng có quân được tính; sau đó chỉ các
+        dòng bị thay đổi bởi make_move/undo_move mới được tính lại.
+        
+        Args:
+            scorer: Hàm nhận danh sách ô của một dòng, trả về (điểm X, điểm O)
+            
+        Returns:
+            dict: Tổng điểm {'X': ..., 'O': ...} trên toàn bàn cờ
+        """
+        cache = self.line_caches.get(scorer)
+        if cache is None:
+            cache = {'scores': {}, 'totals': [0, 0], 'dirty': set()}
+            for row, col, _ in self.move_history:
+                cache['dirty'].update(self._lines_through(row, col))
+            self.line_caches[scorer] = cache
+        
+        totals = cache['totals']
+        dirty = cache['dirty']
+        if dirty:
+            scores = cache['scores']
+            for line_id in dirty:
+                new_score = scorer(self._line_cells(line_id))
+                old_score = scores.get(line_id, (0, 0))
+                totals[0] += new_score[0] - old_score[0]
+                totals[1] += new_score[1] - old_score[1]
+                scores[line_id] = new_score
+            dirty.clear()
+        
+        return {'X': totals[0], 'O': totals[1]}
+    
+    def _center_weight(self, row, col):
+        """Trọng số kiểm soát trung tâm của ô (row, col)."""
+        return self.center_weights[row * self.size + col]
+    
+    def _update_center_balance(self, row, col, player, sign):
+        """Cập nhật tổng trọng số trung tâm khi đặt (sign=1) hoặc gỡ (sign=-1) quân.
+        
+        Args:
+            row, col: Vị trí quân
+            player: Người chơi ('X' hoặc 'O')
+            sign: 1 khi đặt quân, -1 khi gỡ quân
+        """
+        weight = self._center_weight(row, col)
+        if weight:
+            self.center_balance += sign * weight if player == 'X' else -sign * weight
+    
+    @contextmanager
+    def try_move(self, row, col, player):
+        """Đặt thử một quân và tự động hoàn tác khi ra khỏi khối with.
+        
+        Args:
+            row: Chỉ số hàng
+            col: Chỉ số cột
+            player: Người chơi ('X' hoặc 'O')
+            
+        Yields:
+            bool: True nếu nước đi thành công, False nếu không
+        """
+        moved = self.make_move(row, col, player)
+        try:
+            yield moved
+        finally:
+            if moved:
+                self.undo_move()
+    
     def check_winner(self):
         """Kiểm tra xem có người thắng cuộc không.
         
@@ -135,36 +621,23 @@ class Board:
         Returns:
             list: Danh sách các tọa độ (row, col) hợp lệ
         """
-        valid_moves = []
-        
         # Chỉ xem xét các ô nằm gần các quân cờ đã đặt
         if self.moves_count == 0:
             # Nước đi đầu tiên ở giữa bàn cờ
             mid = self.size // 2
             return [(mid, mid)]
         
-        # Kiểm tra các ô trống trong phạm vi 3 ô từ quân cờ đã đặt
-        checked_cells = set()
+        # Các ô trống trong phạm vi move_radius đã được duy trì sẵn trong biên,
+        # sắp xếp theo thứ tự hàng-cột để kết quả không phụ thuộc lịch sử đi/hoàn tác
+        if self.frontier:
+            return sorted(self.frontier)
         
+        # Nếu không có ô nào thỏa mãn, xem xét tất cả các ô trống
+        valid_moves = []
         for row in range(self.size):
             for col in range(self.size):
-                if self.board[row][col] != ' ':
-                    # Kiểm tra các ô xung quanh
-                    for dr in range(-3, 4):
-                        for dc in range(-3, 4):
-                            r, c = row + dr, col + dc
-                            
-                            if (0 <= r < self.size and 0 <= c < self.size and 
-                                self.board[r][c] == ' ' and (r, c) not in checked_cells):
-                                valid_moves.append((r, c))
-                                checked_cells.add((r, c))
-        
-        # Nếu không có ô nào thỏa mãn, xem xét tất cả các ô trống
-        if not valid_moves:
-            for row in range(self.size):
-                for col in range(self.size):
-                    if self.board[row][col] == ' ':
-                        valid_moves.append((row, col))
+                if self.board[row][col] == ' ':
+                    valid_moves.append((row, col))
         
         return valid_moves
     
@@ -285,6 +758,51 @@ class Board:
         
         return False
     
+    def _segment_pattern(self, row, col, row_dir, col_dir, player):
+        """Tra bảng mẫu cho đoạn 9 ô quanh (row, col) theo một hướng.
+        
+        Ô (row, col) được coi như đã có quân của player; ô của đối thủ và ô
+        ngoài bàn cờ đều được mã hóa là bị chặn.
+        
+        Args:
+            row, col: Vị trí đặt quân
+            row_dir, col_dir: Hướng kiểm tra
+            player: Người chơi ('X' hoặc 'O')
+            
+        Returns:
+            SegmentPattern: Thông tin dãy quân và mức đe dọa theo hướng này
+        """
+        board = self.board
+        size = self.size
+        code = 0
+        
+        for row_step, col_step, digit in _SEGMENT_STEPS[(row_dir, col_dir)]:
+            r, c = row + row_step, col + col_step
+            if 0 <= r < size and 0 <= c < size:
+                cell = board[r][c]
+                if cell == player:
+                    code += digit
+                elif cell != ' ':
+                    code += digit + digit
+            else:
+                code += digit + digit
+        
+        return SEGMENT_PATTERNS[code]
+    
+    def get_threat_patterns(self, row, col, player):
+        """Lấy mẫu đe dọa theo 4 hướng nếu player đặt quân tại (row, col).
+        
+        Args:
+            row: Chỉ số hàng
+            col: Chỉ số cột
+            player: Người chơi ('X' hoặc 'O')
+            
+        Returns:
+            tuple: 4 SegmentPattern theo các hướng ngang, dọc, chéo chính, chéo phụ
+        """
+        return tuple(self._segment_pattern(row, col, row_dir, col_dir, player)
+                     for row_dir, col_dir in DIRECTIONS)
+    
     def _check_threat_patterns(self, row, col, player):
         """Kiểm tra các mẫu đe dọa khi đặt quân tại vị trí này.
         
@@ -299,26 +817,15 @@ class Board:
         # Dùng cache nếu đã tính toán trước đó
         cache_key = (row, col, player)
         if cache_key in self.threat_cache:
+            self.threat_cache_hits += 1
             return self.threat_cache[cache_key]
+        self.threat_cache_misses += 1
         
+        # Mỗi hướng đã có sẵn điểm "bốn mở" (100), "bốn nửa mở" (50) và
+        # "ba mở" (20) trong bảng mẫu, chỉ cần một lần đọc đoạn 9 ô
         threat_level = 0
-        directions = [(0, 1), (1, 0), (1, 1), (1, -1)]
-        
-        for row_dir, col_dir in directions:
-            # Kiểm tra mẫu "bốn mở" (4 quân liên tiếp với 2 đầu mở)
-            open_four = self._check_open_four(row, col, row_dir, col_dir, player)
-            if open_four:
-                threat_level += 100
-            
-            # Kiểm tra mẫu "bốn nửa mở" (4 quân liên tiếp với 1 đầu mở)
-            half_open_four = self._check_half_open_four(row, col, row_dir, col_dir, player)
-            if half_open_four:
-                threat_level += 50
-            
-            # Kiểm tra mẫu "ba mở" (3 quân liên tiếp với 2 đầu mở)
-            open_three = self._check_open_three(row, col, row_dir, col_dir, player)
-            if open_three:
-                threat_level += 20
+        for row_dir, col_dir in DIRECTIONS:
+            threat_level += self._segment_pattern(row, col, row_dir, col_dir, player).level
         
         # Lưu vào cache
         self.threat_cache[cache_key] = threat_level
@@ -336,36 +843,8 @@ class Board:
             bool: True nếu tạo thành mẫu bốn mở, False nếu không
         """
         # 4 quân liên tiếp với 2 đầu mở: _XXXX_
-        consecutive = 1  # Quân hiện tại
-        open_ends = 0
-        
-        # Kiểm tra về trước
-        r, c = row - row_dir, col - col_dir
-        while 0 <= r < self.size and 0 <= c < self.size:
-            if self.board[r][c] == player:
-                consecutive += 1
-                r -= row_dir
-                c -= col_dir
-            elif self.board[r][c] == ' ':
-                open_ends += 1
-                break
-            else:
-                break
-        
-        # Kiểm tra về sau
-        r, c = row + row_dir, col + col_dir
-        while 0 <= r < self.size and 0 <= c < self.size:
-            if self.board[r][c] == player:
-                consecutive += 1
-                r += row_dir
-                c += col_dir
-            elif self.board[r][c] == ' ':
-                open_ends += 1
-                break
-            else:
-                break
-        
-        return consecutive == 4 and open_ends == 2
+        pattern = self._segment_pattern(row, col, row_dir, col_dir, player)
+        return pattern.run == 4 and pattern.open_ends == 2
     
     def _check_half_open_four(self, row, col, row_dir, col_dir, player):
         """Kiểm tra mẫu "bốn nửa mở" (4 quân liên tiếp với 1 đầu mở).
@@ -379,36 +858,8 @@ class Board:
             bool: True nếu tạo thành mẫu bốn nửa mở, False nếu không
         """
         # 4 quân liên tiếp với 1 đầu mở: _XXXX hoặc XXXX_
-        consecutive = 1  # Quân hiện tại
-        open_ends = 0
-        
-        # Kiểm tra về trước
-        r, c = row - row_dir, col - col_dir
-        while 0 <= r < self.size and 0 <= c < self.size:
-            if self.board[r][c] == player:
-                consecutive += 1
-                r -= row_dir
-                c -= col_dir
-            elif self.board[r][c] == ' ':
-                open_ends += 1
-                break
-            else:
-                break
-        
-        # Kiểm tra về sau
-        r, c = row + row_dir, col + col_dir
-        while 0 <= r < self.size and 0 <= c < self.size:
-            if self.board[r][c] == player:
-                consecutive += 1
-                r += row_dir
-                c += col_dir
-            elif self.board[r][c] == ' ':
-                open_ends += 1
-                break
-            else:
-                break
-        
-        return consecutive == 4 and open_ends == 1
+        pattern = self._segment_pattern(row, col, row_dir, col_dir, player)
+        return pattern.run == 4 and pattern.open_ends == 1
     
     def _check_open_three(self, row, col, row_dir, col_dir, player):
         """Kiểm tra mẫu "ba mở" (3 quân liên tiếp với 2 đầu mở).
@@ -422,36 +873,8 @@ class Board:
             bool: True nếu tạo thành mẫu ba mở, False nếu không
         """
         # 3 quân liên tiếp với 2 đầu mở: _XXX_
-        consecutive = 1  # Quân hiện tại
-        open_ends = 0
-        
-        # Kiểm tra về trước
-        r, c = row - row_dir, col - col_dir
-        while 0 <= r < self.size and 0 <= c < self.size:
-            if self.board[r][c] == player:
-                consecutive += 1
-                r -= row_dir
-                c -= col_dir
-            elif self.board[r][c] == ' ':
-                open_ends += 1
-                break
-            else:
-                break
-        
-        # Kiểm tra về sau
-        r, c = row + row_dir, col + col_dir
-        while 0 <= r < self.size and 0 <= c < self.size:
-            if self.board[r][c] == player:
-                consecutive += 1
-                r += row_dir
-                c += col_dir
-            elif self.board[r][c] == ' ':
-                open_ends += 1
-                break
-            else:
-                break
-        
-        return consecutive == 3 and open_ends == 2
+        pattern = self._segment_pattern(row, col, row_dir, col_dir, player)
+        return pattern.run == 3 and pattern.open_ends == 2
     
     def evaluate(self, player):
         """Đánh giá trạng thái bàn cờ đối với người chơi.
@@ -472,33 +895,9 @@ class Board:
         if self.check_winner() == opponent:
             return -10000
             
-        # Đánh giá các dãy quân cờ
-        score = 0
-        
-        # Đánh giá hàng ngang
-        for row in range(self.size):
-            score += self._evaluate_line_improved(self.board[row], player)
-        
-        # Đánh giá hàng dọc
-        for col in range(self.size):
-            column = [self.board[row][col] for row in range(self.size)]
-            score += self._evaluate_line_improved(column, player)
-        
-        # Đánh giá đường chéo chính
-        for offset in range(-self.size + 5, self.size - 4):
-            diagonal = []
-            for i in range(max(0, offset), min(self.size, self.size + offset)):
-                diagonal.append(self.board[i][i - offset])
-            if len(diagonal) >= 5:
-                score += self._evaluate_line_improved(diagonal, player)
-        
-        # Đánh giá đường chéo phụ
-        for offset in range(4, 2 * self.size - 5):
-            diagonal = []
-            for i in range(max(0, offset - self.size + 1), min(self.size, offset + 1)):
-                diagonal.append(self.board[i][offset - i])
-            if len(diagonal) >= 5:
-                score += self._evaluate_line_improved(diagonal, player)
+        # Đánh giá các dãy quân cờ (hàng ngang, hàng dọc, hai đường chéo):
+        # điểm từng dòng được lưu lại, chỉ các dòng vừa thay đổi mới tính lại
+        score = self.line_score_totals(self._score_line_both)[player]
         
         # Đánh giá kiểm soát trung tâm
         center_score = self._evaluate_center_control(player)
@@ -516,117 +915,33 @@ class Board:
         Returns:
             int: Điểm đánh giá cho dòng
         """
-        score = 0
-        opponent = 'O' if player == 'X' else 'X'
-        
-        # Tìm các mẫu cửa sổ kích thước 6 để xem xét các trường hợp đặc biệt
-        for i in range(len(line) - 5):
-            window = line[i:i+6]
-            
-            # Đếm số quân của mỗi người chơi trong cửa sổ
-            player_count = window.count(player)
-            opponent_count = window.count(opponent)
-            empty_count = window.count(' ')
-            
-            # Đánh giá cửa sổ dựa trên các mẫu
-            
-            # Mẫu "năm liên tiếp" (chiến thắng)
-            if player_count == 5 and empty_count == 1:
-                score += 10000
-            
-            # Mẫu "bốn mở" (4 quân liên tiếp với 2 đầu mở)
-            # _XXXX_
-            if player_count == 4 and empty_count == 2:
-                if window[0] == ' ' and window[5] == ' ':
-                    score += 5000
-                else:
-                    score += 500
-            
-            # Mẫu "bốn nửa mở" (4 quân liên tiếp với 1 đầu mở)
-            # XXXX_ hoặc _XXXX
-            if player_count == 4 and empty_count == 1:
-                score += 100
-            
-            # Mẫu "ba mở" (3 quân liên tiếp với 2 đầu mở)
-            # _XXX__
-            if player_count == 3 and empty_count == 3:
-                if window[0] == ' ' and window[4] == ' ':
-                    score += 50
-                else:
-                    score += 10
-            
-            # Mẫu "ba nửa mở" (3 quân liên tiếp với 1 đầu mở)
-            if player_count == 3 and empty_count == 2 and opponent_count == 1:
-                score += 5
-            
-            # Mẫu "hai mở" (2 quân liên tiếp với 2 đầu mở)
-            if player_count == 2 and empty_count == 4:
-                score += 2
-            
-            # Đánh giá phòng thủ
-            
-            # Mẫu đối thủ "bốn mở"
-            if opponent_count == 4 and empty_count == 2:
-                if window[0] == ' ' and window[5] == ' ':
-                    score -= 4500
-                else:
-                    score -= 400
-            
-            # Mẫu đối thủ "bốn nửa mở"
-            if opponent_count == 4 and empty_count == 1:
-                score -= 90
-            
-            # Mẫu đối thủ "ba mở"
-            if opponent_count == 3 and empty_count == 3:
-                if window[0] == ' ' and window[4] == ' ':
-                    score -= 40
-                else:
-                    score -= 8
-            
-            # Mẫu đối thủ "ba nửa mở"
-            if opponent_count == 3 and empty_count == 2 and player_count == 1:
-                score -= 4
+        x_score, o_score = score_line_windows(line)
+        return x_score if player == 'X' else o_score
+    
+    def _score_line_both(self, line):
+        """Chấm điểm một dòng cho cả hai người chơi (dùng cho cache dòng).
         
-        return score
+        Args:
+            line: Danh sách các ô trong dòng
+            
+        Returns:
+            tuple: (điểm cho X, điểm cho O)
+        """
+        # Mỗi cửa sổ 6 ô được mã hóa một lần và tra bảng điểm của cả hai bên
+        return score_line_windows(line)
     
     def _evaluate_center_control(self, player):
         """Đánh giá mức độ kiểm soát trung tâm bàn cờ.
         
+        Tổng trọng số các vùng trung tâm được cập nhật sẵn sau mỗi nước đi.
+        
         Args:
             player: Người chơi đang đánh giá ('X' hoặc 'O')
             
         Returns:
             int: Điểm kiểm soát trung tâm
         """
-        score = 0
-        opponent = 'O' if player == 'X' else 'X'
-        center = self.size // 2
-        
-        # Chia bàn cờ thành các vùng
-        regions = [
-            (0, center // 2),    # Vùng góc
-            (center // 2, center * 3 // 4),  # Vùng biên
-            (center * 3 // 4, center * 5 // 4),  # Vùng gần trung tâm
-            (center * 5 // 4, center * 3 // 2),  # Vùng biên
-            (center * 3 // 2, self.size)  # Vùng góc
-        ]
-        
-        # Trọng số cho các vùng
-        weights = [1, 2, 3, 2, 1]
-        
-        # Đánh giá kiểm soát mỗi vùng
-        for region_idx, (start, end) in enumerate(regions):
-            weight = weights[region_idx]
-            
-            for row in range(start, end):
-                for col in range(start, end):
-                    if row < self.size and col < self.size:
-                        if self.board[row][col] == player:
-                            score += weight
-                        elif self.board[row][col] == opponent:
-                            score -= weight
-        
-        return score
+        return self.center_balance if player == 'X' else -self.center_balance
     
     def display(self):
         """Hiển thị bàn cờ."""
@@ -647,10 +962,55 @@ class Board:
         Returns:
             Board: Bản sao của bàn cờ
         """
-        new_board = Board(self.size)
-        new_board.board = [row[:] for row in self.board]
+        new_board = type(self)(self.size, self.move_radius)
         new_board.last_move = self.last_move
         new_board.moves_count = self.moves_count
         new_board.move_history = self.move_history.copy()
+        new_board.zobrist = self.zobrist
+        if self.symmetry_keys is not None:
+            new_board.symmetry_keys = self.symmetry_keys[:]
+        new_board.frontier = self.frontier.copy()
+        new_board.center_balance = self.center_balance
+        self._copy_storage(new_board)
         # Không sao chép threat_cache vì nó là bộ đệm
-        return new_board
\ No newline at end of file
+        return new_board
+    
+    def to_bytes(self):
+        """Mã hóa gọn bàn cờ để gửi sang tiến trình khác.
+        
+        Chỉ gồm kích thước, bán kính sinh nước đi và lịch sử nước đi (mỗi nước
+        3 số nguyên 32-bit), không kèm các bảng phụ hay bộ đệm.
+        
+        Returns:
+            bytes: Dữ liệu đã mã hóa, dùng với from_bytes của cùng lớp
+        """
+        values = array('I', [self.size, self.move_radius])
+        for row, col, player in self.move_history:
+            values.extend((row, col, 0 if player == 'X' else 1))
+        return values.tobytes()
+    
+    @classmethod
+    def from_bytes(cls, data):
+        """Dựng lại bàn cờ từ dữ liệu của to_bytes bằng cách đi lại các nước.
+        
+        Args:
+            data: Dữ liệu đã mã hóa
+            
+        Returns:
+            Board: Bàn cờ mới cùng thế cờ, cùng khóa Zobrist
+        """
+        values = array('I')
+        values.frombytes(data)
+        board = cls(values[0], values[1])
+        for index in range(2, len(values), 3):
+            board.make_move(values[index], values[index + 1], 'XO'[values[index + 2]])
+        return board
+    
+    def _copy_storage(self, new_board):
+        """Sao chép lưới ô và số đếm biên nước đi sang bàn cờ mới.
+        
+        Args:
+            new_board: Bàn cờ đích, cùng kiểu và kích thước
+        """
+        new_board.board = [row[:] for row in self.board]
+        new_board.neighbour_counts = self.neighbour_counts[:]
\ No newline at end of file
@@ -0,0 +1,270 @@
+"""Bảng tra cứu mẫu cờ Caro, được tạo một lần khi import.
+
+Gồm hai loại bảng:
+- WINDOW_SCORES: điểm của mỗi cửa sổ 6 ô (mã cơ số 3: trống 0, X 1, O 2)
+  theo đúng các luật của Board._evaluate_line_improved.
+- SEGMENT_PATTERNS: thông tin mối đe dọa của đoạn 9 ô quanh một ô vừa đặt
+  quân theo một hướng, mã hóa tương đối (trống 0, quân mình 1, bị chặn 2).
+"""
+from collections import namedtuple
+
+# Mã của từng ô khi mã hóa dòng theo cơ số 3
+CELL_CODES = {' ': 0, 'X': 1, 'O': 2}
+
+WINDOW_SIZE = 6
+WINDOW_COUNT = 3 ** WINDOW_SIZE
+_WINDOW_PREFIX = 3 ** (WINDOW_SIZE - 1)
+
+# Các mức đe dọa, xếp theo độ mạnh tăng dần
+THREAT_NONE = 0
+THREAT_TWO = 1        # Thêm 1 quân có thể thành ba mở
+THREAT_THREE = 2      # Thêm 1 quân thành bốn (bị chặn)
+THREAT_OPEN_THREE = 3  # Thêm 1 quân thành bốn mở, kể cả ba gãy _X_XX_
+THREAT_FOUR = 4       # Còn đúng 1 ô để thành 5, kể cả bốn gãy X_XXX
+THREAT_OPEN_FOUR = 5  # Có từ 2 ô để thành 5
+THREAT_FIVE = 6
+
+# Độ lệch của 8 ô quanh tâm trong một đoạn, theo thứ tự chữ số của mã
+SEGMENT_OFFSETS = (-4, -3, -2, -1, 1, 2, 3, 4)
+SEGMENT_COUNT = 3 ** len(SEGMENT_OFFSETS)
+
+# Mã ô tương đối trong đoạn
+EMPTY = 0
+OWN = 1
+BLOCKED = 2
+
+SegmentPattern = namedtuple('SegmentPattern', [
+    'run',              # Số quân liên tiếp qua tâm
+    'open_ends',        # Số đầu mở của dãy đó
+    'level',            # Điểm đe dọa theo dãy liên tiếp (như _check_threat_patterns)
+    'threat',           # Mức đe dọa THREAT_* có tính cả hình gãy
+    'five_offsets',     # Các độ lệch ô trống hoàn thành 5 quân
+    'defence_offsets',  # Các độ lệch ô trống mà đối thủ chặn vào sẽ hạ mức đe dọa
+])
+
+
+def _score_window(window, player):
+    """Điểm của một cửa sổ 6 ô, theo đúng luật của Board._evaluate_line_improved.
+
+    Args:
+        window: Danh sách 6 ô
+        player: Người chơi đang đánh giá ('X' hoặc 'O')
+
+    Returns:
+        int: Điểm của cửa sổ
+    """
+    opponent = 'O' if player == 'X' else 'X'
+    player_count = window.count(player)
+    opponent_count = window.count(opponent)
+    empty_count = window.count(' ')
+    score = 0
+
+    if player_count == 5 and empty_count == 1:
+        score += 10000
+    if player_count == 4 and empty_count == 2:
+        score += 5000 if window[0] == ' ' and window[5] == ' ' else 500
+    if player_count == 4 and empty_count == 1:
+        score += 100
+    if player_count == 3 and empty_count == 3:
+        score += 50 if window[0] == ' ' and window[4] == ' ' else 10
+    if player_count == 3 and empty_count == 2 and opponent_count == 1:
+        score += 5
+    if player_count == 2 and empty_count == 4:
+        score += 2
+
+    if opponent_count == 4 and empty_count == 2:
+        score -= 4500 if window[0] == ' ' and window[5] == ' ' else 400
+    if opponent_count == 4 and empty_count == 1:
+        score -= 90
+    if opponent_count == 3 and empty_count == 3:
+        score -= 40 if window[0] == ' ' and window[4] == ' ' else 8
+    if opponent_count == 3 and empty_count == 2 and player_count == 1:
+        score -= 4
+
+    return score
+
+
+def _build_window_scores():
+    """Tạo bảng điểm cửa sổ 6 ô cho cả hai người chơi.
+
+    Returns:
+        dict: {'X': list, 'O': list}, mỗi list có WINDOW_COUNT phần tử
+    """
+    symbols = (' ', 'X', 'O')
+    tables = {'X': [0] * WINDOW_COUNT, 'O': [0] * WINDOW_COUNT}
+
+    for code in range(WINDOW_COUNT):
+        window = []
+        rest = code
+        for _ in range(WINDOW_SIZE):
+            window.append(symbols[rest % 3])
+            rest //= 3
+        window.reverse()  # Ô đầu tiên là chữ số có trọng số cao nhất
+
+        tables['X'][code] = _score_window(window, 'X')
+        tables['O'][code] = _score_window(window, 'O')
+
+    return tables
+
+
+def score_line_windows(line):
+    """Tổng điểm mọi cửa sổ 6 ô của một dòng cho cả hai người chơi.
+
+    Mã cửa sổ được cuộn dần nên mỗi ô chỉ được đọc một lần.
+
+    Args:
+        line: Danh sách các ô trong dòng
+
+    Returns:
+        tuple: (điểm cho X, điểm cho O)
+    """
+    if len(line) < WINDOW_SIZE:
+        return 0, 0
+
+    codes = CELL_CODES
+    x_table = WINDOW_SCORES['X']
+    o_table = WINDOW_SCORES['O']
+
+    code = 0
+    for cell in line[:WINDOW_SIZE - 1]:
+        code = code * 3 + codes[cell]
+
+    x_score = 0
+    o_score = 0
+    for cell in line[WINDOW_SIZE - 1:]:
+        code = (code % _WINDOW_PREFIX) * 3 + codes[cell]
+        x_score += x_table[code]
+        o_score += o_table[code]
+
+    return x_score, o_score
+
+
+def _decode_segment(code):
+    """Giải mã một đoạn thành danh sách 9 ô (tâm ở chỉ số 4 luôn là quân mình)."""
+    cells = []
+    for _ in SEGMENT_OFFSETS:
+        cells.append(code % 3)
+        code //= 3
+    return cells[:4] + [OWN] + cells[4:]
+
+
+def _encode_segment(cells):
+    """Mã hóa danh sách 9 ô (bỏ qua tâm) thành mã đoạn."""
+    code = 0
+    for cell in reversed(cells[:4] + cells[5:]):
+        code = code * 3 + cell
+    return code
+
+
+def _run_info(cells):
+    """Số quân liên tiếp qua tâm và số đầu mở của dãy đó."""
+    start = 4
+    while start > 0 and cells[start - 1] == OWN:
+        start -= 1
+    end = 4
+    while end < 8 and cells[end + 1] == OWN:
+        end += 1
+
+    open_ends = 0
+    if start > 0 and cells[start - 1] == EMPTY:
+        open_ends += 1
+    if end < 8 and cells[end + 1] == EMPTY:
+        open_ends += 1
+
+    return end - start + 1, open_ends
+
+
+def _build_segment_patterns():
+    """Tạo bảng SegmentPattern cho mọi đoạn 9 ô.
+
+    Mức đe dọa được tính đệ quy: một đoạn là ba mở nếu thêm một quân có thể
+    tạo bốn mở, là bốn nếu còn đúng một ô hoàn thành 5, ...
+
+    Returns:
+        list: SEGMENT_COUNT phần tử SegmentPattern
+    """
+    threats = {}
+
+    def five_points(cells):
+        points = []
+        for index in range(9):
+            if cells[index] != EMPTY:
+                continue
+            cells[index] = OWN
+            if _run_info(cells)[0] >= 5:
+                points.append(index)
+            cells[index] = EMPTY
+        return points
+
+    def threat_of(code):
+        if code in threats:
+            return threats[code]
+
+        cells = _decode_segment(code)
+        if _run_info(cells)[0] >= 5:
+            threat = THREAT_FIVE
+        else:
+            points = len(five_points(cells))
+            if points >= 2:
+                threat = THREAT_OPEN_FOUR
+            elif points == 1:
+                threat = THREAT_FOUR
+            else:
+                best = THREAT_NONE
+                for index in range(9):
+                    if cells[index] != EMPTY:
+                        continue
+                    cells[index] = OWN
+                    next_threat = threat_of(_encode_segment(cells))
+                    cells[index] = EMPTY
+
+                    if next_threat == THREAT_OPEN_FOUR:
+                        best = THREAT_OPEN_THREE
+                        break
+                    if next_threat == THREAT_FOUR:
+                        best = max(best, THREAT_THREE)
+                    elif next_threat == THREAT_OPEN_THREE:
+                        best = max(best, THREAT_TWO)
+                threat = best
+
+        threats[code] = threat
+        return threat
+
+    patterns = []
+    for code in range(SEGMENT_COUNT):
+        cells = _decode_segment(code)
+        run, open_ends = _run_info(cells)
+
+        # Điểm theo dãy liên tiếp, như các hàm _check_open_four/... cũ
+        level = 0
+        if run == 4 and open_ends == 2:
+            level += 100
+        if run == 4 and open_ends == 1:
+            level += 50
+        if run == 3 and open_ends == 2:
+            level += 20
+
+        threat = threat_of(code)
+        five_offsets = tuple(index - 4 for index in five_points(cells)) if run < 5 else ()
+
+        # Ô phòng thủ: đối thủ đặt vào thì mức đe dọa giảm xuống
+        defence_offsets = ()
+        if THREAT_OPEN_THREE <= threat <= THREAT_OPEN_FOUR:
+            defences = []
+            for index in range(9):
+                if cells[index] != EMPTY:
+                    continue
+                cells[index] = BLOCKED
+                if threat_of(_encode_segment(cells)) < threat:
+                    defences.append(index - 4)
+                cells[index] = EMPTY
+            defence_offsets = tuple(defences)
+
+        patterns.append(SegmentPattern(run, open_ends, level, threat,
+                                       five_offsets, defence_offsets))
+
+    return patterns
+
+
+WINDOW_SCORES = _build_window_scores()
+SEGMENT_PATTERNS = _build_segment_patterns()
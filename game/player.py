@@ -20,6 +20,19 @@ class Player:
             tuple: Tọa độ (row, col) của nước đi
         """
         raise NotImplementedError("Phương thức này phải được triển khai ở lớp con")
+    
+    def on_move_played(self, board, move, symbol):
+        """Được gọi sau mỗi nước đi trên bàn cờ, của cả hai bên.
+        
+        Mặc định không làm gì; agent có thể dùng để suy nghĩ trong thời gian
+        của đối thủ (pondering).
+        
+        Args:
+            board: Bàn cờ sau nước đi
+            move: Tọa độ (row, col) của nước vừa đi
+            symbol: Ký hiệu của người vừa đi
+        """
+        pass
 
 
 class HumanPlayer(Player):
@@ -102,6 +115,10 @@ class Game:
             if verbose:
                 print(f"{current_player.name} đặt quân tại ({row}, {col})")
             
+            # Báo nước đi cho cả hai người chơi
+            for player in self.players:
+                player.on_move_played(self.board, (row, col), current_player.symbol)
+            
             # Kiểm tra người thắng
             winner = self.board.check_winner()
             if winner:
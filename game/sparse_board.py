@@ -0,0 +1,397 @@
+import random
+from game.board import Board, DIRECTIONS, _SEGMENT_STEPS, _ZOBRIST_SEED, _center_regions, transform_cell
+from game.patterns import SEGMENT_OFFSETS, SEGMENT_PATTERNS, WINDOW_SIZE
+
+# Kích thước dùng cho chế độ "bàn cờ không giới hạn"
+UNBOUNDED_SIZE = 1 << 20
+
+
+class _SparseRow:
+    """Một hàng của lưới thưa, cho phép truy cập board.board[row][col] như lưới dày."""
+
+    __slots__ = ('cells', 'row')
+
+    def __init__(self, cells, row):
+        self.cells = cells
+        self.row = row
+
+    def __getitem__(self, col):
+        return self.cells.get((self.row, col), ' ')
+
+    def __setitem__(self, col, value):
+        if value == ' ':
+            self.cells.pop((self.row, col), None)
+        else:
+            self.cells[(self.row, col)] = value
+
+
+class _SparseGrid:
+    """Lưới ảo trên dict các ô đã có quân, ô không có trong dict là ô trống."""
+
+    __slots__ = ('cells', 'size', 'rows')
+
+    def __init__(self, cells, size):
+        self.cells = cells
+        self.size = size
+        self.rows = {}  # Các đối tượng hàng đã tạo, tránh tạo lại mỗi lần truy cập
+
+    def __getitem__(self, row):
+        view = self.rows.get(row)
+        if view is None:
+            view = self.rows[row] = _SparseRow(self.cells, row)
+        return view
+
+    def __len__(self):
+        return self.size
+
+
+class _ZobristColumns(dict):
+    """Khóa Zobrist của các ô trong một hàng, tạo khi được dùng lần đầu."""
+
+    def __init__(self, row):
+        super().__init__()
+        self.row = row
+
+    def __missing__(self, col):
+        # Sinh từ hạt giống cố định theo tọa độ nên mọi bàn cờ thưa dùng chung khóa
+        rng = random.Random(f"{_ZOBRIST_SEED}:{self.row}:{col}")
+        keys = self[col] = {'X': rng.getrandbits(64), 'O': rng.getrandbits(64)}
+        return keys
+
+
+class _ZobristRows(dict):
+    """Bảng Zobrist lười: keys[row][col][player], không cần cấp phát size x size."""
+
+    def __missing__(self, row):
+        columns = self[row] = _ZobristColumns(row)
+        return columns
+
+
+_ZOBRIST_KEYS = _ZobristRows()
+
+# Ô lân cận của các ô từng có quân, dùng chung theo (kích thước, bán kính)
+_NEIGHBOURHOODS = {}
+
+
+class SparseBoard(Board):
+    """Bàn cờ Caro thưa cho bàn rất lớn hoặc "không giới hạn".
+
+    Chỉ lưu các ô đã có quân trong một dict, cùng chỉ mục vị trí quân theo
+    từng dòng. Mọi thao tác (đi/hoàn tác, sinh nước đi, đánh giá theo dòng,
+    kiểm soát trung tâm) có chi phí theo số quân chứ không theo diện tích bàn
+    cờ. board.board[row][col] vẫn dùng được như bàn cờ thường.
+    """
+
+    def __init__(self, size=UNBOUNDED_SIZE, move_radius=3):
+        """Khởi tạo bàn cờ thưa.
+
+        Args:
+            size: Kích thước bàn cờ (size x size), mặc định gần như không giới hạn
+            move_radius: Bán kính quanh các quân đã đặt để sinh nước đi ứng viên
+        """
+        super().__init__(size, move_radius)
+
+    def _init_storage(self):
+        """Tạo dict ô, chỉ mục theo dòng và các bảng tra cứu không phụ thuộc diện tích."""
+        self.cells = {}  # (row, col) -> 'X' hoặc 'O'
+        self.board = _SparseGrid(self.cells, self.size)
+        self.line_stones = {}  # Mã dòng -> tập vị trí các quân trên dòng
+        self.zobrist_table = _ZOBRIST_KEYS
+        self.neighbour_counts = {}  # Chỉ lưu các ô có số đếm khác 0
+        self.neighbourhoods = _NEIGHBOURHOODS.setdefault((self.size, self.move_radius), {})
+        self.center_regions = _center_regions(self.size)
+
+    def _copy_storage(self, new_board):
+        """Sao chép dict ô, chỉ mục dòng và số đếm biên sang bàn cờ mới.
+
+        Args:
+            new_board: Bàn cờ thưa đích, cùng kích thước
+        """
+        new_board.cells.update(self.cells)
+        new_board.line_stones = {line_id: set(stones)
+                                 for line_id, stones in self.line_stones.items()}
+        new_board.neighbour_counts = dict(self.neighbour_counts)
+
+    def is_valid_move(self, row, col):
+        """Kiểm tra nước đi có hợp lệ không.
+
+        Args:
+            row: Chỉ số hàng
+            col: Chỉ số cột
+
+        Returns:
+            bool: True nếu nước đi hợp lệ, False nếu không
+        """
+        return 0 <= row < self.size and 0 <= col < self.size and (row, col) not in self.cells
+
+    def make_move(self, row, col, player):
+        """Thực hiện nước đi và cập nhật chỉ mục dòng.
+
+        Args:
+            row: Chỉ số hàng
+            col: Chỉ số cột
+            player: Người chơi ('X' hoặc 'O')
+
+        Returns:
+            bool: True nếu nước đi thành công, False nếu không
+        """
+        if not super().make_move(row, col, player):
+            return False
+
+        line_stones = self.line_stones
+        for line_id, position in zip(self._lines_through(row, col), (col, row, row, row)):
+            stones = line_stones.get(line_id)
+            if stones is None:
+                stones = line_stones[line_id] = set()
+            stones.add(position)
+        return True
+
+    def undo_move(self):
+        """Hoàn tác nước đi cuối cùng và cập nhật chỉ mục dòng.
+
+        Returns:
+            tuple hoặc None: Nước đi (row, col, player) vừa hoàn tác
+        """
+        move = super().undo_move()
+        if move is not None:
+            row, col, _ = move
+            line_stones = self.line_stones
+            for line_id, position in zip(self._lines_through(row, col), (col, row, row, row)):
+                stones = line_stones[line_id]
+                stones.discard(position)
+                if not stones:
+                    del line_stones[line_id]
+        return move
+
+    def _symmetry_codes(self, row, col, player):
+        """8 khóa Zobrist của các ảnh đối xứng, tính trực tiếp từ bảng Zobrist lười."""
+        keys = self.zobrist_table
+        return tuple(keys[r][c][player]
+                     for r, c in (transform_cell(row, col, self.size, t) for t in range(8)))
+
+    def _invalidate_threats(self, row, col):
+        """Xóa các mục threat cache trên 4 dòng qua (row, col) trong phạm vi 4 ô.
+
+        Args:
+            row: Chỉ số hàng
+            col: Chỉ số cột
+        """
+        cache = self.threat_cache
+        if cache:
+            cache.pop((row, col, 'X'), None)
+            cache.pop((row, col, 'O'), None)
+            for row_dir, col_dir in DIRECTIONS:
+                for offset in SEGMENT_OFFSETS:
+                    r, c = row + offset * row_dir, col + offset * col_dir
+                    cache.pop((r, c, 'X'), None)
+                    cache.pop((r, c, 'O'), None)
+
+    def _neighbourhood(self, row, col):
+        """Các ô trong phạm vi move_radius quanh (row, col), gồm cả chính ô đó.
+
+        Chỉ tính cho các ô từng được đặt quân và lưu lại để dùng chung.
+        """
+        cell = (row, col)
+        cells = self.neighbourhoods.get(cell)
+        if cells is None:
+            radius = self.move_radius
+            size = self.size
+            cells = self.neighbourhoods[cell] = tuple(
+                (r, c)
+                for r in range(max(0, row - radius), min(size, row + radius + 1))
+                for c in range(max(0, col - radius), min(size, col + radius + 1))
+            )
+        return cells
+
+    def _frontier_add_stone(self, row, col):
+        """Cập nhật biên nước đi sau khi đặt quân tại (row, col).
+
+        Args:
+            row: Chỉ số hàng
+            col: Chỉ số cột
+        """
+        counts = self.neighbour_counts
+        frontier = self.frontier
+
+        for cell in self._neighbourhood(row, col):
+            count = counts.get(cell, 0) + 1
+            counts[cell] = count
+            if count == 1:
+                frontier[cell] = None
+
+        frontier.pop((row, col), None)
+
+    def _frontier_remove_stone(self, row, col):
+        """Cập nhật biên nước đi sau khi gỡ quân tại (row, col).
+
+        Args:
+            row: Chỉ số hàng
+            col: Chỉ số cột
+        """
+        counts = self.neighbour_counts
+        frontier = self.frontier
+
+        for cell in self._neighbourhood(row, col):
+            count = counts[cell] - 1
+            if count:
+                counts[cell] = count
+            else:
+                del counts[cell]
+                frontier.pop(cell, None)
+
+        # Ô vừa trống lại thuộc biên nếu vẫn còn quân lân cận
+        if (row, col) in counts:
+            frontier[(row, col)] = None
+
+    def _line_cells(self, line_id):
+        """Lấy các cụm quân trên dòng, mỗi cụm nới thêm WINDOW_SIZE - 1 ô mỗi bên.
+
+        Cửa sổ toàn ô trống có điểm 0, nên chỉ cần các đoạn quanh quân (trong
+        phạm vi bàn cờ). Hai quân cách nhau từ WINDOW_SIZE ô trở lên không
+        cùng nằm trong cửa sổ nào, nên các cụm được nối thẳng với nhau: giữa
+        hai cụm luôn có ít nhất 2 * (WINDOW_SIZE - 1) ô trống, không cửa sổ nào
+        chứa quân của cả hai cụm. Độ dài kết quả chỉ phụ thuộc số quân trên
+        dòng, không phụ thuộc khoảng cách giữa chúng.
+
+        Args:
+            line_id: Mã dòng (hướng, khóa)
+
+        Returns:
+            list: Danh sách các ô của các cụm, theo chiều tăng của hàng (hoặc cột)
+        """
+        stones = self.line_stones.get(line_id)
+        if not stones:
+            return []
+
+        direction, key = line_id
+        size = self.size
+        if direction == 2:
+            first, last = max(0, key), min(size, size + key) - 1
+        elif direction == 3:
+            first, last = max(0, key - size + 1), min(size, key + 1) - 1
+        else:
+            first, last = 0, size - 1
+
+        # Gộp các đoạn [t - pad, t + pad] chồng nhau hoặc liền nhau
+        pad = WINDOW_SIZE - 1
+        spans = []
+        for t in sorted(stones):
+            if spans and t - pad <= spans[-1][1] + 1:
+                spans[-1][1] = t + pad
+            else:
+                spans.append([t - pad, t + pad])
+
+        positions = []
+        for low, high in spans:
+            positions.extend(range(max(first, low), min(last, high) + 1))
+        cells = self.cells
+
+        if direction == 0:
+            return [cells.get((key, col), ' ') for col in positions]
+        if direction == 1:
+            return [cells.get((row, key), ' ') for row in positions]
+        if direction == 2:
+            return [cells.get((row, row - key), ' ') for row in positions]
+        return [cells.get((row, key - row), ' ') for row in positions]
+
+    def _center_weight(self, row, col):
+        """Trọng số kiểm soát trung tâm của ô (row, col), tính trực tiếp từ các vùng."""
+        weight = 0
+        for start, end, region_weight in self.center_regions:
+            if start <= row < end and start <= col < end:
+                weight += region_weight
+        return weight
+
+    def _check_line(self, row, col, row_dir, col_dir, player):
+        """Kiểm tra 5 quân cờ liên tiếp theo một hướng qua ô (row, col).
+
+        Args:
+            row, col: Ô bắt đầu (đã có quân của player)
+            row_dir, col_dir: Hướng kiểm tra
+            player: Người chơi ('X' hoặc 'O')
+
+        Returns:
+            bool: True nếu có 5 quân cờ liên tiếp, False nếu không
+        """
+        return self._run_length(row, col, row_dir, col_dir, player) >= 5
+
+    def _check_win_at(self, row, col, player):
+        """Kiểm tra nếu đặt quân tại vị trí này sẽ tạo thành 5 liên tiếp.
+
+        Args:
+            row: Chỉ số hàng
+            col: Chỉ số cột
+            player: Người chơi ('X' hoặc 'O')
+
+        Returns:
+            bool: True nếu sẽ thắng, False nếu không
+        """
+        for row_dir, col_dir in DIRECTIONS:
+            if self._run_length(row, col, row_dir, col_dir, player) >= 5:
+                return True
+        return False
+
+    def _run_length(self, row, col, row_dir, col_dir, player):
+        """Độ dài dãy quân của player qua ô (row, col), coi ô này là quân của player."""
+        cells = self.cells
+        count = 1
+
+        r, c = row - row_dir, col - col_dir
+        while cells.get((r, c)) == player:
+            count += 1
+            r -= row_dir
+            c -= col_dir
+
+        r, c = row + row_dir, col + col_dir
+        while cells.get((r, c)) == player:
+            count += 1
+            r += row_dir
+            c += col_dir
+
+        return count
+
+    def _segment_pattern(self, row, col, row_dir, col_dir, player):
+        """Tra bảng mẫu cho đoạn 9 ô quanh (row, col) theo một hướng.
+
+        Args:
+            row, col: Vị trí đặt quân
+            row_dir, col_dir: Hướng kiểm tra
+            player: Người chơi ('X' hoặc 'O')
+
+        Returns:
+            SegmentPattern: Thông tin dãy quân và mức đe dọa theo hướng này
+        """
+        cells = self.cells
+        size = self.size
+        code = 0
+
+        for row_step, col_step, digit in _SEGMENT_STEPS[(row_dir, col_dir)]:
+            r, c = row + row_step, col + col_step
+            if 0 <= r < size and 0 <= c < size:
+                cell = cells.get((r, c))
+                if cell == player:
+                    code += digit
+                elif cell is not None:
+                    code += digit + digit
+            else:
+                code += digit + digit
+
+        return SEGMENT_PATTERNS[code]
+
+    def display(self):
+        """Hiển thị vùng bàn cờ quanh các quân đã đặt, kèm tọa độ thật."""
+        if not self.cells:
+            mid = self.size // 2
+            rows = cols = range(max(0, mid - 2), min(self.size, mid + 3))
+        else:
+            margin = 2
+            stone_rows = [row for row, _ in self.cells]
+            stone_cols = [col for _, col in self.cells]
+            rows = range(max(0, min(stone_rows) - margin), min(self.size, max(stone_rows) + margin + 1))
+            cols = range(max(0, min(stone_cols) - margin), min(self.size, max(stone_cols) + margin + 1))
+
+        width = len(str(self.size - 1))
+        print(" " * (width + 1) + " ".join(f"{col:>{width}d}" for col in cols))
+        for row in rows:
+            line = " ".join(f"{self.cells.get((row, col), '.'):>{width}}" for col in cols)
+            print(f"{row:>{width}d} {line}")
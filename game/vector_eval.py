@@ -0,0 +1,257 @@
+"""Đánh giá bàn cờ bằng NumPy: quét mọi cửa sổ 6 ô theo 4 hướng cùng lúc.
+
+NumPy là tùy chọn. Khi không cài NumPy, HAS_NUMPY bằng False và các agent
+dùng lại đường đánh giá thuần Python của Board.
+"""
+from game.board import _get_center_weights
+from game.patterns import CELL_CODES, WINDOW_SCORES, WINDOW_SIZE
+from game.sparse_board import SparseBoard
+
+try:
+    import numpy as np
+except ImportError:  # NumPy không bắt buộc
+    np = None
+
+HAS_NUMPY = np is not None
+
+# Bảng điểm cửa sổ và trọng số trung tâm dạng mảng, tạo khi cần
+_SCORE_ARRAYS = {}
+_CENTER_ARRAYS = {}
+
+
+def _score_array(player):
+    """Bảng điểm cửa sổ 6 ô của player dưới dạng mảng NumPy."""
+    if player not in _SCORE_ARRAYS:
+        _SCORE_ARRAYS[player] = np.array(WINDOW_SCORES[player], dtype=np.int64)
+    return _SCORE_ARRAYS[player]
+
+
+def _center_array(size):
+    """Trọng số kiểm soát trung tâm của từng ô dưới dạng mảng (size, size)."""
+    if size not in _CENTER_ARRAYS:
+        weights = _get_center_weights(size)
+        _CENTER_ARRAYS[size] = np.array(weights, dtype=np.int64).reshape(size, size)
+    return _CENTER_ARRAYS[size]
+
+
+def board_to_array(board):
+    """Chuyển lưới của Board thành mảng int8 (trống 0, X 1, O 2).
+
+    Args:
+        board: Bàn cờ
+
+    Returns:
+        numpy.ndarray: Mảng (size, size) kiểu int8
+    """
+    return np.array([[CELL_CODES[cell] for cell in row] for row in board.board],
+                    dtype=np.int8)
+
+
+def window_codes(arrays):
+    """Mã cơ số 3 của mọi cửa sổ 6 ô theo 4 hướng.
+
+    Args:
+        arrays: Mảng (..., size, size) các thế cờ
+
+    Returns:
+        list: 4 mảng mã (..., h, w) cho các hướng ngang, dọc, chéo chính, chéo phụ
+    """
+    values = arrays.astype(np.int32)
+    size = values.shape[-1]
+    span = size - WINDOW_SIZE + 1
+    if span <= 0:
+        return []
+
+    horizontal = 0
+    vertical = 0
+    diagonal = 0
+    anti_diagonal = 0
+    for k in range(WINDOW_SIZE):
+        # Ô đầu tiên của cửa sổ là chữ số có trọng số cao nhất
+        weight = 3 ** (WINDOW_SIZE - 1 - k)
+        horizontal = horizontal + weight * values[..., :, k:k + span]
+        vertical = vertical + weight * values[..., k:k + span, :]
+        diagonal = diagonal + weight * values[..., k:k + span, k:k + span]
+        anti_diagonal = anti_diagonal + weight * values[
+            ..., k:k + span, WINDOW_SIZE - 1 - k:WINDOW_SIZE - 1 - k + span]
+
+    return [horizontal, vertical, diagonal, anti_diagonal]
+
+
+def evaluate_arrays(arrays, player):
+    """Điểm các dãy quân và kiểm soát trung tâm, giống Board.evaluate khi chưa ai thắng.
+
+    Args:
+        arrays: Mảng (..., size, size) các thế cờ
+        player: Người chơi đang đánh giá ('X' hoặc 'O')
+
+    Returns:
+        numpy.ndarray: Điểm của từng thế cờ, kích thước (...)
+    """
+    scores = _score_array(player)
+    size = arrays.shape[-1]
+    total = np.zeros(arrays.shape[:-2], dtype=np.int64)
+
+    for codes in window_codes(arrays):
+        total = total + scores[codes].sum(axis=(-2, -1))
+
+    # Kiểm soát trung tâm: cộng trọng số quân mình, trừ trọng số quân đối thủ
+    own = CELL_CODES[player]
+    other = CELL_CODES['O' if player == 'X' else 'X']
+    weights = _center_array(size)
+    total = total + ((arrays == own) * weights).sum(axis=(-2, -1))
+    total = total - ((arrays == other) * weights).sum(axis=(-2, -1))
+
+    return total
+
+
+def has_five(arrays, player):
+    """Kiểm tra từng thế cờ có 5 quân liên tiếp của player không.
+
+    Args:
+        arrays: Mảng (..., size, size) các thế cờ
+        player: Người chơi cần kiểm tra ('X' hoặc 'O')
+
+    Returns:
+        numpy.ndarray: Mảng bool kích thước (...)
+    """
+    stones = arrays == CELL_CODES[player]
+    size = stones.shape[-1]
+    span = size - 4
+    found = np.zeros(arrays.shape[:-2], dtype=bool)
+    if span <= 0:
+        return found
+
+    horizontal = stones[..., :, 0:span]
+    vertical = stones[..., 0:span, :]
+    diagonal = stones[..., 0:span, 0:span]
+    anti_diagonal = stones[..., 0:span, 4:4 + span]
+    for k in range(1, 5):
+        horizontal = horizontal & stones[..., :, k:k + span]
+        vertical = vertical & stones[..., k:k + span, :]
+        diagonal = diagonal & stones[..., k:k + span, k:k + span]
+        anti_diagonal = anti_diagonal & stones[..., k:k + span, 4 - k:4 - k + span]
+
+    for lines in (horizontal, vertical, diagonal, anti_diagonal):
+        found = found | lines.any(axis=(-2, -1))
+    return found
+
+
+def evaluate_batch(arrays, player):
+    """Đánh giá một chồng N thế cờ trong một lần gọi NumPy.
+
+    Thế cờ có 5 quân liên tiếp nhận 10000 (player thắng) hoặc -10000
+    (đối thủ thắng), giống Board.evaluate.
+
+    Args:
+        arrays: Mảng (N, size, size) các thế cờ (trống 0, X 1, O 2)
+        player: Người chơi đang đánh giá ('X' hoặc 'O')
+
+    Returns:
+        numpy.ndarray: N điểm đánh giá
+    """
+    opponent = 'O' if player == 'X' else 'X'
+    scores = evaluate_arrays(arrays, player)
+    scores = np.where(has_five(arrays, opponent), -10000, scores)
+    return np.where(has_five(arrays, player), 10000, scores)
+
+
+class VectorEvaluator:
+    """Bộ đánh giá giữ một bản sao int8 của bàn cờ, đồng bộ theo move_history.
+
+    Trong tìm kiếm, hai lá liên tiếp chỉ khác nhau vài nước đi nên việc đồng
+    bộ chỉ cần gỡ/đặt lại các quân khác nhau ở cuối lịch sử. SparseBoard không
+    được chuyển thành mảng; với nó evaluate và evaluate_children dùng
+    Board.evaluate.
+    """
+
+    def __init__(self):
+        """Khởi tạo bộ đánh giá chưa gắn với kích thước bàn cờ nào."""
+        self.array = None
+        self.moves = []
+
+    def sync(self, board):
+        """Đồng bộ mảng nội bộ với bàn cờ.
+
+        Args:
+            board: Bàn cờ cần đồng bộ
+
+        Returns:
+            numpy.ndarray: Mảng (size, size) phản ánh đúng bàn cờ
+
+        Raises:
+            TypeError: Nếu board là SparseBoard (không cấp phát mảng size x size
+                cho bàn cờ thưa)
+        """
+        if isinstance(board, SparseBoard):
+            raise TypeError("VectorEvaluator không hỗ trợ SparseBoard")
+
+        history = board.move_history
+        if self.array is None or self.array.shape[0] != board.size:
+            self.array = np.zeros((board.size, board.size), dtype=np.int8)
+            self.moves = []
+
+        # Tìm phần lịch sử chung rồi chỉ cập nhật phần khác nhau
+        common = 0
+        limit = min(len(self.moves), len(history))
+        while common < limit and self.moves[common] == history[common]:
+            common += 1
+
+        for row, col, _ in self.moves[common:]:
+            self.array[row, col] = 0
+        for row, col, player in history[common:]:
+            self.array[row, col] = CELL_CODES[player]
+
+        self.moves = list(history)
+        return self.array
+
+    def evaluate(self, board, player):
+        """Đánh giá trạng thái bàn cờ đối với người chơi, cùng thang điểm Board.evaluate.
+
+        Args:
+            board: Bàn cờ
+            player: Người chơi đang đánh giá ('X' hoặc 'O')
+
+        Returns:
+            int: Điểm đánh giá
+        """
+        winner = board.check_winner()
+        if winner == player:
+            return 10000
+        if winner is not None:
+            return -10000
+
+        # Bàn cờ thưa dùng đường đánh giá thuần Python
+        if isinstance(board, SparseBoard):
+            return board.evaluate(player)
+        return int(evaluate_arrays(self.sync(board), player))
+
+    def evaluate_children(self, board, moves, mover, player):
+        """Đánh giá cùng lúc mọi thế cờ con sau khi mover đi từng nước trong moves.
+
+        Args:
+            board: Bàn cờ cha
+            moves: Danh sách các nước đi (row, col)
+            mover: Người chơi đi nước đó ('X' hoặc 'O')
+            player: Người chơi đang đánh giá ('X' hoặc 'O')
+
+        Returns:
+            list: Điểm của từng thế cờ con, theo thứ tự của moves
+        """
+        if not moves:
+            return []
+
+        if isinstance(board, SparseBoard):
+            scores = []
+            for row, col in moves:
+                with board.try_move(row, col, mover):
+                    scores.append(board.evaluate(player))
+            return scores
+
+        parent = self.sync(board)
+        children = np.repeat(parent[np.newaxis], len(moves), axis=0)
+        rows = np.array([row for row, _ in moves])
+        cols = np.array([col for _, col in moves])
+        children[np.arange(len(moves)), rows, cols] = CELL_CODES[mover]
+
+        return evaluate_batch(children, player).tolist()
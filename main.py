@@ -1,18 +1,44 @@
+import os
 import time
 import random
-from game.board import Board
+from game.bitboard import BitBoard
+from game.sparse_board import SparseBoard
 from game.player import HumanPlayer, Game
 from agents.random_agent import RandomAgent
 from agents.minimax_agent import MinimaxAgent
 from agents.alphabeta_agent import AlphaBetaAgent
+from agents.solver_agent import SolverAgent
+from agents.mcts_agent import MCTSAgent
 
-def get_agent(agent_type, symbol, level=None):
+# Từ kích thước này trở lên dùng bàn cờ thưa
+SPARSE_BOARD_SIZE = 50
+
+# Sách khai cuộc cho Alpha-Beta Agent, tạo bằng: python -m agents.opening_book opening_book.bin
+OPENING_BOOK_PATH = 'opening_book.bin'
+
+def create_board(board_size):
+    """Tạo bàn cờ phù hợp với kích thước cho trước.
+    
+    Args:
+        board_size: Kích thước bàn cờ, 0 hoặc âm nghĩa là không giới hạn
+        
+    Returns:
+        Board: BitBoard cho bàn cờ thường, SparseBoard cho bàn cờ rất lớn
+    """
+    if board_size <= 0:
+        return SparseBoard()
+    if board_size >= SPARSE_BOARD_SIZE:
+        return SparseBoard(board_size)
+    return BitBoard(board_size)
+
+def get_agent(agent_type, symbol, level=None, ponder=False):
     """Tạo agent với loại và cấp độ cho trước.
     
     Args:
-        agent_type: Loại agent (1: Random, 2: Minimax, 3: Alpha-Beta)
+        agent_type: Loại agent (1: Random, 2: Minimax, 3: Alpha-Beta, 4: Solver, 5: MCTS)
         symbol: Ký hiệu của agent ('X' hoặc 'O')
         level: Cấp độ của agent (1-10)
+        ponder: Cho agent tìm kiếm (Alpha-Beta, MCTS) suy nghĩ trong lượt của đối thủ
         
     Returns:
         Player: Agent được tạo
@@ -24,7 +50,12 @@ def get_agent(agent_type, symbol, level=None):
         return MinimaxAgent(symbol, depth)
     elif agent_type == 3:
         depth = max(1, min(5, level // 2))  # Chuyển đổi level thành depth (1-5)
-        return AlphaBetaAgent(symbol, depth)
+        book_path = OPENING_BOOK_PATH if os.path.exists(OPENING_BOOK_PATH) else None
+        return AlphaBetaAgent(symbol, depth, ponder=ponder, book_path=book_path)
+    elif agent_type == 4:
+        return SolverAgent(symbol, node_budget=2000 * level)  # Level càng cao càng giải sâu
+    elif agent_type == 5:
+        return MCTSAgent(symbol, time_limit=0.5 * level, ponder=ponder)  # Level càng cao càng nghĩ lâu
 
 def evaluate_agents():
     """Đánh giá khả năng của các agent."""
@@ -63,7 +94,7 @@ def evaluate_agents():
                 # Mỗi cặp agent chơi 2 ván, mỗi agent được đi trước 1 ván
                 
                 # Ván 1: agent1 đi trước
-                board = Board(board_size)
+                board = BitBoard(board_size)
                 agent1.symbol = 'X'
                 agent2.symbol = 'O'
                 game = Game(board, agent1, agent2)
@@ -81,7 +112,7 @@ def evaluate_agents():
                     print("Hòa!")
                 
                 # Ván 2: agent2 đi trước
-                board = Board(board_size)
+                board = BitBoard(board_size)
                 agent1.symbol = 'O'
                 agent2.symbol = 'X'
                 game = Game(board, agent2, agent1)
@@ -129,8 +160,8 @@ def main():
     
     if choice == 1:
         # Người vs Người
-        board_size = int(input("Nhập kích thước bàn cờ (VD: 15): "))
-        board = Board(board_size)
+        board_size = int(input("Nhập kích thước bàn cờ (VD: 15, 0 = không giới hạn): "))
+        board = create_board(board_size)
         player1 = HumanPlayer('X')
         player2 = HumanPlayer('O')
         game = Game(board, player1, player2)
@@ -138,17 +169,19 @@ def main():
     
     elif choice == 2:
         # Người vs Máy
-        board_size = int(input("Nhập kích thước bàn cờ (VD: 15): "))
-        board = Board(board_size)
+        board_size = int(input("Nhập kích thước bàn cờ (VD: 15, 0 = không giới hạn): "))
+        board = create_board(board_size)
         
         print("\nLựa chọn AI:")
         print("1. Random Agent")
         print("2. Minimax Agent")
         print("3. Alpha-Beta Agent")
+        print("4. Solver Agent (df-pn)")
+        print("5. MCTS Agent")
         
         agent_type = int(input("Chọn loại AI: "))
         
-        if agent_type < 1 or agent_type > 3:
+        if agent_type < 1 or agent_type > 5:
             print("Lựa chọn không hợp lệ. Sử dụng Alpha-Beta Agent.")
             agent_type = 3
         
@@ -163,30 +196,34 @@ def main():
         
         if ai_symbol_choice == 1:
             # AI đi trước
-            ai_player = get_agent(agent_type, 'X', level)
+            ai_player = get_agent(agent_type, 'X', level, ponder=True)
             human_player = HumanPlayer('O')
             game = Game(board, ai_player, human_player)
         else:
             # AI đi sau
             human_player = HumanPlayer('X')
-            ai_player = get_agent(agent_type, 'O', level)
+            ai_player = get_agent(agent_type, 'O', level, ponder=True)
             game = Game(board, human_player, ai_player)
         
         game.play()
+        if hasattr(ai_player, 'close'):
+            ai_player.close()
     
     elif choice == 3:
         # Máy vs Máy
-        board_size = int(input("Nhập kích thước bàn cờ (VD: 15): "))
-        board = Board(board_size)
+        board_size = int(input("Nhập kích thước bàn cờ (VD: 15, 0 = không giới hạn): "))
+        board = create_board(board_size)
         
         print("\nLựa chọn AI 1 (X):")
         print("1. Random Agent")
         print("2. Minimax Agent")
         print("3. Alpha-Beta Agent")
+        print("4. Solver Agent (df-pn)")
+        print("5. MCTS Agent")
         
         agent1_type = int(input("Chọn loại AI 1: "))
         
-        if agent1_type < 1 or agent1_type > 3:
+        if agent1_type < 1 or agent1_type > 5:
             print("Lựa chọn không hợp lệ. Sử dụng Alpha-Beta Agent.")
             agent1_type = 3
         
@@ -197,10 +234,12 @@ def main():
         print("1. Random Agent")
         print("2. Minimax Agent")
         print("3. Alpha-Beta Agent")
+        print("4. Solver Agent (df-pn)")
+        print("5. MCTS Agent")
         
         agent2_type = int(input("Chọn loại AI 2: "))
         
-        if agent2_type < 1 or agent2_type > 3:
+        if agent2_type < 1 or agent2_type > 5:
             print("Lựa chọn không hợp lệ. Sử dụng Alpha-Beta Agent.")
             agent2_type = 3
         
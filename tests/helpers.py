@@ -0,0 +1,56 @@
+"""Các hàm dựng thế cờ và chạy tìm kiếm dùng chung cho các bài kiểm thử."""
+import random
+from game.bitboard import BitBoard
+
+
+def _other(player):
+    return 'O' if player == 'X' else 'X'
+
+
+def random_position(seed, size=9, plies=8, board_class=BitBoard):
+    """Thế cờ sau tối đa plies nước ngẫu nhiên, dừng trước nước đầu tiên tạo 5.
+
+    Returns:
+        tuple: (bàn cờ, người đến lượt đi)
+    """
+    rng = random.Random(seed)
+    board = board_class(size)
+    player = 'X'
+    for _ in range(plies):
+        board.make_move(*rng.choice(board.get_valid_moves()), player)
+        if board.check_winner():
+            board.undo_move()
+            break
+        player = _other(player)
+    return board, player
+
+
+def endgame(seed, size=7, empty=18):
+    """Thế cờ ngẫu nhiên chưa ai thắng, còn đúng empty ô trống.
+
+    Returns:
+        tuple: (bàn cờ, người đến lượt đi)
+    """
+    rng = random.Random(seed)
+    board = BitBoard(size)
+    player = 'X'
+    while size * size - board.moves_count > empty:
+        board.make_move(*rng.choice(board.get_valid_moves()), player)
+        if board.check_winner():
+            board.undo_move()
+            continue
+        player = _other(player)
+    return board, player
+
+
+def root_result(agent, board, depth):
+    """Điểm và các nước tốt nhất ở gốc khi AlphaBetaAgent tìm với cửa sổ đầy đủ."""
+    agent.transposition_table.new_search(agent.symbol)
+    agent._ordering_for(board).new_search()
+    agent.root_ply = board.moves_count
+    agent.search_id += 1
+    moves = agent._order_moves(board)
+    for current in range(1, depth + 1):
+        score, best_moves, _ = agent._search_root(board, moves, current,
+                                                  float('-inf'), float('inf'))
+    return score, sorted(best_moves)
@@ -0,0 +1,31 @@
+"""Kiểm thử vòng tìm kiếm của AlphaBetaAgent."""
+import time
+from agents.alphabeta_agent import AlphaBetaAgent
+from helpers import random_position, root_result
+
+
+def test_deadline_stops_deepening():
+    """Hết giờ thì bỏ độ sâu đang tìm dở và trả nước của độ sâu cuối đã xong."""
+    board, player = random_position(0, size=15, plies=6)
+    agent = AlphaBetaAgent(player, depth=12, time_limit=0.3, vct_budget=0, seed=1)
+
+    start = time.time()
+    move, completed_depth = agent._think(board, agent.time_limit)
+    elapsed = time.time() - start
+    assert board.is_valid_move(*move)
+    assert 1 <= completed_depth < agent.depth
+    assert elapsed < agent.time_limit + 1.0
+    assert agent.deadline is None
+
+
+def test_aspiration_matches_full_window():
+    """Cửa sổ hẹp (phải tìm lại nhiều lần) cho cùng điểm như cửa sổ đầy đủ."""
+    board, player = random_position(2, size=9, plies=8)
+    options = dict(time_limit=None, vct_budget=0, lmr_reduction=0, seed=1)
+    expected_score, _ = root_result(AlphaBetaAgent(player, 2, **options), board, 2)
+
+    agent = AlphaBetaAgent(player, 2, aspiration_window=1, **options)
+    previous_score, _ = root_result(agent, board, 1)
+    moves = agent._order_moves(board)
+    score, _, _ = agent._aspiration_search(board, moves, 2, previous_score + 7)
+    assert score == expected_score
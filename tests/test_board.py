@@ -0,0 +1,135 @@
+"""Kiểm thử các cấu trúc cập nhật tăng dần của Board."""
+import random
+from game.board import Board
+from game.bitboard import BitBoard
+from helpers import random_position
+
+
+def _snapshot(board):
+    return ([row[:] for row in board.board], list(board.move_history), board.moves_count,
+            board.last_move, board.zobrist, board.evaluate('X'), board.evaluate('O'))
+
+
+def test_undo_restores_state():
+    """make_move rồi undo_move (hoặc try_move) trả bàn cờ về đúng trạng thái cũ."""
+    for board_class in (Board, BitBoard):
+        board, player = random_position(1, size=11, plies=20, board_class=board_class)
+        rng = random.Random(1)
+        before = _snapshot(board)
+        masks = dict(getattr(board, 'masks', {}))
+
+        for row, col in rng.sample(board.get_valid_moves(), 10):
+            with board.try_move(row, col, player) as moved:
+                assert moved
+                assert board.board[row][col] == player
+            assert _snapshot(board) == before
+
+            board.make_move(row, col, player)
+            assert board.undo_move() == (row, col, player)
+            assert _snapshot(board) == before
+            assert dict(getattr(board, 'masks', {})) == masks
+
+        row, col, _ = board.move_history[0]
+        with board.try_move(row, col, player) as moved:
+            assert not moved
+        assert _snapshot(board) == before
+
+
+def test_zobrist_matches_fresh_hash():
+    """Khóa Zobrist tăng dần bằng khóa tính lại từ đầu, không phụ thuộc thứ tự nước đi."""
+    for board_class in (Board, BitBoard):
+        board, _ = random_position(2, size=13, plies=24, board_class=board_class)
+        fresh = 0
+        for row, col, player in board.move_history:
+            fresh ^= board.zobrist_table[row][col][player]
+        assert board.zobrist == fresh
+
+        shuffled = list(board.move_history)
+        random.Random(2).shuffle(shuffled)
+        other = board_class(13)
+        for row, col, player in shuffled:
+            other.make_move(row, col, player)
+        assert other.zobrist == board.zobrist
+        assert board.copy().zobrist == board.zobrist
+        assert board_class.from_bytes(board.to_bytes()).zobrist == board.zobrist
+
+        while board.move_history:
+            board.undo_move()
+        assert board.zobrist == 0
+
+
+def _brute_frontier(board):
+    radius = board.move_radius
+    stones = [(row, col) for row, col, _ in board.move_history]
+    return sorted((row, col) for row in range(board.size) for col in range(board.size)
+                  if board.board[row][col] == ' ' and any(
+                      abs(row - r) <= radius and abs(col - c) <= radius for r, c in stones))
+
+
+def test_frontier_matches_brute_force():
+    """Biên nước đi luôn bằng tập ô trống trong bán kính move_radius, cả khi hoàn tác."""
+    board, _ = random_position(4, size=9, plies=30, board_class=Board)
+    history = list(board.move_history)
+    while board.move_history:
+        assert sorted(board.frontier) == _brute_frontier(board)
+        assert board.get_valid_moves() == _brute_frontier(board)
+        board.undo_move()
+    assert not board.frontier
+
+    for row, col, player in history:
+        board.make_move(row, col, player)
+        assert sorted(board.frontier) == _brute_frontier(board)
+
+
+def _fresh_evaluate(board, player):
+    size = board.size
+    line_ids = ([(0, key) for key in range(size)] + [(1, key) for key in range(size)] +
+                [(2, key) for key in range(1 - size, size)] +
+                [(3, key) for key in range(2 * size - 1)])
+    totals = [0, 0]
+    for line_id in line_ids:
+        x_score, o_score = board._score_line_both(board._line_cells(line_id))
+        totals[0] += x_score
+        totals[1] += o_score
+    center = sum(board._center_weight(row, col) * (1 if stone == 'X' else -1)
+                 for row, col, stone in board.move_history)
+    if player == 'X':
+        return totals[0] + center
+    return totals[1] - center
+
+
+def test_incremental_evaluation_matches_fresh():
+    """Điểm theo dòng cập nhật tăng dần bằng điểm quét lại toàn bộ bàn cờ."""
+    rng = random.Random(5)
+    for board_class in (Board, BitBoard):
+        board, player = random_position(5, size=11, plies=12, board_class=board_class)
+        board.evaluate('X')
+        for _ in range(40):
+            if board.check_winner() or (board.move_history and rng.random() < 0.3):
+                row, col, player = board.undo_move()
+            else:
+                board.make_move(*rng.choice(board.get_valid_moves()), player)
+                player = 'O' if player == 'X' else 'X'
+            if not board.check_winner():
+                for side in ('X', 'O'):
+                    assert board.evaluate(side) == _fresh_evaluate(board, side)
+
+
+def test_threat_cache_matches_fresh_board():
+    """Sau khi đi và hoàn tác, mức đe dọa lấy từ cache bằng mức tính trên bàn cờ mới."""
+    rng = random.Random(9)
+    board, player = random_position(9, size=11, plies=10, board_class=Board)
+    cells = [(row, col) for row in range(board.size) for col in range(board.size)]
+    for _ in range(60):
+        if board.move_history and rng.random() < 0.3:
+            board.undo_move()
+        elif not board.check_winner():
+            board.make_move(*rng.choice(board.get_valid_moves()), player)
+            player = 'O' if player == 'X' else 'X'
+
+        fresh = Board.from_bytes(board.to_bytes())
+        for row, col in rng.sample(cells, 30):
+            for side in ('X', 'O'):
+                assert (board._check_threat_patterns(row, col, side) ==
+                        fresh._check_threat_patterns(row, col, side))
+    assert board.threat_cache_stats()['hits']
@@ -0,0 +1,30 @@
+"""Kiểm thử bộ giải df-pn."""
+from game.bitboard import BitBoard
+from agents.dfpn import DFPNSolver
+from agents.alphabeta_agent import AlphaBetaAgent
+from helpers import endgame
+
+
+def test_table_keeps_both_targets():
+    """Đổi người mục tiêu không xóa bảng: chứng minh lại dùng ngay kết quả đã lưu."""
+    board, player = endgame(7)
+    opponent = 'O' if player == 'X' else 'X'
+    solver = DFPNSolver(table_bits=16)
+
+    first = solver.prove(board, player, player)
+    first_nodes = solver.nodes
+    solver.prove(board, player, opponent)
+    again = solver.prove(board, player, player)
+    assert again == first
+    assert first[0] is not None
+    assert solver.nodes < first_nodes
+
+
+def test_solver_waits_for_endgame():
+    """Ít nước ứng viên ở đầu ván (quân ở góc) không kích hoạt df-pn."""
+    board = BitBoard(15)
+    board.make_move(0, 0, 'X')
+    assert len(board.get_valid_moves()) <= 20
+    agent = AlphaBetaAgent('O', depth=1, time_limit=None)
+    assert board.is_valid_move(*agent.get_move(board))
+    assert agent.solver is None
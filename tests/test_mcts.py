@@ -0,0 +1,55 @@
+"""Kiểm thử MCTSAgent."""
+from game.bitboard import BitBoard
+from agents.mcts_agent import MCTSAgent, _playout_state
+from helpers import random_position
+
+
+def test_get_move_without_time():
+    """Hết giờ ngay từ đầu vẫn trả về một nước hợp lệ."""
+    board = BitBoard(15)
+    board.make_move(7, 7, 'X')
+    for agent in (MCTSAgent('O', time_limit=0.0, seed=1),
+                  MCTSAgent('O', time_limit=None, max_playouts=0, seed=1)):
+        move = agent.get_move(board)
+        assert board.is_valid_move(*move)
+
+
+def _brute_fives(board, player):
+    size = board.size
+    return sum(1 << (row * size + col) for row in range(size) for col in range(size)
+               if board.is_valid_move(row, col) and board._check_win_at(row, col, player))
+
+
+def test_playout_fives_match_brute_force():
+    """Ô thắng của trạng thái playout bitmask bằng các ô tạo 5 tìm bằng cách thử từng ô."""
+    for seed in range(20):
+        board, _ = random_position(seed, size=9, plies=30)
+        state = _playout_state(board)
+        for side, player in enumerate('XO'):
+            assert state[1][side] & ~state[2] == _brute_fives(board, player)
+        assert state[2] == sum(1 << (row * 9 + col) for row, col, _ in board.move_history)
+
+
+def test_tree_reused_after_moves():
+    """Sau nước của agent và nước đáp của đối thủ, gốc mới là nút con đã có của cây cũ."""
+    board, player = random_position(1, size=9, plies=6)
+    agent = MCTSAgent(player, time_limit=None, max_playouts=300, seed=1)
+    move = agent.get_move(board)
+    child = agent.root.children[move]
+    board.make_move(move[0], move[1], agent.symbol)
+    reply = max(child.children.values(), key=lambda node: node.visits)
+    board.make_move(reply.move[0], reply.move[1], reply.player)
+
+    visits = reply.visits
+    assert agent._reuse_root(board) is reply
+    assert reply.parent is None and reply.visits == visits
+
+
+def test_takes_immediate_win():
+    """Có bốn sẵn thì MCTS đi ngay ô thắng, kể cả với rất ít playout."""
+    board = BitBoard(9)
+    for col in range(1, 5):
+        board.make_move(4, col, 'X')
+        board.make_move(7, col + 2, 'O')
+    agent = MCTSAgent('X', time_limit=None, max_playouts=5, seed=1)
+    assert agent.get_move(board) in ((4, 0), (4, 5))
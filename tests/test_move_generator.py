@@ -0,0 +1,50 @@
+"""Kiểm thử sinh nước đi theo giai đoạn."""
+from game.patterns import THREAT_OPEN_FOUR
+from agents.move_generator import (staged_moves, quiescence_moves, STAGE_TT, STAGE_WIN,
+                                   STAGE_BLOCK, STAGE_THREAT, STAGE_KILLER, STAGE_QUIET)
+from agents.vcf import four_moves
+from helpers import random_position
+
+
+def test_stages_cover_valid_moves():
+    """Mọi giai đoạn gộp lại sinh đúng tập get_valid_moves, mỗi nước một lần, đúng thứ tự."""
+    for seed in range(12):
+        board, player = random_position(seed, size=11, plies=14)
+        valid = board.get_valid_moves()
+        tt_move = valid[len(valid) // 2]
+        killers = [valid[0], (0, 0), None, tt_move]
+        quiet = {move: (move[0] * 7 + move[1] * 3) % 11 for move in valid}
+
+        generated = list(staged_moves(board, player, tt_move, killers, quiet.get))
+        moves = [move for move, _ in generated]
+        stages = [stage for _, stage in generated]
+        assert sorted(moves) == valid
+        assert stages == sorted(stages)
+        assert generated[0] == (tt_move, STAGE_TT)
+
+        opponent = 'O' if player == 'X' else 'X'
+        for move, stage in generated:
+            if stage == STAGE_WIN:
+                assert board._check_win_at(move[0], move[1], player)
+            elif stage == STAGE_BLOCK:
+                assert board._check_win_at(move[0], move[1], opponent)
+            elif stage == STAGE_THREAT:
+                assert board._check_threat_patterns(move[0], move[1], player)
+            elif stage == STAGE_KILLER:
+                assert move in killers
+        quiet_scores = [quiet[move] for move, stage in generated if stage == STAGE_QUIET]
+        assert quiet_scores == sorted(quiet_scores, reverse=True)
+
+
+def test_quiescence_moves_are_forcing():
+    """Nước tìm tĩnh gồm mọi nước tạo bốn và mọi ô chặn ba mở của đối thủ."""
+    for seed in range(12):
+        board, player = random_position(seed, size=11, plies=20)
+        opponent = 'O' if player == 'X' else 'X'
+        moves = quiescence_moves(board, player)
+        assert len(moves) == len(set(moves))
+
+        blocks = {move for move in board.get_valid_moves()
+                  if any(pattern.threat == THREAT_OPEN_FOUR
+                         for pattern in board.get_threat_patterns(move[0], move[1], opponent))}
+        assert set(moves) == set(four_moves(board, player)) | blocks
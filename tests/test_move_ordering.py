@@ -0,0 +1,33 @@
+"""Kiểm thử các bảng killer, history và counter-move."""
+from agents.move_ordering import MoveOrdering
+
+
+def test_tables_record_and_age():
+    """Killer giữ các nước gần nhất, history cộng depth^2 rồi giảm nửa, counter-move lưu nước đáp."""
+    for size in (15, 200):
+        ordering = MoveOrdering(size, max_ply=4, killer_slots=2)
+        ordering.record_cutoff(1, 'X', (3, 4), 3, (5, 5))
+        ordering.record_cutoff(1, 'X', (6, 7), 2, (5, 5))
+        ordering.record_cutoff(1, 'X', (3, 4), 2, None)
+        ordering.record_cutoff(1, 'X', (8, 8), 1, None)
+
+        assert ordering.killer_moves(1) == [(8, 8), (3, 4)]
+        assert ordering.is_killer(1, (3, 4)) == 1
+        assert ordering.is_killer(1, (6, 7)) == -1
+        assert ordering.killer_moves(0) == []
+        # Tầng ngoài bảng killer vẫn được ghi vào history
+        ordering.record_cutoff(10, 'O', (1, 1), 4, None)
+        assert ordering.killer_moves(10) == []
+
+        assert ordering.history_score('X', (3, 4)) == 9 + 4
+        assert ordering.history_score('O', (3, 4)) == 0
+        assert ordering.history_score('O', (1, 1)) == 16
+        assert ordering.counter_move('X', (5, 5)) == (6, 7)
+        assert ordering.counter_move('O', (5, 5)) is None
+        assert ordering.counter_move('X', None) is None
+
+        ordering.new_search()
+        assert ordering.killer_moves(1) == []
+        assert ordering.history_score('X', (3, 4)) == 6
+        assert ordering.history_score('X', (8, 8)) == 0
+        assert ordering.counter_move('X', (5, 5)) == (6, 7)
@@ -0,0 +1,34 @@
+"""Kiểm thử tìm kiếm song song ở gốc (RootSearchPool)."""
+from agents.alphabeta_agent import AlphaBetaAgent
+from helpers import random_position, root_result
+
+_RUNS = 3
+
+
+def test_root_pool_matches_sequential():
+    """Chạy nhiều lần với seed cố định, nhóm tiến trình cho cùng điểm và nước đi như tìm tuần tự."""
+    depth = 3
+    board, player = random_position(0)
+    sequential = AlphaBetaAgent(player, depth, time_limit=None, vct_budget=0,
+                                lmr_reduction=0, seed=1)
+    expected_score, expected_moves = root_result(sequential, board, depth)
+
+    results = set()
+    moves = set()
+    for _ in range(_RUNS):
+        parallel = AlphaBetaAgent(player, depth, time_limit=None, vct_budget=0,
+                                  workers=2, seed=1)
+        score, best_moves = root_result(parallel, board, depth)
+        assert score == expected_score
+        # Tìm tuần tự trả về cận trên bằng alpha cho nước bị cắt tỉa, nên tập
+        # nước hòa điểm của nó có thể rộng hơn tập chính xác của nhóm
+        assert set(best_moves) <= set(expected_moves)
+        results.add((score, tuple(best_moves)))
+
+        move = parallel.get_move(board)
+        assert move in best_moves
+        moves.add(move)
+        parallel.close()
+
+    assert len(results) == 1
+    assert len(moves) == 1
@@ -0,0 +1,56 @@
+"""Kiểm thử bảng tra cứu mẫu so với các luật tính trực tiếp."""
+import random
+from game.board import Board, DIRECTIONS
+from game.patterns import WINDOW_SIZE, _score_window, score_line_windows
+
+
+def _scan(board, row, col, row_dir, col_dir, player):
+    """Số quân liên tiếp qua (row, col) và số đầu mở, đi từng ô như luật cũ."""
+    run, open_ends = 1, 0
+    for sign in (-1, 1):
+        r, c = row + sign * row_dir, col + sign * col_dir
+        while 0 <= r < board.size and 0 <= c < board.size and board.board[r][c] == player:
+            run += 1
+            r, c = r + sign * row_dir, c + sign * col_dir
+        if 0 <= r < board.size and 0 <= c < board.size and board.board[r][c] == ' ':
+            open_ends += 1
+    return run, open_ends
+
+
+def test_window_table_matches_rules():
+    """Tổng điểm cuộn theo bảng bằng tổng điểm từng cửa sổ 6 ô tính theo luật."""
+    rng = random.Random(6)
+    for _ in range(500):
+        line = [rng.choice(' XO') for _ in range(rng.randint(0, 20))]
+        expected = [0, 0]
+        for start in range(len(line) - WINDOW_SIZE + 1):
+            window = line[start:start + WINDOW_SIZE]
+            expected[0] += _score_window(window, 'X')
+            expected[1] += _score_window(window, 'O')
+        assert score_line_windows(line) == tuple(expected)
+
+
+def test_segment_table_matches_scan():
+    """Dãy, đầu mở, điểm đe dọa và ô thành 5 của bảng đoạn khớp với duyệt trực tiếp."""
+    rng = random.Random(6)
+    for _ in range(40):
+        board = Board(9)
+        for _ in range(rng.randint(5, 40)):
+            row, col = rng.randrange(9), rng.randrange(9)
+            board.make_move(row, col, rng.choice('XO'))
+
+        for row, col in rng.sample(board.get_valid_moves(), 5):
+            for player in ('X', 'O'):
+                for (row_dir, col_dir), pattern in zip(
+                        DIRECTIONS, board.get_threat_patterns(row, col, player)):
+                    run, open_ends = _scan(board, row, col, row_dir, col_dir, player)
+                    level = {(4, 2): 100, (4, 1): 50, (3, 2): 20}.get((run, open_ends), 0)
+                    assert pattern.level == level
+                    if run <= 4:
+                        assert (pattern.run, pattern.open_ends) == (run, open_ends)
+
+                    with board.try_move(row, col, player):
+                        for offset in pattern.five_offsets:
+                            cell = (row + offset * row_dir, col + offset * col_dir)
+                            assert board.is_valid_move(*cell)
+                            assert board._check_win_at(cell[0], cell[1], player)
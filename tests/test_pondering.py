@@ -0,0 +1,74 @@
+"""Kiểm thử pondering của AlphaBetaAgent."""
+import threading
+from game.bitboard import BitBoard
+from agents.alphabeta_agent import AlphaBetaAgent
+from agents.vcf import VCFSolver
+from agents.vct import VCTSolver
+from agents.dfpn import DFPNSolver
+
+
+def _position():
+    board = BitBoard(15)
+    for row, col, player in ((7, 7, 'X'), (7, 8, 'O'), (8, 8, 'X'), (6, 6, 'O')):
+        board.make_move(row, col, player)
+    return board
+
+
+def test_ponder_hit_without_book():
+    """Không có sách khai cuộc, kết quả ponder đúng thế cờ vẫn được dùng ngay."""
+    board = _position()
+    agent = AlphaBetaAgent('X', depth=2, time_limit=None, ponder=True)
+    assert agent.book is None
+
+    agent.ponder_result = (board.zobrist, board.moves_count, (0, 0), agent.depth)
+    assert agent.get_move(board) == (0, 0)
+    assert agent.ponder_hits == 1
+    assert agent.ponder_misses == 0
+    agent.close()
+
+
+def test_ponder_miss_without_book():
+    """Kết quả ponder của thế cờ khác được tính là trượt và agent tìm lại."""
+    board = _position()
+    agent = AlphaBetaAgent('X', depth=1, time_limit=None, ponder=True)
+
+    agent.ponder_result = (board.zobrist ^ 1, board.moves_count, (0, 0), agent.depth)
+    move = agent.get_move(board)
+    assert move != (0, 0)
+    assert board.is_valid_move(*move)
+    assert agent.ponder_hits == 0
+    assert agent.ponder_misses == 1
+    agent.close()
+
+
+def test_ponder_thread_records_hit():
+    """Ponder trong luồng nền sau nước của agent, rồi đối thủ đi đúng nước dự đoán."""
+    board = _position()
+    agent = AlphaBetaAgent('X', depth=2, time_limit=None, ponder=True)
+
+    move = agent.get_move(board)
+    board.make_move(move[0], move[1], 'X')
+    predicted = agent._predict_reply(board)
+    agent.on_move_played(board, move, 'X')
+    agent.ponderer.thread.join()
+
+    board.make_move(predicted[0], predicted[1], 'O')
+    agent.on_move_played(board, predicted, 'O')
+    reply = agent.get_move(board)
+    assert board.is_valid_move(*reply)
+    assert agent.ponder_hits == 1
+    agent.close()
+
+
+def test_solvers_honour_stop_event():
+    """Cờ dừng của ponder cắt ngang VCF, VCT và df-pn dù còn ngân sách."""
+    board = _position()
+    stop_event = threading.Event()
+    stop_event.set()
+
+    for solver in (VCFSolver(), VCTSolver()):
+        assert solver.solve(board, 'X', 10 ** 9, stop_event) is None
+        assert solver.nodes <= 1
+    solver = DFPNSolver(table_bits=10)
+    assert solver.solve(board, 'X', 10 ** 9, stop_event) == (None, None)
+    assert solver.nodes <= 1
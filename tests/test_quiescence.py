@@ -0,0 +1,25 @@
+"""Kiểm thử tìm kiếm tĩnh của AlphaBetaAgent."""
+import pytest
+from agents.alphabeta_agent import AlphaBetaAgent
+from helpers import random_position, root_result
+
+
+def test_batch_leaves_with_quiescence():
+    """Đánh giá gộp ở lá vẫn tìm tĩnh và cho cùng kết quả như đánh giá từng lá."""
+    pytest.importorskip('numpy')
+    board, player = random_position(3, size=11, plies=10)
+    assert board.moves_count == 10
+
+    results = []
+    for batch_leaves in (False, True):
+        agent = AlphaBetaAgent(player, 2, use_numpy=True, batch_leaves=batch_leaves,
+                               time_limit=None, vct_budget=0)
+        assert agent.quiescence_depth
+        assert agent.batch_leaves == batch_leaves
+        batches = []
+        evaluate_children = agent.vector_evaluator.evaluate_children
+        agent.vector_evaluator.evaluate_children = (
+            lambda *args: batches.append(args) or evaluate_children(*args))
+        results.append(root_result(agent, board, 2))
+        assert bool(batches) == batch_leaves
+    assert results[0] == results[1]
@@ -0,0 +1,69 @@
+"""Kiểm thử bàn cờ thưa SparseBoard."""
+import random
+import pytest
+from game.board import Board
+from game.sparse_board import SparseBoard
+
+
+def _play_both(seed, size, plies=30):
+    rng = random.Random(seed)
+    dense, sparse = Board(size), SparseBoard(size)
+    player = 'X'
+    for _ in range(plies):
+        row, col = rng.randrange(size), rng.randrange(size)
+        if not dense.is_valid_move(row, col):
+            continue
+        dense.make_move(row, col, player)
+        sparse.make_move(row, col, player)
+        if dense.check_winner():
+            break
+        player = 'O' if player == 'X' else 'X'
+    return dense, sparse
+
+
+def test_matches_dense_board():
+    """Cùng chuỗi nước đi, SparseBoard cho cùng nước ứng viên và điểm như Board."""
+    for seed in range(10):
+        for size in (15, 40):
+            dense, sparse = _play_both(seed, size)
+            assert sparse.get_valid_moves() == dense.get_valid_moves()
+            assert sparse.check_winner() == dense.check_winner()
+            for player in ('X', 'O'):
+                assert sparse.evaluate(player) == dense.evaluate(player)
+
+            while dense.move_history:
+                dense.undo_move()
+                sparse.undo_move()
+                assert sparse.get_valid_moves() == dense.get_valid_moves()
+                assert sparse.evaluate('X') == dense.evaluate('X')
+            assert sparse.zobrist == SparseBoard(size).zobrist
+
+
+def test_line_cells_skip_gaps():
+    """Hai cụm quân rất xa nhau trên một dòng chỉ đọc các ô quanh từng cụm."""
+    board = SparseBoard()
+    board.make_move(0, 0, 'X')
+    board.make_move(0, 1, 'X')
+    board.make_move(0, 500000, 'X')
+    cells = board._line_cells((0, 0))
+    assert len(cells) <= 4 * 5 + 3
+    assert cells.count('X') == 3
+
+
+def test_vector_evaluator_falls_back():
+    """VectorEvaluator không cấp phát mảng cho SparseBoard mà dùng đường thuần Python."""
+    pytest.importorskip('numpy')
+    from game.vector_eval import VectorEvaluator
+
+    _, sparse = _play_both(3, 15, plies=12)
+    evaluator = VectorEvaluator()
+    with pytest.raises(TypeError):
+        evaluator.sync(sparse)
+    assert evaluator.evaluate(sparse, 'X') == sparse.evaluate('X')
+
+    moves = sparse.get_valid_moves()[:5]
+    expected = []
+    for row, col in moves:
+        with sparse.try_move(row, col, 'O'):
+            expected.append(sparse.evaluate('X'))
+    assert evaluator.evaluate_children(sparse, moves, 'O', 'X') == expected
@@ -0,0 +1,28 @@
+"""Kiểm thử khóa đối xứng của bàn cờ qua 8 phép xoay, lật."""
+from game.board import Board, transform_cell
+from game.bitboard import BitBoard
+from game.sparse_board import SparseBoard
+from helpers import random_position
+
+
+def test_canonical_key_is_symmetric():
+    """Các thế cờ đối xứng nhau có cùng khóa chuẩn, nước đi đổi hướng đúng."""
+    for board_class in (Board, BitBoard, SparseBoard):
+        for size in (15, 10):
+            for seed in range(5):
+                moves = random_position(seed, size, 16, board_class)[0].move_history
+                keys = set()
+                for transform in range(8):
+                    board = board_class(size)
+                    for row, col, player in moves:
+                        board.make_move(*transform_cell(row, col, size, transform), player)
+                    key, transform_key = board.canonical_key()
+                    keys.add(key)
+
+                    move = board.get_valid_moves()[0]
+                    canonical = board.to_canonical(move, transform_key)
+                    assert board.from_canonical(canonical, transform_key) == move
+                    after = board.canonical_key_after(move[0], move[1], 'X')
+                    with board.try_move(move[0], move[1], 'X'):
+                        assert board.canonical_key() == after
+                assert len(keys) == 1
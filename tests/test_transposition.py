@@ -0,0 +1,81 @@
+"""Kiểm thử bảng chuyển vị."""
+from agents.transposition import (TranspositionTable, SharedTranspositionTable, EXACT,
+                                  LOWER, UPPER, bound_flag)
+from agents.alphabeta_agent import AlphaBetaAgent
+from helpers import random_position
+
+
+def test_store_probe_with_bounds():
+    """Lưu rồi tra lại đúng độ sâu, loại cận, điểm và nước đi; thay mục theo độ sâu."""
+    table = TranspositionTable(capacity_bits=4, ways=4)
+    table.new_search('X')
+    key = 0x1234_5678_9ABC_DEF0
+
+    assert table.probe(key) is None
+    table.store(key, 3, LOWER, 120.0, (4, 5))
+    assert table.probe(key) == (3, LOWER, 120.0, (4, 5))
+
+    # Kết quả nông hơn, không chính xác, cùng lượt: giữ mục sâu, chỉ cập nhật nước đi
+    table.store(key, 1, UPPER, -50.0, (6, 7))
+    assert table.probe(key) == (3, LOWER, 120.0, (6, 7))
+    table.store(key, 1, EXACT, 10.0)
+    assert table.probe(key) == (1, EXACT, 10.0, None)
+
+    # Nhóm đầy: mục nông nhất bị thay, số mục không tăng theo số thế cờ
+    bucket = [key + (index << 2) for index in range(1, 5)]
+    for depth, other in enumerate(bucket):
+        table.store(other, depth + 2, EXACT, 0.0)
+    assert table.probe(key) is None
+    assert all(table.probe(other) is not None for other in bucket)
+    assert table.stats()['overwrites'] == 1
+
+    # Lượt mới cùng góc nhìn giữ bảng, đổi góc nhìn thì xóa
+    table.new_search('X')
+    assert table.probe(bucket[0]) is not None
+    table.new_search('O')
+    assert table.probe(bucket[0]) is None
+
+    assert bound_flag(5, 5, 10) == UPPER
+    assert bound_flag(10, 5, 10) == LOWER
+    assert bound_flag(7, 5, 10) == EXACT
+
+
+def test_shared_table_round_trip_and_torn_entries():
+    """Bảng dùng chung: tra lại đúng mục, bảng gắn theo tên thấy cùng mục, cặp từ lệch bị bỏ."""
+    table = SharedTranspositionTable(capacity_bits=6)
+    try:
+        table.new_search('X')
+        key = 0x0F0F_1234_5678_9ABC
+        table.store(key, 5, LOWER, 37.5, (12, 3))
+        assert table.probe(key) == (5, LOWER, 37.5, (12, 3))
+        other = key ^ (1 << 40)
+        table.store(other, 2, UPPER, -8.0)
+        assert table.probe(other) == (2, UPPER, -8.0, None)
+
+        attached = SharedTranspositionTable(capacity_bits=6, name=table.name)
+        attached.follow('X', table.generation)
+        assert attached.probe(key) == (5, LOWER, 37.5, (12, 3))
+
+        # Ghi đè nửa dữ liệu của mục như khi hai tiến trình ghi chồng nhau
+        for index in range(0, table.capacity * 2, 2):
+            if table.words[index + 1] and table.words[index] ^ table.words[index + 1] == key:
+                table.words[index + 1] ^= 1 << 45
+        assert table.probe(key) is None
+        assert attached.probe(key) is None
+        attached.close()
+    finally:
+        table.close()
+
+
+def test_lazy_smp_search_uses_shared_table():
+    """Agent chạy cùng tiến trình phụ Lazy SMP dùng bảng chung và vẫn trả nước hợp lệ."""
+    board, player = random_position(0, size=9, plies=6)
+    agent = AlphaBetaAgent(player, depth=3, time_limit=1.0, vct_budget=0, smp_workers=1, seed=1)
+    try:
+        assert isinstance(agent.transposition_table, SharedTranspositionTable)
+        move = agent.get_move(board)
+        assert board.is_valid_move(*move)
+        assert agent.smp_pool is not None
+        assert any(agent.transposition_table.words)
+    finally:
+        agent.close()
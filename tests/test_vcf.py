@@ -0,0 +1,46 @@
+"""Kiểm thử bộ giải VCF."""
+from game.bitboard import BitBoard
+from agents.vcf import find_vcf, five_cells
+from helpers import random_position
+
+
+def _replay(board, line, attacker):
+    """Đi lại chuỗi VCF: mọi nước công tạo bốn, mọi nước thủ chặn một ô thắng."""
+    defender = 'O' if attacker == 'X' else 'X'
+    for index, (row, col) in enumerate(line):
+        if index % 2 == 0:
+            assert board.make_move(row, col, attacker)
+            if index < len(line) - 1:
+                assert line[index + 1] in five_cells(board, attacker)
+                assert not five_cells(board, defender)
+        else:
+            assert board.make_move(row, col, defender)
+    assert board.check_winner() == attacker
+
+
+def test_known_vcf():
+    """Thế cờ cần nhiều nước bốn liên tiếp (cột 8 đã bị chặn hai đầu) mới tới bốn kép."""
+    board = BitBoard(15)
+    stones = {'X': [(5, 5), (5, 6), (5, 7), (6, 8), (7, 8), (3, 10), (4, 9)],
+              'O': [(5, 4), (9, 8), (4, 8), (8, 2), (10, 3), (12, 12), (2, 11)]}
+    for x_move, o_move in zip(stones['X'], stones['O']):
+        board.make_move(*x_move, 'X')
+        board.make_move(*o_move, 'O')
+
+    line = find_vcf(board, 'X', 5000)
+    assert line is not None and len(line) % 2 == 1
+    assert line[0] == (5, 8) and len(line) >= 5
+    _replay(board, line, 'X')
+    assert find_vcf(BitBoard(15), 'X') is None
+
+
+def test_found_lines_replay():
+    """Mọi chuỗi VCF tìm được trên thế cờ ngẫu nhiên đều đi lại được tới thắng."""
+    found = 0
+    for seed in range(60):
+        board, player = random_position(seed, size=11, plies=24)
+        line = find_vcf(board, player, 2000)
+        if line:
+            found += 1
+            _replay(board, line, player)
+    assert found
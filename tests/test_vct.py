@@ -0,0 +1,39 @@
+"""Kiểm thử bộ giải VCT."""
+from agents.vcf import four_moves
+from agents.vct import find_vct, _threat_replies
+from agents.dfpn import DFPNSolver
+from helpers import random_position
+
+
+def _has_open_four_move(board, player):
+    return any(len(fives) >= 2 for fives in four_moves(board, player).values())
+
+
+def test_replies_cover_every_defence():
+    """Mọi nước ngoài tập hóa giải đều để bên tấn công còn nước tạo bốn mở."""
+    checked = 0
+    for seed in range(200):
+        board, defender = random_position(seed, plies=12)
+        attacker = 'O' if defender == 'X' else 'X'
+        replies = _threat_replies(board, attacker)
+        if not replies:
+            continue
+        checked += 1
+        for row in range(board.size):
+            for col in range(board.size):
+                if (row, col) in replies or not board.is_valid_move(row, col):
+                    continue
+                with board.try_move(row, col, defender):
+                    assert _has_open_four_move(board, attacker)
+    assert checked
+
+
+def test_proof_matches_full_width_search():
+    """Chuỗi VCT tìm được cũng được df-pn (xét mọi ô trống) chứng minh là thắng."""
+    for seed in (13, 47):
+        board, player = random_position(seed, size=7, plies=10)
+        assert len(board.get_valid_moves()) == board.size ** 2 - board.moves_count
+        line = find_vct(board, player, 3000)
+        assert line
+        result, move = DFPNSolver(table_bits=18).prove(board, player, player, 100000)
+        assert result is True
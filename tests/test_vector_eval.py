@@ -0,0 +1,50 @@
+"""Kiểm thử đánh giá bàn cờ bằng NumPy."""
+import random
+import pytest
+from game.vector_eval import VectorEvaluator
+from helpers import random_position
+
+
+def test_evaluate_matches_board():
+    """VectorEvaluator.evaluate cho cùng điểm với Board.evaluate, kể cả thế cờ đã thắng."""
+    pytest.importorskip('numpy')
+    evaluator = VectorEvaluator()
+    rng = random.Random(7)
+    for seed in range(20):
+        size = rng.choice((9, 15))
+        board, player = random_position(seed, size=size, plies=rng.randint(0, 40))
+        # Thế cờ có người thắng: đi tiếp nước vừa bị hoàn tác nếu có
+        if seed % 4 == 0:
+            for row, col in board.get_valid_moves():
+                if board._check_win_at(row, col, player):
+                    board.make_move(row, col, player)
+                    break
+        # Bộ đánh giá dùng chung giữa các thế cờ phải tự đồng bộ lại
+        for side in ('X', 'O'):
+            assert evaluator.evaluate(board, side) == board.evaluate(side)
+        if board.move_history:
+            board.undo_move()
+            assert evaluator.evaluate(board, 'X') == board.evaluate('X')
+
+
+def test_batched_children_match_board():
+    """Đánh giá gộp mọi thế cờ con bằng đánh giá từng con sau try_move."""
+    pytest.importorskip('numpy')
+    evaluator = VectorEvaluator()
+    boards = [random_position(seed, size=11, plies=16) for seed in range(8)]
+    # Thế cờ mà một số con có 5 quân liên tiếp
+    board, player = random_position(0, size=11, plies=0)
+    for col in range(3, 7):
+        board.make_move(5, col, 'X')
+        board.make_move(8, col, 'O')
+    boards.append((board, player))
+
+    for board, player in boards:
+        moves = board.get_valid_moves()
+        for mover in ('X', 'O'):
+            expected = []
+            for row, col in moves:
+                with board.try_move(row, col, mover):
+                    expected.append(board.evaluate(player))
+            assert evaluator.evaluate_children(board, moves, mover, player) == expected
+    assert evaluator.evaluate_children(board, [], player, player) == []